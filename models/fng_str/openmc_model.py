@@ -2,7 +2,7 @@
 import argparse
 
 import openmc
-from openmc_fusion_benchmarks import irdff
+from openmc_fusion_benchmarks import irdff, load_weight_windows
 from openmc_fusion_benchmarks.neutron_sources import fng_source
 
 
@@ -2299,7 +2299,7 @@ def main():
     settings.batches = args.batches
     settings.particles = args.particles
     settings.source = source
-    settings.weight_windows = openmc.wwinp_to_wws("weight_windows.cadis.wwinp")
+    settings.weight_windows = load_weight_windows("weight_windows.cadis.wwinp")
     if args.heating:
         settings.survival_biasing = True
         settings.photon_transport = True
@@ -2331,10 +2331,10 @@ def main():
     nuclides = ['nb93', 'al27', 'ni58', 'au197']
 
     # dosimetry tallies from IRDFF-II nuclear data library
-    nb93_n2n_acef = irdff.path + "dos-irdff2-4125.acef"
-    al27_na_acef = irdff.path + "dos-irdff2-1325.acef"
-    ni58_np_acef = irdff.path + "dos-irdff2-2825_modified.acef"
-    au197_ng_acef = irdff.path + "dos-irdff2-7925_modified.acef"
+    nb93_n2n_acef = "dos-irdff2-4125.acef"
+    al27_na_acef = "dos-irdff2-1325.acef"
+    ni58_np_acef = "dos-irdff2-2825_modified.acef"
+    au197_ng_acef = "dos-irdff2-7925_modified.acef"
     irdff_xs = [nb93_n2n_acef, al27_na_acef, ni58_np_acef, au197_ng_acef]
     reactions = [11016, 107, 103, 102]
 
@@ -2343,16 +2343,11 @@ def main():
         for n, r, x in zip(nuclides, reactions, irdff_xs):
             # onaxis1 tally
             tally1 = openmc.Tally(name=f"rr_onaxis1_{n}")
-            irdff_xs = irdff.cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                irdff_xs[r])
+            multiplier = irdff.get_energy_function_filter(x, r)
             tally1.filters = [onaxis1_cell_filter, neutron_filter, multiplier]
             tally1.scores = ["flux"]
             # onaxis2 tally
             tally2 = openmc.Tally(name=f"rr_onaxis2_{n}")
-            irdff_xs = irdff.cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                irdff_xs[r])
             tally2.filters = [onaxis2_cell_filter, neutron_filter, multiplier]
             tally2.scores = ["flux"]
             model.tallies.extend([tally1, tally2])
@@ -2360,9 +2355,7 @@ def main():
         for n, r, x in zip(nuclides, reactions, irdff_xs):
             # offaxis tally
             tally = openmc.Tally(name=f"rr_offaxis_{n}")
-            nb93_n2n_irdff = irdff.cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                nb93_n2n_irdff[r])
+            multiplier = irdff.get_energy_function_filter(x, r)
             tally.filters = [offaxis_cell_filter, neutron_filter, multiplier]
             tally.scores = ["flux"]
             model.tallies.append(tally)
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
 import openmc_fusion_benchmarks as ofb
 import helpers
 import numpy as np
@@ -22,6 +21,8 @@ def _parse_args():
                         help="String with the month and year the simulation is run as (e.g. 'June 2021')")
     parser.add_argument("-w", "--where", type=str, default='n/a',
                         help="String with the place/institution where the simulation is run (e.g. 'MIT-PSFC')")
+    parser.add_argument("-s", "--threads", type=int,
+                        help='Total number of threads shared by the simulations (int)')
 
     args = parser.parse_args()
 
@@ -32,40 +33,18 @@ def main():
     """Run the fng_str simulation and store an hdf file in results_database/"""
     args = _parse_args()
 
-    # run reaction rate onaxis simulation
-    try:
-        p = subprocess.Popen(
-            ["python3", "openmc_model.py", "--reaction_rates_onaxis"])
-    except:
-        p = subprocess.Popen(
-            ["python", "openmc_model.py", "--reaction_rates_onaxis"])
-    # wait for the simulation to finish
-    p.wait()
-
-    # run reaction rate offaxis simulation
-    try:
-        p = subprocess.Popen(
-            ["python3", "openmc_model.py", "--reaction_rates_offaxis"])
-    except:
-        p = subprocess.Popen(
-            ["python", "openmc_model.py", "--reaction_rates_offaxis"])
-    # wait for the simulation to finish
-    p.wait()
-
-    # run nuclear heating simulation
-    try:
-        p = subprocess.Popen(["python3", "openmc_model.py", "--heating"])
-    except:
-        p = subprocess.Popen(["python", "openmc_model.py", "--heating"])
-    # wait for the simulation to finish
-    p.wait()
+    # run reaction rate onaxis, offaxis and nuclear heating simulations
+    # concurrently, sharing the available threads
+    benchmark = ofb.ScriptBenchmark('openmc_model.py')
+    onaxis_sp, offaxis_sp, heating_sp = ofb.run_benchmarks(
+        [(benchmark, 'reaction_rates_onaxis'),
+         (benchmark, 'reaction_rates_offaxis'),
+         (benchmark, 'heating')], cores=args.threads)
 
     # read statepoint file
-    onaxis_file = ofb.ResultsFromOpenmc(
-        'reaction_rates_onaxis/statepoint.100.h5')
-    offaxis_file = ofb.ResultsFromOpenmc(
-        'reaction_rates_offaxis/statepoint.100.h5')
-    heating_file = ofb.ResultsFromOpenmc('heating/statepoint.100.h5')
+    onaxis_file = ofb.ResultsFromOpenmc(onaxis_sp)
+    offaxis_file = ofb.ResultsFromOpenmc(offaxis_sp)
+    heating_file = ofb.ResultsFromOpenmc(heating_sp)
 
     # openmc hdf file
     filename = ofb.build_hdf_filename(
@@ -81,36 +60,31 @@ def main():
     xaxis_list_offaxis = ['0.25', '12.95', '25.95', '38.65', '5 / 39.12', '4 / 39.12',
                           '6 / 41.47', '3 / 41.47', '8 / 41.47', '10 / 41.47', '9 / 41.47',
                           '11 / 41.47', '1 / 43.82', '7 / 43.82', '2 / 43.82']
+    onaxis_tallies = {}
+    offaxis_tallies = {}
     for foil in helpers.foil_list:
         # on axis group 1
-        onaxis_file.tally_to_hdf(tally_name=f'rr_onaxis1_{foil}',
-                                 normalize_over=helpers.volumes_onaxis1,
-                                 xs_library=args.xslib,
-                                 xaxis_name=xaxis_name,
-                                 xaxis_list=xaxis_list_onaxis1,
-                                 path_to_database='results_database',
-                                 when=args.when,
-                                 where=args.where)
-
+        onaxis_tallies[f'rr_onaxis1_{foil}'] = (helpers.volumes_onaxis1,
+                                                xaxis_list_onaxis1)
         # on axis group 2
-        onaxis_file.tally_to_hdf(tally_name=f'rr_onaxis2_{foil}',
-                                 normalize_over=helpers.volumes_onaxis2,
-                                 xs_library=args.xslib,
-                                 xaxis_name=xaxis_name,
-                                 xaxis_list=xaxis_list_onaxis2,
-                                 path_to_database='results_database',
-                                 when=args.when,
-                                 where=args.where)
-
+        onaxis_tallies[f'rr_onaxis2_{foil}'] = (helpers.volumes_onaxis2,
+                                                xaxis_list_onaxis2)
         # off axis
-        offaxis_file.tally_to_hdf(tally_name=f'rr_offaxis_{foil}',
-                                  normalize_over=helpers.volumes_offaxis,
-                                  xs_library=args.xslib,
-                                  xaxis_name=xaxis_name,
-                                  xaxis_list=xaxis_list_offaxis,
-                                  path_to_database='results_database',
-                                  when=args.when,
-                                  where=args.where)
+        offaxis_tallies[f'rr_offaxis_{foil}'] = (helpers.volumes_offaxis,
+                                                 xaxis_list_offaxis)
+
+    onaxis_file.tallies_to_hdf(tallies=onaxis_tallies,
+                               xs_library=args.xslib,
+                               xaxis_name=xaxis_name,
+                               path_to_database='results_database',
+                               when=args.when,
+                               where=args.where)
+    offaxis_file.tallies_to_hdf(tallies=offaxis_tallies,
+                                xs_library=args.xslib,
+                                xaxis_name=xaxis_name,
+                                path_to_database='results_database',
+                                when=args.when,
+                                where=args.where)
 
     # store nuclear heating results
     xaxis_heating = ['46.35/SS', '53.3/SS', '60.05/SS', '66.9/SS', '73.9/SS', '80.6/SS',
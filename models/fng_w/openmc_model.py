@@ -2,7 +2,7 @@
 import argparse
 
 import openmc
-from openmc_fusion_benchmarks import irdff
+from openmc_fusion_benchmarks import irdff, load_weight_windows, WEIGHT_WINDOWS_PATH
 from openmc_fusion_benchmarks.neutron_sources import fng_source
 
 
@@ -2105,7 +2105,7 @@ def main():
                         reference_uvw=fng_uvw)
 
     # weight windows from wwinps
-    ww = openmc.wwinp_to_wws("weight_windows.cadis.wwinp")
+    ww = load_weight_windows(WEIGHT_WINDOWS_PATH / "fng_w" / "weight_windows.cadis.wwinp")
 
     # settings
     settings = openmc.Settings(run_mode='fixed source')
@@ -2144,15 +2144,15 @@ def main():
                 'ni58_np', 'au197', 'fe56', 'in115']
 
     # dosimetry tallies from IRDFF-II nuclear data library
-    zr90_n2n_acef = irdff.path + "dos-irdff2-4025.acef"
-    al27_na_acef = irdff.path + "dos-irdff2-1325.acef"
-    mn55_ng_acef = irdff.path + "dos-irdff2-2525_modified.acef"
-    nb93_n2n_acef = irdff.path + "dos-irdff2-4125.acef"
-    ni58_n2n_acef = irdff.path + "dos-irdff2-2825_modified.acef"
-    ni58_np_acef = irdff.path + "dos-irdff2-2825_modified.acef"
-    au197_ng_acef = irdff.path + "dos-irdff2-7925_modified.acef"
-    fe56_np_acef = irdff.path + "dos-irdff2-2631.acef"
-    in115_nn_acef = irdff.path + "dos-irdff2-4931.acef"
+    zr90_n2n_acef = "dos-irdff2-4025.acef"
+    al27_na_acef = "dos-irdff2-1325.acef"
+    mn55_ng_acef = "dos-irdff2-2525_modified.acef"
+    nb93_n2n_acef = "dos-irdff2-4125.acef"
+    ni58_n2n_acef = "dos-irdff2-2825_modified.acef"
+    ni58_np_acef = "dos-irdff2-2825_modified.acef"
+    au197_ng_acef = "dos-irdff2-7925_modified.acef"
+    fe56_np_acef = "dos-irdff2-2631.acef"
+    in115_nn_acef = "dos-irdff2-4931.acef"
 
     irdff_xs = [zr90_n2n_acef, al27_na_acef, mn55_ng_acef,
                 nb93_n2n_acef, ni58_n2n_acef, ni58_np_acef, au197_ng_acef,
@@ -2167,9 +2167,7 @@ def main():
     if args.reaction_rates:
         for n, r, x, c in zip(nuclides, reactions, irdff_xs, cell_filter_list):
             tally = openmc.Tally(name=f"rr_{n}")
-            irdff_xs = irdff.cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                irdff_xs[r])
+            multiplier = irdff.get_energy_function_filter(x, r)
             tally.filters = [c, neutron_filter, multiplier]
             tally.scores = ["flux"]
             model.tallies.extend([tally])
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
 import openmc_fusion_benchmarks as ofb
 import helpers
 import pandas as pd
@@ -21,6 +20,8 @@ def _parse_args():
                         help="String with the month and year the simulation is run as (e.g. 'June 2021')")
     parser.add_argument("-w", "--where", type=str, default='n/a',
                         help="String with the place/institution where the simulation is run (e.g. 'MIT-PSFC')")
+    parser.add_argument("-s", "--threads", type=int,
+                        help='Total number of threads shared by the simulations (int)')
 
     args = parser.parse_args()
 
@@ -31,28 +32,16 @@ def main():
     """Run the fng_str simulation and store an hdf file in results_database/"""
     args = _parse_args()
 
-    # run reaction rate onaxis simulation
-    try:
-        p = subprocess.Popen(
-            ["python3", "openmc_model.py", "--reaction_rates"])
-    except:
-        p = subprocess.Popen(
-            ["python", "openmc_model.py", "--reaction_rates"])
-    # wait for the simulation to finish
-    p.wait()
-
-    # run nuclear heating simulation
-    try:
-        p = subprocess.Popen(["python3", "openmc_model.py", "--heating"])
-    except:
-        p = subprocess.Popen(["python", "openmc_model.py", "--heating"])
-    # wait for the simulation to finish
-    p.wait()
+    # run reaction rate and nuclear heating simulations concurrently,
+    # sharing the available threads
+    benchmark = ofb.ScriptBenchmark('openmc_model.py')
+    reaction_rates_sp, heating_sp = ofb.run_benchmarks(
+        [(benchmark, 'reaction_rates'), (benchmark, 'heating')],
+        cores=args.threads)
 
     # read statepoint file
-    reaction_rates_file = ofb.ResultsFromOpenmc(
-        'reaction_rates/statepoint.100.h5')
-    heating_file = ofb.ResultsFromOpenmc('heating/statepoint.100.h5')
+    reaction_rates_file = ofb.ResultsFromOpenmc(reaction_rates_sp)
+    heating_file = ofb.ResultsFromOpenmc(heating_sp)
 
     # generate openmc hdf file
     filename = ofb.build_hdf_filename(
@@ -60,15 +49,14 @@ def main():
 
     # store activation foil results
     xaxis_name = 'Shield depth (cm)'
-    for foil in helpers.foil_list:
-        reaction_rates_file.tally_to_hdf(tally_name=f'rr_{foil}',
-                                         normalize_over=helpers.foil_volumes[foil],
-                                         xs_library=args.xslib,
-                                         xaxis_name=xaxis_name,
-                                         xaxis_list=helpers.xaxis_rr[foil],
-                                         path_to_database='results_database',
-                                         when=args.when,
-                                         where=args.where)
+    rr_tallies = {f'rr_{foil}': (helpers.foil_volumes[foil], helpers.xaxis_rr[foil])
+                  for foil in helpers.foil_list}
+    reaction_rates_file.tallies_to_hdf(tallies=rr_tallies,
+                                       xs_library=args.xslib,
+                                       xaxis_name=xaxis_name,
+                                       path_to_database='results_database',
+                                       when=args.when,
+                                       where=args.where)
 
     # store nuclear heating results
     # # rearrange
@@ -3,7 +3,7 @@ import argparse
 import numpy as np
 
 import openmc
-from openmc_fusion_benchmarks import irdff
+from openmc_fusion_benchmarks import irdff, load_weight_windows, WEIGHT_WINDOWS_PATH
 from openmc_fusion_benchmarks.neutron_sources import fng_source
 
 
@@ -189,7 +189,7 @@ def main():
                         reference_uvw=fng_uvw)
 
     # weight windows from wwinps
-    ww = openmc.wwinp_to_wws("weight_windows.wwinp")
+    ww = load_weight_windows(WEIGHT_WINDOWS_PATH / "fns_clean_w" / "weight_windows.wwinp")
 
     # Indicate how many particles to run
     settings = openmc.Settings(run_mode='fixed source')
@@ -289,11 +289,11 @@ def main():
         ['neutron', 'photon', 'electron', 'positron'])
 
     # dosimetry tallies from IRDFF-II nuclear data library
-    nb93_n2n_acef = irdff.path + "dos-irdff2-4125.acef"
-    al27_na_acef = irdff.path + "dos-irdff2-1325.acef"
-    in115_nn_acef = irdff.path + "dos-irdff2-4931.acef"
-    au197_ng_acef = irdff.path + "dos-irdff2-7925_modified.acef"
-    w186_ng_acef = irdff.path + "dos-irdff2-7443_modified.acef"
+    nb93_n2n_acef = "dos-irdff2-4125.acef"
+    al27_na_acef = "dos-irdff2-1325.acef"
+    in115_nn_acef = "dos-irdff2-4931.acef"
+    au197_ng_acef = "dos-irdff2-7925_modified.acef"
+    w186_ng_acef = "dos-irdff2-7443_modified.acef"
     irdff_xs = [nb93_n2n_acef, al27_na_acef,
                 in115_nn_acef, au197_ng_acef, w186_ng_acef]
     reactions = [11016, 107, 11004, 102, 102]
@@ -302,8 +302,7 @@ def main():
     # create foils reaction rate cell tally
     for n, r, x in zip(nuclides, reactions, irdff_xs):
         tally1 = openmc.Tally(name=f"rr_{n}")
-        irdff_xs = irdff.cross_section(x)
-        multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(irdff_xs[r])
+        multiplier = irdff.get_energy_function_filter(x, r)
         tally1.filters = [foil_cell_filter, neutron_filter, multiplier]
         tally1.scores = ["flux"]
         model.tallies.extend([tally1])
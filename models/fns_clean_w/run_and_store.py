@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
 import openmc_fusion_benchmarks as ofb
 import helpers
 import numpy as np
@@ -23,6 +22,8 @@ def _parse_args():
                         help="String with the month and year the simulation is run as (e.g. 'June 2021')")
     parser.add_argument("-w", "--where", type=str, default='n/a',
                         help="String with the place/institution where the simulation is run (e.g. 'MIT-PSFC')")
+    parser.add_argument("-s", "--threads", type=int,
+                        help='Total number of threads shared by the simulations (int)')
 
     args = parser.parse_args()
 
@@ -39,16 +40,11 @@ def main():
         raise ValueError(msg)
 
     # run simulation
-    try:
-        p = subprocess.Popen(["python3", "openmc_model.py"])
-    except:
-        p = subprocess.Popen(["python", "openmc_model.py"])
-
-    # wait for the simulation to finish
-    p.wait()
+    statepoint, = ofb.run_benchmarks(
+        [(ofb.ScriptBenchmark('openmc_model.py'), None)], cores=args.threads)
 
     # read statepoint file
-    openmc_file = ofb.ResultsFromOpenmc('results/statepoint.100.h5')
+    openmc_file = ofb.ResultsFromOpenmc(statepoint)
 
     # openmc hdf file
     filename = ofb.build_hdf_filename(
@@ -57,42 +53,30 @@ def main():
     # store activation foil results
     xaxis_name = 'Shield depth (cm)'
     xaxis_list = ['0.0', '7.6', '22.8', '38.0', '50.7']
-    for foil in helpers.foil_list:
-        openmc_file.tally_to_hdf(tally_name=f'rr_{foil}',
-                                 normalize_over=helpers.detector_volume,
-                                 xs_library=args.xslib, xaxis_name=xaxis_name,
-                                 xaxis_list=xaxis_list,
-                                 path_to_database='results_database',
-                                 when=args.when,
-                                 where=args.where)
+    rr_tallies = {f'rr_{foil}': (helpers.detector_volume, xaxis_list)
+                  for foil in helpers.foil_list}
+    openmc_file.tallies_to_hdf(tallies=rr_tallies,
+                               xs_library=args.xslib, xaxis_name=xaxis_name,
+                               path_to_database='results_database',
+                               when=args.when,
+                               where=args.where)
 
     # store spectrometer results
     xaxis_name = 'Energy low [eV]'
+    spectrum_tallies = {}
     for dp, v in zip(helpers.detector_list, helpers.detector_volume[1:-1]):
         # ne213 neutron spectrometer
-        openmc_file.tally_to_hdf(tally_name=f'nspectrum_ne213_{dp}',
-                                 normalize_over=v,
-                                 xs_library=args.xslib,
-                                 xaxis_name=xaxis_name,
-                                 path_to_database='results_database',
-                                 when=args.when,
-                                 where=args.where)
+        spectrum_tallies[f'nspectrum_ne213_{dp}'] = (v, None)
         # prc neutron spectrometer
-        openmc_file.tally_to_hdf(tally_name=f'nspectrum_prc_{dp}',
-                                 normalize_over=v,
-                                 xs_library=args.xslib,
-                                 xaxis_name=xaxis_name,
-                                 path_to_database='results_database',
-                                 when=args.when,
-                                 where=args.where)
+        spectrum_tallies[f'nspectrum_prc_{dp}'] = (v, None)
         # bc537 gamma spectrometer
-        openmc_file.tally_to_hdf(tally_name=f'gspectrum_bc537_{dp}',
-                                 normalize_over=v,
-                                 xs_library=args.xslib,
-                                 xaxis_name=xaxis_name,
-                                 path_to_database='results_database',
-                                 when=args.when,
-                                 where=args.where)
+        spectrum_tallies[f'gspectrum_bc537_{dp}'] = (v, None)
+    openmc_file.tallies_to_hdf(tallies=spectrum_tallies,
+                               xs_library=args.xslib,
+                               xaxis_name=xaxis_name,
+                               path_to_database='results_database',
+                               when=args.when,
+                               where=args.where)
 
     # rearrange
     tally_name = 'nuclear_heating'
@@ -3,7 +3,7 @@ import numpy as np
 import argparse
 
 import openmc
-from openmc_fusion_benchmarks import irdff
+from openmc_fusion_benchmarks import irdff, load_weight_windows
 from openmc_fusion_benchmarks.neutron_sources import fng_source
 
 
@@ -1647,7 +1647,7 @@ def main():
     # Define problem settings
 
     # weight windows from wwinps
-    ww = openmc.wwinp_to_wws("weight_windows.cadis.wwinp")
+    ww = load_weight_windows("weight_windows.cadis.wwinp")
 
     # Indicate how many particles to run
     settings = openmc.Settings(run_mode='fixed source')
@@ -1820,9 +1820,9 @@ def main():
     )  # mcnp uses MeV, openmc uses eV
 
     # dosimetry tallies from IRDFF-II nuclear data library
-    nb93_n2n_acef = irdff.path + "dos-irdff2-4125.acef"
-    in115_nn_acef = irdff.path + "dos-irdff2-4931.acef"
-    au197_ng_acef = irdff.path + "dos-irdff2-7925_modified.acef"
+    nb93_n2n_acef = "dos-irdff2-4125.acef"
+    in115_nn_acef = "dos-irdff2-4931.acef"
+    au197_ng_acef = "dos-irdff2-7925_modified.acef"
     irdff_xs = [nb93_n2n_acef, in115_nn_acef, au197_ng_acef]
     reactions = [11016, 11004, 102]
     nuclides = ['nb93', 'in115', 'au197']
@@ -1830,9 +1830,7 @@ def main():
     for n, r, x in zip(nuclides, reactions, irdff_xs):
         # onaxis1 tally
         tally1 = openmc.Tally(name=f"rr_{n}")
-        irdff_xs = irdff.cross_section(x)
-        multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-            irdff_xs[r])
+        multiplier = irdff.get_energy_function_filter(x, r)
         tally1.filters = [detector_cell_filter, neutron_filter, multiplier]
         tally1.scores = ["flux"]
         model.tallies.extend([tally1])
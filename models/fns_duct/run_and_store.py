@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
 import openmc_fusion_benchmarks as ofb
 import helpers
 
@@ -19,6 +18,8 @@ def _parse_args():
                         help="String with the month and year the simulation is run as (e.g. 'June 2021')")
     parser.add_argument("-w", "--where", type=str, default='n/a',
                         help="String with the place/institution where the simulation is run (e.g. 'MIT-PSFC')")
+    parser.add_argument("-s", "--threads", type=int,
+                        help='Total number of threads shared by the simulations (int)')
 
     args = parser.parse_args()
 
@@ -35,40 +36,34 @@ def main():
         raise ValueError(msg)
 
     # run simulation
-    try:
-        p = subprocess.Popen(["python3", "openmc_model.py"])
-    except:
-        p = subprocess.Popen(["python", "openmc_model.py"])
-
-    # wait for the simulation to finish
-    p.wait()
+    statepoint, = ofb.run_benchmarks(
+        [(ofb.ScriptBenchmark('openmc_model.py'), None)], cores=args.threads)
 
     # read statepoint file
-    openmc_file = ofb.ResultsFromOpenmc('results/statepoint.100.h5')
+    openmc_file = ofb.ResultsFromOpenmc(statepoint)
 
     # store activation foil results
     xaxis_name = 'Detector No.'
     xaxis_list = ['1',  '2',  '3',  '4',  '5',
                   '6',  '7',  '8',  '9', '10', '11']
-    for foil in helpers.foil_list:
-        openmc_file.tally_to_hdf(tally_name=f'rr_{foil}',
-                                 normalize_over=helpers.detector_volume,
-                                 xs_library=args.xslib, xaxis_name=xaxis_name,
-                                 xaxis_list=xaxis_list,
-                                 path_to_database='results_database',
-                                 when=args.when,
-                                 where=args.where)
+    rr_tallies = {f'rr_{foil}': (helpers.detector_volume, xaxis_list)
+                  for foil in helpers.foil_list}
+    openmc_file.tallies_to_hdf(tallies=rr_tallies,
+                               xs_library=args.xslib, xaxis_name=xaxis_name,
+                               path_to_database='results_database',
+                               when=args.when,
+                               where=args.where)
 
     # store spectrometer results
     xaxis_name = 'Energy low [eV]'
-    for dp in helpers.detector_list:
-        openmc_file.tally_to_hdf(tally_name=f'nspectrum_{dp}',
-                                 normalize_over=helpers.detector_volume,
-                                 xs_library=args.xslib,
-                                 xaxis_name=xaxis_name,
-                                 path_to_database='results_database',
-                                 when=args.when,
-                                 where=args.where)
+    spectrum_tallies = {f'nspectrum_{dp}': (helpers.detector_volume, None)
+                        for dp in helpers.detector_list}
+    openmc_file.tallies_to_hdf(tallies=spectrum_tallies,
+                               xs_library=args.xslib,
+                               xaxis_name=xaxis_name,
+                               path_to_database='results_database',
+                               when=args.when,
+                               where=args.where)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
 import openmc_fusion_benchmarks as ofb
 from pathlib import Path
 import helpers
@@ -36,6 +35,12 @@ def _parse_args():
         default="n/a",
         help="String with the place/institution where the simulation is run (e.g. 'MIT-PSFC')",
     )
+    parser.add_argument(
+        "-s",
+        "--threads",
+        type=int,
+        help="Total number of threads shared by the simulations (int)",
+    )
 
     args = parser.parse_args()
 
@@ -52,31 +57,19 @@ def main():
         raise ValueError(msg)
 
     # run simulation
-    try:
-        p = subprocess.Popen(["python3", "openmc_model.py"])
-    except:
-        p = subprocess.Popen(["python", "openmc_model.py"])
-
-    # wait for the simulation to finish
-    p.wait()
+    (statepoint,) = ofb.run_benchmarks(
+        [(ofb.ScriptBenchmark("openmc_model.py"), None)], cores=args.threads
+    )
 
     # read statepoint file
-    openmc_file = ofb.ResultsFromOpenmc("results/statepoint.100.h5")
+    openmc_file = ofb.ResultsFromOpenmc(statepoint)
 
     xaxis_name = "energy low [eV]"
-    openmc_file.tally_to_hdf(
-        tally_name=f"nspectrum",
-        normalize_over=helpers.surface,
-        xs_library=args.xslib,
-        xaxis_name=xaxis_name,
-        path_to_database="results_database",
-        when=args.when,
-        where=args.where,
-    )
-
-    openmc_file.tally_to_hdf(
-        tally_name=f"gspectrum",
-        normalize_over=helpers.surface,
+    openmc_file.tallies_to_hdf(
+        tallies={
+            "nspectrum": (helpers.surface, None),
+            "gspectrum": (helpers.surface, None),
+        },
         xs_library=args.xslib,
         xaxis_name=xaxis_name,
         path_to_database="results_database",
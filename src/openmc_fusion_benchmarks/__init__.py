@@ -1,13 +1,47 @@
-from openmc_fusion_benchmarks import irdff
-import openmc_fusion_benchmarks.neutron_sources
-from openmc_fusion_benchmarks.read_results import *
-from openmc_fusion_benchmarks.visualize import *
-from openmc_fusion_benchmarks.utils import *
-from openmc_fusion_benchmarks.benchmark import *
-from openmc_fusion_benchmarks.cloud_interface import *
-
-# this is commented out as the statepoint module is not ready yet and causes
-# the package to break on import. TODO add the statepoint module to the package
-# from openmc_fusion_benchmarks.statepoint import *
+import importlib
 
 __version__ = "0.1.0"
+
+# public names of the submodules, imported on first access (e.g. ofb.to_hdf)
+# so that reading results does not pay for openmc, scipy or matplotlib
+_submodule_names = {
+    'read_results': ['set_max_open_files', 'close_database_files', 'to_hdf', 'to_hdf_many',
+                     'convert_to_columnar', 'update_database_index', 'read_database_index',
+                     'read_fom_history', 'build_hdf_filename', 'ResultsFromDatabase', 'ResultsFromOpenmc'],
+    'database': ['ResultsDatabase'],
+    'comparison': ['align_results', 'compute_ce', 'summarize_ce', 'summarize_database'],
+    'visualize': ['add_floor_ceiling', 'plot_stddev_area', 'downsample_indices', 'PlotResults',
+                  'PlotReactionRates', 'PlotNuclearHeating', 'PlotEnergySpectra', 'PlotJob',
+                  'render_plots'],
+    'utils': ['rescale_to_lethargy', 'overlap_matrix', 'RebinOperator', 'rebin_arrays',
+              'rebin_spectrum', 'get_nonzero_energy_interval'],
+    'benchmark': ['ENTRY_POINT_GROUP', 'register_benchmark', 'clear_model_cache', 'Benchmark',
+                  'ScriptBenchmark', 'FngStr', 'FngW', 'Oktavian', 'FnsDuct', 'FnsCleanW',
+                  'BenchmarkDatabase'],
+    'runner': ['split_threads', 'run_benchmarks'],
+    'cloud_interface': ['LIB_PATH', 'GeometryCache', 'download_geometry', 'download_geometries'],
+    'download': ['file_checksum', 'HTTPBackend', 'GoogleDriveBackend', 'DownloadManager'],
+    'cache': ['get_cache_dir'],
+    'statepoint': ['LazyStatePoint', 'compare_figures_of_merit'],
+    'weight_windows': ['WEIGHT_WINDOWS_PATH', 'write_weight_windows', 'read_weight_windows',
+                       'load_weight_windows'],
+}
+_names = {name: module for module, names in _submodule_names.items() for name in names}
+_submodules = ['irdff', 'neutron_sources', *_submodule_names]
+
+__all__ = [*_submodules, *_names]
+
+
+def __getattr__(name):
+    if name in _names:
+        value = getattr(importlib.import_module(f'{__name__}.{_names[name]}'), name)
+    elif name in _submodules:
+        value = importlib.import_module(f'{__name__}.{name}')
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
@@ -1,44 +1,210 @@
 """Module for defining and managing benchmarks"""
+import copy
+import hashlib
+import importlib
+import importlib.metadata
+import importlib.util
+import os
+import subprocess
+import sys
+import shutil
+import threading
+import numpy as np
 import openmc
-from .cloud_interface import download_geometry
+from pathlib import Path
+from typing import Iterable
+from .cache import get_cache_dir
+from .cloud_interface import GeometryCache, download_geometry, download_geometries, \
+    _geometry_entry
+from .download import file_checksum
+from .statepoint import compare_figures_of_merit
+from .weight_windows import load_weight_windows, read_weight_windows, write_weight_windows, \
+    _mesh_attributes, WEIGHT_WINDOWS_PATH
 # from openmc_fusion_benchmarks import StatePoint
 # from openmc_fusion_benchmarks import get_statepoint_path
 from functools import wraps
 
 
+# benchmark classes by name, see register_benchmark
+_registry = {}
+# entry point group of the benchmarks defined by other packages
+ENTRY_POINT_GROUP = 'openmc_fusion_benchmarks.benchmarks'
+
+# models already built, by name, geometry type, run option, batches and particles
+_models = {}
+_models_lock = threading.Lock()
+
+# checksums of the files of the package, by path, size and modification time
+_file_checksums = {}
+
+
+def register_benchmark(name: str):
+    """Class decorator registering a Benchmark subclass under a name, so that
+    BenchmarkDatabase.get_benchmark(name) returns an instance of it. Other
+    packages can register their benchmarks the same way, or declare the
+    class in the 'openmc_fusion_benchmarks.benchmarks' entry point group,
+    which is only loaded when the name is first looked up.
+
+    Parameters
+    ----------
+    name : str
+        name of the benchmark
+    """
+    def decorator(cls):
+        _registry[name] = cls
+        return cls
+    return decorator
+
+
+def clear_model_cache():
+    """Forgets all the models built by Benchmark.get_model"""
+    with _models_lock:
+        _models.clear()
+
+
+def _package_checksum() -> str:
+    # changes whenever a file of the package changes, i.e. the source of the
+    # modules called by the benchmark modules (neutron sources, irdff
+    # filters...) or their data files, also in a development checkout where
+    # __version__ stays the same
+    root = Path(__file__).parent
+    sha = hashlib.sha256()
+    for path in sorted(root.rglob('*')):
+        if not path.is_file() or '__pycache__' in path.parts:
+            continue
+        stat = path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        if key not in _file_checksums:
+            _file_checksums[key] = file_checksum(path)
+        sha.update(f'{path.relative_to(root).as_posix()}:{_file_checksums[key]}\n'.encode())
+    return sha.hexdigest()
+
+
 class Benchmark:
+    # module with a model(geometry_type, ...) function building the openmc
+    # model, by default benchmarks/{name}/benchmark_module.py
+    module = None
+    # wwinp file used when lib/cad_geometries.json lists none, relative to
+    # WEIGHT_WINDOWS_PATH
+    wwinp = None
+
     def __init__(self, name: str):
         self.name = name
 
-    def get_model(self, geometry_type: str) -> openmc.Model:
-        """Dynamically import and return the model object from benchmarks/{benchmark_name}/model.py"""
-
+    def get_model(self, geometry_type: str, batches: int = None,
+                  particles: int = None) -> openmc.Model:
+        """Returns the openmc model of the benchmark, built by the model
+        function of the benchmark module. Models are built once per name,
+        geometry type, run option, batches and particles and every call
+        returns a deep copy of the built model, that can be modified freely.
+
+        Parameters
+        ----------
+        geometry_type : str
+            either "csg" or "cad"
+        batches : int, optional
+            number of batches, by default None (default of the module)
+        particles : int, optional
+            number of particles per batch, by default None (default of the
+            module)
+
+        Returns
+        -------
+        openmc.Model
+            model of the benchmark
+        """
         if geometry_type not in ['csg', 'cad']:
             raise ValueError(
                 'Invalid geometry type can be either "csg" or "cad"')
 
-        try:
-            module_path = f"openmc_fusion_benchmarks.benchmarks.{self.name}.benchmark_module"
-            benchmark_module = __import__(module_path, fromlist=['model'])
-            # Retrieve the model function or class from the module
-            benchmark_func = benchmark_module.model
+        kwargs = self._model_kwargs(batches, particles)
+        key = (self.name, geometry_type, kwargs.get('run_option'), batches, particles)
 
-            model = (
-                benchmark_func(geometry_type=geometry_type,
-                               run_option=self.run_option)
-                if hasattr(self, "run_option")
-                else benchmark_func(geometry_type=geometry_type)
-            )
+        with _models_lock:
+            if key not in _models:
+                try:
+                    benchmark_module = importlib.import_module(self._module_name())
+                except ModuleNotFoundError:
+                    raise ValueError(
+                        f"Model of benchmark {self.name} not found in {self._module_name()}")
+                _models[key] = benchmark_module.model(geometry_type=geometry_type, **kwargs)
+            model = copy.deepcopy(_models[key])
 
-            # Wrap `run()` only if geometry_type == 'cad'
-            if geometry_type == "cad" and hasattr(model, "run") and callable(model.run):
-                model.run = _wrap_run(self.download_h5m_file, model.run)
+        # Wrap `run()` only if geometry_type == 'cad'
+        if geometry_type == "cad" and hasattr(model, "run") and callable(model.run):
+            model.run = _wrap_run(self.download_h5m_file, model.run)
 
-            return model
+        return model
 
+    def _module_name(self) -> str:
+        return self.module or f"openmc_fusion_benchmarks.benchmarks.{self.name}.benchmark_module"
+
+    def _model_kwargs(self, batches: int = None, particles: int = None) -> dict:
+        return {k: v for k, v in [('run_option', getattr(self, 'run_option', None)),
+                                  ('batches', batches), ('particles', particles)]
+                if v is not None}
+
+    def _fingerprint(self, geometry_type: str, batches: int = None, particles: int = None,
+                     *extra) -> str:
+        # identifies a model by its parameters, the source of the benchmark
+        # module, the files of the package and the package and openmc versions
+        from openmc_fusion_benchmarks import __version__
+
+        try:
+            spec = importlib.util.find_spec(self._module_name())
         except ModuleNotFoundError:
+            spec = None
+        if spec is None:
             raise ValueError(
-                f"Model {self.model_name} not found in myrepo.models")
+                f"Model of benchmark {self.name} not found in {self._module_name()}")
+        source = file_checksum(spec.origin) if spec.origin else ''
+
+        fingerprint = repr((self.name, geometry_type,
+                            sorted(self._model_kwargs(batches, particles).items()),
+                            source, _package_checksum(), __version__, openmc.__version__,
+                            *extra))
+        return hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+
+    def get_model_xml(self, geometry_type: str, batches: int = None,
+                      particles: int = None, cache_dir: str = None) -> Path:
+        """Returns the model.xml file of the benchmark model, exported once
+        and cached. The cached file is identified by a fingerprint of the
+        model parameters (see get_model), of the source of the benchmark
+        module, of the files of the package and of the package and openmc
+        versions, so that openmc can run it directly without building the
+        model in Python.
+
+        Parameters
+        ----------
+        geometry_type : str
+            either "csg" or "cad"
+        batches : int, optional
+            number of batches, by default None (default of the module)
+        particles : int, optional
+            number of particles per batch, by default None (default of the
+            module)
+        cache_dir : str, optional
+            folder of the cached files, by default the models folder of the
+            package cache (see get_cache_dir)
+
+        Returns
+        -------
+        Path
+            path to the model.xml file
+        """
+        fingerprint = self._fingerprint(geometry_type, batches, particles)
+        folder = Path(cache_dir) if cache_dir is not None else get_cache_dir('models')
+        path = folder / f"{self.name}_{fingerprint}" / 'model.xml'
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            model = self.get_model(geometry_type, batches, particles)
+            # exported next to the final file and renamed atomically
+            tmp = path.with_name(f'.{os.getpid()}.{threading.get_ident()}.model.xml')
+            model.export_to_model_xml(tmp)
+            os.replace(tmp, path)
+
+        return path
 
     # def statepoint(self) -> StatePoint:
     #     sp_path = get_statepoint_path(self.geometry_type)
@@ -52,12 +218,298 @@ class Benchmark:
     def download_h5m_file(self, cwd: str = None):
         download_geometry(self.name, 'h5m', self.run_option, cwd)
 
-    def download_weight_windows(self, cwd: str = None):
-        # file needs to go on drive with the rest
-
-        # download ww file:
-        # return openmc.wwinp_to_wws(path/to/ww_file)
-        pass
+    def download_geometry_files(self, file_formats: tuple = ('step', 'rtt', 'h5m'),
+                                cwd: str = None) -> list:
+        """Downloads several geometry files of the benchmark concurrently.
+
+        Parameters
+        ----------
+        file_formats : tuple, optional
+            formats of the geometry files, by default ('step', 'rtt', 'h5m')
+        cwd : str, optional
+            destination folder, by default the current working directory
+
+        Returns
+        -------
+        list
+            paths to the files in cwd
+        """
+        return download_geometries(self.name, file_formats, self.run_option, cwd)
+
+    def _wwinp_url(self) -> str:
+        try:
+            entry = _geometry_entry(self.name, getattr(self, 'run_option', None))
+        except KeyError:
+            return ''
+        return entry.get('wwinp', '')
+
+    def _local_wwinp(self) -> Path:
+        path = Path(WEIGHT_WINDOWS_PATH / self.wwinp) if self.wwinp is not None else None
+        if path is None or not path.is_file():
+            raise ValueError(f"No weight windows available for benchmark {self.name}")
+        return path
+
+    def download_weight_windows(self, cwd: str = None) -> Path:
+        """Downloads the wwinp weight windows file of the benchmark in cwd,
+        through the geometry cache. If lib/cad_geometries.json lists no
+        wwinp file for the benchmark, the wwinp file shipped with the
+        package is copied instead.
+
+        Parameters
+        ----------
+        cwd : str, optional
+            destination folder, by default the current working directory
+
+        Returns
+        -------
+        Path
+            path to the wwinp file in cwd
+        """
+        if self._wwinp_url():
+            return download_geometry(self.name, 'wwinp', getattr(self, 'run_option', None), cwd)
+
+        source = self._local_wwinp()
+        destination = Path(cwd if cwd is not None else '.') / source.name
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if not (destination.exists() and os.path.samefile(source, destination)):
+            shutil.copy2(source, destination)
+        return destination
+
+    def get_weight_windows(self, cache: GeometryCache = None) -> list:
+        """Returns the weight windows of the benchmark. The wwinp file is
+        fetched through the geometry cache, or taken from the files shipped
+        with the package if lib/cad_geometries.json lists none, and only
+        parsed once, see load_weight_windows.
+
+        Parameters
+        ----------
+        cache : GeometryCache, optional
+            geometry cache to use, by default a GeometryCache in the package
+            cache folder
+
+        Returns
+        -------
+        list
+            openmc.WeightWindows objects
+        """
+        if not self._wwinp_url():
+            return load_weight_windows(self._local_wwinp())
+        if cache is None:
+            cache = GeometryCache()
+        return load_weight_windows(cache.get(self.name, 'wwinp', getattr(self, 'run_option', None)))
+
+    def run(self, run_option: str = None, threads: int = None, cwd: str = None,
+            geometry_type: str = 'csg', batches: int = None, particles: int = None,
+            xml_cache: bool = True, weight_windows: list = None) -> Path:
+        """Runs the benchmark model with openmc. By default openmc runs the
+        cached model.xml file of the model (see get_model_xml), which is only
+        built and exported if the model parameters, the benchmark module,
+        the files of the package or the package and openmc versions changed.
+
+        Parameters
+        ----------
+        run_option : str, optional
+            run option of the benchmark, by default the one of the
+            benchmark object
+        threads : int, optional
+            number of OpenMP threads, by default None (openmc's default)
+        cwd : str, optional
+            folder where to run the simulation, by default the run option
+            name or "results" if the benchmark has no run option
+        geometry_type : str, optional
+            either "csg" or "cad", by default 'csg'
+        batches : int, optional
+            number of batches, by default None (default of the module)
+        particles : int, optional
+            number of particles per batch, by default None (default of the
+            module)
+        xml_cache : bool, optional
+            runs the cached model.xml file instead of building and
+            exporting the model, by default True
+        weight_windows : list, optional
+            openmc.WeightWindows objects to run the model with, e.g. from
+            generate_weight_windows. The model is then built and exported
+            in cwd instead of using the cached model.xml, by default None
+
+        Returns
+        -------
+        Path
+            path to the last statepoint file written by the simulation
+        """
+        benchmark = copy.copy(self)
+        if run_option is not None:
+            benchmark.run_option = run_option
+        if cwd is None:
+            cwd = getattr(benchmark, 'run_option', None) or 'results'
+
+        if not xml_cache or weight_windows is not None:
+            model = benchmark.get_model(geometry_type, batches, particles)
+            if weight_windows is not None:
+                model.settings.weight_windows = weight_windows
+                model.settings.weight_windows_on = True
+            return Path(model.run(cwd=cwd, threads=threads))
+
+        path_input = benchmark.get_model_xml(geometry_type, batches, particles)
+        Path(cwd).mkdir(parents=True, exist_ok=True)
+        if geometry_type == 'cad':
+            benchmark.download_h5m_file(cwd)
+        openmc.run(threads=threads, cwd=cwd, path_input=path_input)
+        return _last_statepoint(cwd)
+
+    def generate_weight_windows(self, geometry_type: str = 'csg', batches: int = 10,
+                                particles: int = int(1e6), iterations: int = 3,
+                                mesh=None, dimension: tuple = (20, 20, 20),
+                                energy_bounds: Iterable = None, threads: int = None,
+                                cwd: str = None, cache_dir: str = None) -> tuple:
+        """Generates neutron weight windows for the benchmark with short
+        runs. A first analog run, without weight windows nor generator, is
+        the reference of the figures of merit. Then the openmc MAGIC weight
+        window generator runs iteratively: the first iteration generates
+        weight windows on the fly and each following one runs with the
+        weight windows of the previous one. The final weight windows are
+        stored in the weight windows cache together with the statepoint of
+        the analog run, and reused as long as the model and the generation
+        parameters are the same.
+
+        Parameters
+        ----------
+        geometry_type : str, optional
+            either "csg" or "cad", by default 'csg'
+        batches : int, optional
+            number of batches of each generation run, by default 10
+        particles : int, optional
+            number of particles per batch of each generation run, by
+            default int(1e6)
+        iterations : int, optional
+            number of MAGIC iterations after the analog run, by default 3
+        mesh : openmc.MeshBase, optional
+            mesh of the weight windows, by default a regular mesh over the
+            bounding box of the geometry
+        dimension : tuple, optional
+            number of mesh cells along x, y and z of the default mesh, by
+            default (20, 20, 20)
+        energy_bounds : Iterable, optional
+            energy bounds (eV) of the weight windows, by default None (one
+            group)
+        threads : int, optional
+            number of OpenMP threads, by default None (openmc's default)
+        cwd : str, optional
+            folder of the generation runs, by default
+            "weight_windows_generation", with one subfolder for the analog
+            run and one for each iteration
+        cache_dir : str, optional
+            folder of the cached files, by default the weight_windows
+            subfolder of the package cache folder (see get_cache_dir)
+
+        Returns
+        -------
+        tuple
+            list of openmc.WeightWindows and path to the statepoint file of
+            the analog run
+        """
+        if iterations < 1:
+            raise ValueError('At least one weight windows generation iteration is needed')
+        if mesh is None:
+            mesh_id = ('auto', tuple(dimension))
+        else:
+            mesh_id = (type(mesh).__name__, [np.asarray(getattr(mesh, name)).tolist()
+                                             for name in _mesh_attributes[type(mesh).__name__]])
+        fingerprint = self._fingerprint(
+            geometry_type, batches, particles, iterations, mesh_id,
+            None if energy_bounds is None else list(energy_bounds))
+        folder = Path(cache_dir) if cache_dir is not None else get_cache_dir('weight_windows')
+        path = folder / f"{self.name}_{fingerprint}.h5"
+        analog = path.with_name(f"{path.stem}.analog.h5")
+        if path.exists() and analog.exists():
+            return read_weight_windows(path), analog
+
+        model = self.get_model(geometry_type, batches, particles)
+        if mesh is None:
+            mesh = openmc.RegularMesh.from_domain(model.geometry, dimension=dimension)
+
+        # analog reference run, without any variance reduction
+        cwd = Path(cwd if cwd is not None else 'weight_windows_generation')
+        model.settings.weight_windows_on = False
+        analog_statepoint = Path(model.run(cwd=cwd / 'analog', threads=threads))
+
+        weight_windows = None
+        for i in range(iterations):
+            if weight_windows is not None:
+                # the generator uses the mesh of the loaded weight windows,
+                # which has the same id, so that a single mesh is exported
+                mesh = weight_windows[0].mesh
+                model.settings.weight_windows = weight_windows
+            # the loaded weight windows are applied, the generated ones only
+            # in the first iteration, where there is nothing loaded yet
+            model.settings.weight_window_generators = openmc.WeightWindowGenerator(
+                mesh, energy_bounds=energy_bounds, particle_type='neutron', method='magic',
+                max_realizations=batches, update_interval=1,
+                on_the_fly=weight_windows is None)
+            model.settings.weight_windows_on = True
+            model.run(cwd=cwd / f'iteration_{i}', threads=threads)
+            weight_windows = openmc.hdf5_to_wws(str(cwd / f'iteration_{i}' / 'weight_windows.h5'))
+
+        folder.mkdir(parents=True, exist_ok=True)
+        # written next to the final files and renamed atomically
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp_analog = analog.with_name(f'{analog.name}.{os.getpid()}.tmp')
+        write_weight_windows(weight_windows, tmp)
+        shutil.copy2(analog_statepoint, tmp_analog)
+        os.replace(tmp_analog, analog)
+        os.replace(tmp, path)
+
+        return read_weight_windows(path), analog
+
+    def run_with_weight_windows(self, run_option: str = None, threads: int = None,
+                                cwd: str = None, geometry_type: str = 'csg',
+                                batches: int = None, particles: int = None,
+                                **generation) -> tuple:
+        """Runs the benchmark with weight windows generated for it, see
+        generate_weight_windows, and reports the figure of merit gain of
+        each tally with respect to the analog reference run of the
+        generation.
+
+        Parameters
+        ----------
+        run_option : str, optional
+            run option of the benchmark, by default the one of the
+            benchmark object
+        threads : int, optional
+            number of OpenMP threads, by default None (openmc's default)
+        cwd : str, optional
+            folder where to run the simulation, by default the run option
+            name or "results" if the benchmark has no run option
+        geometry_type : str, optional
+            either "csg" or "cad", by default 'csg'
+        batches : int, optional
+            number of batches, by default None (default of the module)
+        particles : int, optional
+            number of particles per batch, by default None (default of the
+            module)
+        **generation
+            arguments of generate_weight_windows
+
+        Returns
+        -------
+        tuple
+            path to the last statepoint file written by the simulation and
+            pd.DataFrame of the figures of merit of each tally, see
+            compare_figures_of_merit
+        """
+        benchmark = copy.copy(self)
+        if run_option is not None:
+            benchmark.run_option = run_option
+        if cwd is None:
+            cwd = getattr(benchmark, 'run_option', None) or 'results'
+
+        generation.setdefault('cwd', Path(cwd) / 'weight_windows_generation')
+        weight_windows, analog = benchmark.generate_weight_windows(
+            geometry_type, threads=threads, **generation)
+        statepoint = benchmark.run(threads=threads, cwd=cwd, geometry_type=geometry_type,
+                                   batches=batches, particles=particles,
+                                   weight_windows=weight_windows)
+
+        return statepoint, compare_figures_of_merit(analog, statepoint)
 
     def _run_and_store(self):
         pass
@@ -73,6 +525,65 @@ def _wrap_run(download_files_func, original_run):
     return wrapped_run
 
 
+class ScriptBenchmark(Benchmark):
+    """Benchmark defined by a standalone openmc_model.py script, like the
+    ones in the models/ folder of the repository. The run option is passed
+    to the script as a --{run_option} command line flag and the script is
+    expected to run the simulation in a folder named after the run option,
+    or in the results folder if there is no run option.
+    """
+
+    def __init__(self, script: str = 'openmc_model.py', results_folder: str = 'results'):
+        self.script = Path(script).resolve()
+        super().__init__(self.script.parent.name)
+
+        self.results_folder = results_folder
+
+    def run(self, run_option: str = None, threads: int = None, cwd: str = None,
+            geometry_type: str = 'csg') -> Path:
+        """Runs the openmc_model.py script in a subprocess. The script output
+        is written to a {run_option}.log file next to the script.
+
+        Parameters
+        ----------
+        run_option : str, optional
+            run option flag of the script, by default None
+        threads : int, optional
+            number of OpenMP threads, by default None (openmc's default)
+        cwd : str, optional
+            not used, the script decides where to run the simulation
+        geometry_type : str, optional
+            not used, the script decides the geometry type
+
+        Returns
+        -------
+        Path
+            path to the last statepoint file written by the simulation
+        """
+        folder = run_option if run_option is not None else self.results_folder
+
+        command = [sys.executable, str(self.script)]
+        if run_option is not None:
+            command.append(f'--{run_option}')
+        if threads is not None:
+            command += ['--threads', str(threads)]
+
+        with open(self.script.parent / f'{folder}.log', 'w') as log:
+            subprocess.run(command, cwd=self.script.parent, stdout=log,
+                           stderr=subprocess.STDOUT, check=True)
+
+        return _last_statepoint(self.script.parent / folder)
+
+
+def _last_statepoint(folder: Path) -> Path:
+    statepoints = sorted(Path(folder).glob('statepoint.*.h5'),
+                         key=lambda p: int(p.name.split('.')[1]))
+    if not statepoints:
+        raise FileNotFoundError(f'No statepoint file found in {folder}')
+    return statepoints[-1]
+
+
+@register_benchmark("fng_str")
 class FngStr(Benchmark):
     def __init__(self, run_option: str = 'onaxis'):
         super().__init__("fng_str")
@@ -80,40 +591,78 @@ class FngStr(Benchmark):
         self.run_option = run_option
 
 
+@register_benchmark("fng_w")
 class FngW(Benchmark):
+    wwinp = 'fng_w/weight_windows.cadis.wwinp'
+
     def __init__(self, run_option: str = 'reaction_rates'):
         super().__init__("fng_w")
 
         self.run_option = run_option
 
 
+@register_benchmark("oktavian")
 class Oktavian(Benchmark):
     def __init__(self, run_option: str = 'Al'):
         super().__init__("oktavian")
 
 
+@register_benchmark("fns_duct")
 class FnsDuct(Benchmark):
     def __init__(self):
         super().__init__("fns_duct")
 
 
+@register_benchmark("fns_clean_w")
 class FnsCleanW(Benchmark):
+    wwinp = 'fns_clean_w/weight_windows.wwinp'
+
     def __init__(self):
         super().__init__("fns_clean_w")
 
 
+def _entry_points() -> dict:
+    entry_points = importlib.metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        entry_points = entry_points.select(group=ENTRY_POINT_GROUP)
+    else:
+        entry_points = entry_points.get(ENTRY_POINT_GROUP, [])
+    return {entry_point.name: entry_point for entry_point in entry_points}
+
+
 class BenchmarkDatabase:
     @staticmethod
     def get_benchmark(name: str, **kwargs):
-        if name == "fng_str":
-            return FngStr(**kwargs)
-        elif name == "fng_w":
-            return FngW(**kwargs)
-        elif name == "oktavian":
-            return Oktavian(**kwargs)
-        elif name == "fns_duct":
-            return FnsDuct(**kwargs)
-        elif name == "fns_clean_w":
-            return FnsCleanW(**kwargs)
-        else:
-            return Benchmark(name)
+        """Returns the benchmark registered under name, looking it up in the
+        entry points if it is not registered yet, or a plain Benchmark.
+
+        Parameters
+        ----------
+        name : str
+            name of the benchmark
+        **kwargs
+            arguments of the benchmark class, e.g. run_option
+
+        Returns
+        -------
+        Benchmark
+            benchmark object
+        """
+        if name not in _registry:
+            entry_point = _entry_points().get(name)
+            if entry_point is None:
+                return Benchmark(name)
+            _registry[name] = entry_point.load()
+        return _registry[name](**kwargs)
+
+    @staticmethod
+    def list_benchmarks() -> list:
+        """Names of the registered benchmarks and of the benchmarks declared
+        in entry points, without loading the latter.
+
+        Returns
+        -------
+        list
+            sorted names of the benchmarks
+        """
+        return sorted({*_registry, *_entry_points()})
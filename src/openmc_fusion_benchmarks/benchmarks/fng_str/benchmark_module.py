@@ -150,16 +150,11 @@ def _tallies(onaxis1_cellfilter, onaxis2_cellfilter, offaxis_cellfilter, heating
         for n, r, x in zip(nuclides, reactions, irdff_xs):
             # onaxis1 tally
             tally1 = openmc.Tally(name=f"rr_onaxis1_{n}")
-            irdff_xs = irdff.get_cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                irdff_xs[r])
+            multiplier = irdff.get_energy_function_filter(x, r)
             tally1.filters = [onaxis1_cellfilter, neutron_filter, multiplier]
             tally1.scores = ["flux"]
             # onaxis2 tally
             tally2 = openmc.Tally(name=f"rr_onaxis2_{n}")
-            irdff_xs = irdff.get_cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                irdff_xs[r])
             tally2.filters = [onaxis2_cellfilter, neutron_filter, multiplier]
             tally2.scores = ["flux"]
             tallies.extend([tally1, tally2])
@@ -167,9 +162,7 @@ def _tallies(onaxis1_cellfilter, onaxis2_cellfilter, offaxis_cellfilter, heating
         for n, r, x in zip(nuclides, reactions, irdff_xs):
             # offaxis tally
             tally = openmc.Tally(name=f"rr_offaxis_{n}")
-            nb93_n2n_irdff = irdff.get_cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                nb93_n2n_irdff[r])
+            multiplier = irdff.get_energy_function_filter(x, r)
             tally.filters = [offaxis_cellfilter, neutron_filter, multiplier]
             tally.scores = ["flux"]
             tallies.append(tally)
@@ -2468,16 +2461,11 @@ def csg_model(batches: int = int(100), particles: int = int(1e8), run_option: st
         for n, r, x in zip(nuclides, reactions, irdff_xs):
             # onaxis1 tally
             tally1 = openmc.Tally(name=f"rr_onaxis1_{n}")
-            irdff_xs = irdff.get_cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                irdff_xs[r])
+            multiplier = irdff.get_energy_function_filter(x, r)
             tally1.filters = [onaxis1_cell_filter, neutron_filter, multiplier]
             tally1.scores = ["flux"]
             # onaxis2 tally
             tally2 = openmc.Tally(name=f"rr_onaxis2_{n}")
-            irdff_xs = irdff.get_cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                irdff_xs[r])
             tally2.filters = [onaxis2_cell_filter, neutron_filter, multiplier]
             tally2.scores = ["flux"]
             model.tallies.extend([tally1, tally2])
@@ -2485,9 +2473,7 @@ def csg_model(batches: int = int(100), particles: int = int(1e8), run_option: st
         for n, r, x in zip(nuclides, reactions, irdff_xs):
             # offaxis tally
             tally = openmc.Tally(name=f"rr_offaxis_{n}")
-            nb93_n2n_irdff = irdff.get_cross_section(x)
-            multiplier = openmc.EnergyFunctionFilter.from_tabulated1d(
-                nb93_n2n_irdff[r])
+            multiplier = irdff.get_energy_function_filter(x, r)
             tally.filters = [offaxis_cell_filter, neutron_filter, multiplier]
             tally.scores = ["flux"]
             model.tallies.append(tally)
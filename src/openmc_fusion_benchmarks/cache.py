@@ -0,0 +1,32 @@
+"""Location of the on-disk caches of the package"""
+import os
+from pathlib import Path
+
+
+def get_cache_dir(subfolder: str = None) -> Path:
+    """Returns the folder where the package caches downloaded and
+    precomputed data. It is the OFB_CACHE_DIR environment variable if set,
+    otherwise openmc_fusion_benchmarks in the user cache folder
+    (XDG_CACHE_HOME or ~/.cache). The folder is created if missing.
+
+    Parameters
+    ----------
+    subfolder : str, optional
+        name of a subfolder of the cache folder, by default None
+
+    Returns
+    -------
+    Path
+        path to the cache folder
+    """
+    if 'OFB_CACHE_DIR' in os.environ:
+        cache_dir = Path(os.environ['OFB_CACHE_DIR'])
+    else:
+        user_cache = os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')
+        cache_dir = Path(user_cache) / 'openmc_fusion_benchmarks'
+
+    if subfolder is not None:
+        cache_dir = cache_dir / subfolder
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    return cache_dir
@@ -1,32 +1,319 @@
 import json
-import gdown
-import importlib
+import importlib.resources
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .cache import get_cache_dir
+from .download import DownloadManager, file_checksum
 
 
 LIB_PATH = importlib.resources.files(
     "openmc_fusion_benchmarks.lib")
 
 
-def download_geometry(benchmark_name: str, file_format: str, run_option: str = None, cwd: str = None):
-
+def _geometry_entry(benchmark_name: str, run_option: str = None) -> dict:
     filepath = LIB_PATH / "cad_geometries.json"
     with open(filepath, "r") as f:
         data = json.load(f)
 
-        # Your Google Drive file link
     if run_option is not None:
-        url = data[benchmark_name][run_option][file_format]
-    else:
-        url = data[benchmark_name][file_format]
+        return data[benchmark_name][run_option]
+    return data[benchmark_name]
+
+
+class GeometryCache:
+    """Persistent, content-addressed on-disk cache of the CAD geometry files
+    of the benchmarks. Files are stored once under their sha256 checksum
+    and indexed by (benchmark, run_option, file format). A file is only
+    fetched again if it is missing or corrupted, i.e. its checksum does not
+    match the one computed when it was first downloaded. A "sha256" entry
+    can be added next to the urls in lib/cad_geometries.json to verify the
+    download itself, no checksum is recorded there yet so the first download
+    is trusted. The total size of the cache is bounded and the least
+    recently used files are evicted first.
+    """
+
+    def __init__(self, cache_dir: str = None, max_size: float = 20e9, fetch: Callable = None):
+        """GeometryCache class constructor
+
+        Parameters
+        ----------
+        cache_dir : str, optional
+            folder of the cache, by default the geometries subfolder of
+            the package cache folder
+        max_size : float, optional
+            maximum size of the cache in bytes, by default 20e9
+        fetch : Callable, optional
+            function called as fetch(url, folder) that downloads the file
+            at url in folder and returns its path, by default the fetch
+            method of a DownloadManager, which resumes interrupted
+            downloads left in the cache folder
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None \
+            else get_cache_dir("geometries")
+        self.max_size = max_size
+        self.fetch = fetch if fetch is not None else DownloadManager().fetch
+
+        self._blobs = self.cache_dir / "blobs"
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        self._downloads = self.cache_dir / "downloads"
+        self._index_path = self.cache_dir / "index.json"
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(benchmark_name: str, file_format: str, run_option: str = None) -> str:
+        return "/".join([benchmark_name, run_option or "-", file_format])
+
+    def _read_index(self) -> dict:
+        if not self._index_path.exists():
+            return {}
+        with open(self._index_path, "r") as f:
+            return json.load(f)
+
+    def _write_index(self, index: dict):
+        # atomic replace so that a crash never leaves a broken index
+        tmp = self._index_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp, self._index_path)
+
+    def _is_valid(self, entry: dict, expected: str) -> bool:
+        blob = self._blobs / entry["sha256"]
+        if not blob.exists():
+            return False
+        if expected and entry["sha256"] != expected:
+            return False
+        # rehash only if the file changed since it was last verified
+        stat = blob.stat()
+        if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        return file_checksum(blob) == entry["sha256"]
+
+    def get(self, benchmark_name: str, file_format: str, run_option: str = None) -> Path:
+        """Returns the path to the cached geometry file, downloading it if
+        it is missing or corrupted.
+
+        Parameters
+        ----------
+        benchmark_name : str
+            name of the benchmark
+        file_format : str
+            format of the geometry file ("step", "rtt", "h5m" or "wwinp")
+        run_option : str, optional
+            run option of the benchmark, by default None
+
+        Returns
+        -------
+        Path
+            path to the file in the cache
+        """
+        entry = _geometry_entry(benchmark_name, run_option)
+        url = entry.get(file_format, "")
+        expected = entry.get("sha256", {}).get(file_format, "")
+        key = self.key(benchmark_name, file_format, run_option)
+        if not url:
+            raise ValueError(f"No {file_format} file available for {key}")
+
+        with self._lock:
+            index = self._read_index()
+            cached = index.get(key)
+            if cached is not None and self._is_valid(cached, expected):
+                cached["last_used"] = time.time()
+                self._write_index(index)
+                return self._blobs / cached["sha256"]
+
+        # download outside of the lock so that other files can be served,
+        # partial downloads are kept in the cache folder to be resumed
+        folder = self._downloads / key.replace("/", "_")
+        folder.mkdir(parents=True, exist_ok=True)
+        downloaded = Path(self.fetch(url, folder))
+        checksum = file_checksum(downloaded)
+        if expected and checksum != expected:
+            downloaded.unlink()
+            raise ValueError(
+                f"Checksum mismatch for {key}: expected {expected}, got {checksum}")
+        blob = self._blobs / checksum
+        os.replace(downloaded, blob)
+
+        stat = blob.stat()
+        with self._lock:
+            index = self._read_index()
+            index[key] = {"sha256": checksum, "filename": downloaded.name,
+                          "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                          "last_used": time.time()}
+            self._evict(index, keep=key)
+            self._write_index(index)
+
+        return blob
+
+    def get_many(self, requests: Iterable, max_workers: int = 4) -> list:
+        """Returns the paths to several cached geometry files, downloading
+        the missing ones concurrently.
+
+        Parameters
+        ----------
+        requests : Iterable
+            (benchmark_name, file_format, run_option) tuples
+        max_workers : int, optional
+            maximum number of concurrent downloads, by default 4
+
+        Returns
+        -------
+        list
+            paths to the files in the cache, in the same order as requests
+        """
+        requests = [tuple(r) for r in requests]
+        # each file is fetched once even if requested several times
+        unique = list(dict.fromkeys(requests))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            paths = dict(zip(unique, executor.map(lambda r: self.get(*r), unique)))
+        return [paths[r] for r in requests]
+
+    def materialize(self, benchmark_name: str, file_format: str, run_option: str = None,
+                    cwd: str = None, link: str = "symlink") -> Path:
+        """Makes a cached geometry file available in a folder, downloading it
+        first if needed. The file keeps its original name.
+
+        Parameters
+        ----------
+        benchmark_name : str
+            name of the benchmark
+        file_format : str
+            format of the geometry file ("step", "rtt" or "h5m")
+        run_option : str, optional
+            run option of the benchmark, by default None
+        cwd : str, optional
+            destination folder, by default the current working directory
+        link : str, optional
+            "symlink", "hardlink" or "copy". Links fall back to copies when
+            not supported by the filesystem, by default "symlink"
+
+        Returns
+        -------
+        Path
+            path to the file in the destination folder
+        """
+        blob = self.get(benchmark_name, file_format, run_option)
+        return self._link(blob, benchmark_name, file_format, run_option, cwd, link)
+
+    def _link(self, blob: Path, benchmark_name: str, file_format: str, run_option: str,
+              cwd: str, link: str) -> Path:
+        with self._lock:
+            filename = self._read_index()[self.key(
+                benchmark_name, file_format, run_option)]["filename"]
+
+        destination = Path(cwd if cwd is not None else ".") / filename
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if destination.is_symlink() or destination.exists():
+            if destination.resolve() == blob.resolve() or \
+                    (destination.exists() and os.path.samefile(destination, blob)):
+                return destination
+            destination.unlink()
+
+        try:
+            if link == "symlink":
+                destination.symlink_to(blob.resolve())
+            elif link == "hardlink":
+                os.link(blob, destination)
+            else:
+                shutil.copy2(blob, destination)
+        except OSError:
+            shutil.copy2(blob, destination)
+
+        return destination
+
+    def _evict(self, index: dict, keep: str = None):
+        # drop least recently used entries until the cache fits in max_size
+        def size(index):
+            blobs = {e["sha256"]: e["size"] for e in index.values()}
+            return sum(blobs.values())
+
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if size(index) <= self.max_size:
+                break
+            if key == keep:
+                continue
+            entry = index.pop(key)
+            # blobs can be shared by several keys with the same content
+            if all(e["sha256"] != entry["sha256"] for e in index.values()):
+                (self._blobs / entry["sha256"]).unlink(missing_ok=True)
+
+    def clear(self):
+        """Removes all the files from the cache
+        """
+        with self._lock:
+            shutil.rmtree(self._blobs, ignore_errors=True)
+            self._blobs.mkdir(parents=True, exist_ok=True)
+            self._write_index({})
+
+
+def download_geometry(benchmark_name: str, file_format: str, run_option: str = None, cwd: str = None,
+                      cache: GeometryCache = None):
+    """Downloads the CAD geometry file of a benchmark in cwd. The file goes
+    through the persistent geometry cache, so it is only downloaded if it is
+    not already cached, and it is then linked into cwd.
+
+    Parameters
+    ----------
+    benchmark_name : str
+        name of the benchmark
+    file_format : str
+        format of the geometry file ("step", "rtt", "h5m" or "wwinp")
+    run_option : str, optional
+        run option of the benchmark, by default None
+    cwd : str, optional
+        destination folder, by default the current working directory
+    cache : GeometryCache, optional
+        geometry cache to use, by default a GeometryCache in the package
+        cache folder
+
+    Returns
+    -------
+    Path
+        path to the file in cwd
+    """
+    if cache is None:
+        cache = GeometryCache()
+
+    return cache.materialize(benchmark_name, file_format, run_option, cwd)
+
+
+def download_geometries(benchmark_name: str, file_formats: Iterable = ("step", "rtt", "h5m"),
+                        run_option: str = None, cwd: str = None, cache: GeometryCache = None,
+                        max_workers: int = 4) -> list:
+    """Downloads several CAD geometry files of a benchmark in cwd
+    concurrently, through the persistent geometry cache.
 
-    # Extract the file ID from the URL
-    file_id = url.split("/d/")[1].split("/")[0]
-    download_url = f"https://drive.google.com/uc?export=download&id={file_id}"
+    Parameters
+    ----------
+    benchmark_name : str
+        name of the benchmark
+    file_formats : Iterable, optional
+        formats of the geometry files, by default ("step", "rtt", "h5m")
+    run_option : str, optional
+        run option of the benchmark, by default None
+    cwd : str, optional
+        destination folder, by default the current working directory
+    cache : GeometryCache, optional
+        geometry cache to use, by default a GeometryCache in the package
+        cache folder
+    max_workers : int, optional
+        maximum number of concurrent downloads, by default 4
 
-    # make sure cwd is identified as directory:
-    if cwd is not None:
-        if not cwd.endswith("/"):
-            cwd += "/"
+    Returns
+    -------
+    list
+        paths to the files in cwd, in the same order as file_formats
+    """
+    if cache is None:
+        cache = GeometryCache()
 
-    # Download the file
-    gdown.download(download_url, output=cwd, quiet=False, use_cookies=False)
+    requests = [(benchmark_name, fmt, run_option) for fmt in file_formats]
+    blobs = cache.get_many(requests, max_workers=max_workers)
+    return [cache._link(blob, *request, cwd, "symlink")
+            for blob, request in zip(blobs, requests)]
@@ -0,0 +1,240 @@
+"""Headless computation of C/E ratios and comparison statistics"""
+import warnings
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def align_results(reference: pd.DataFrame, computed: dict, xaxis=None) -> tuple:
+    """Aligns many computed results to the reference results on the x-axis
+    column(s) and stacks them in arrays, one row per computed set. Points of
+    the reference that are missing from a computed set are NaN.
+
+    Parameters
+    ----------
+    reference : pd.DataFrame
+        reference results (most likely experimental) with 'mean' and
+        'std. dev.' columns
+    computed : dict
+        computed results DataFrames with 'mean' and 'std. dev.' columns,
+        keyed by a label of the set
+    xaxis : str or Iterable, optional
+        name(s) of the column(s) used to align the results. If None, the
+        results are aligned by position, by default None
+
+    Returns
+    -------
+    tuple
+        x-axis values of the reference (pd.DataFrame, or None if xaxis is
+        None), reference mean and std. dev. arrays of shape (n points,),
+        computed mean and std. dev. arrays of shape (n sets, n points)
+    """
+    n_points = len(reference)
+    c_mean = np.full((len(computed), n_points), np.nan)
+    c_std = np.full((len(computed), n_points), np.nan)
+
+    if xaxis is None:
+        for i, df in enumerate(computed.values()):
+            n = min(len(df), n_points)
+            c_mean[i, :n] = df['mean'].to_numpy()[:n]
+            c_std[i, :n] = df['std. dev.'].to_numpy()[:n]
+        xvalues = None
+    else:
+        xaxis = [xaxis] if isinstance(xaxis, str) else list(xaxis)
+        xvalues = reference[xaxis].reset_index(drop=True)
+        position = _keys(xvalues, xaxis)
+        for i, df in enumerate(computed.values()):
+            rows = position.get_indexer(_keys(df, xaxis))
+            found = rows >= 0
+            c_mean[i, rows[found]] = df['mean'].to_numpy()[found]
+            c_std[i, rows[found]] = df['std. dev.'].to_numpy()[found]
+
+    return (xvalues, reference['mean'].to_numpy(dtype=float),
+            reference['std. dev.'].to_numpy(dtype=float), c_mean, c_std)
+
+
+def _keys(df: pd.DataFrame, xaxis: list) -> pd.MultiIndex:
+    # repeated x-axis values are matched in order of appearance
+    keys = df[xaxis].reset_index(drop=True)
+    keys['occurrence'] = keys.groupby(xaxis, sort=False, dropna=False).cumcount()
+    return pd.MultiIndex.from_frame(keys)
+
+
+def compute_ce(reference: pd.DataFrame, computed: dict, xaxis=None) -> pd.DataFrame:
+    """Computes the C/E ratios of many computed results sets at once, with
+    the uncertainties of C and E propagated in quadrature.
+
+    Parameters
+    ----------
+    reference : pd.DataFrame
+        reference results (most likely experimental) with 'mean' and
+        'std. dev.' columns
+    computed : dict
+        computed results DataFrames with 'mean' and 'std. dev.' columns,
+        keyed by a label of the set
+    xaxis : str or Iterable, optional
+        name(s) of the column(s) used to align the results. If None, the
+        results are aligned by position, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        one row per computed set and reference point with the set label,
+        the x-axis values, C, std. dev. of C, E, std. dev. of E, C/E and
+        std. dev. of C/E
+    """
+    xvalues, e_mean, e_std, c_mean, c_std = align_results(reference, computed, xaxis)
+    ce, ce_std = _ce(e_mean, e_std, c_mean, c_std)
+
+    n_sets, n_points = c_mean.shape
+    df = pd.DataFrame({'set': np.repeat(list(computed), n_points)})
+    if xvalues is not None:
+        for column in xvalues.columns:
+            df[column] = np.tile(xvalues[column].to_numpy(), n_sets)
+    df['C'] = c_mean.ravel()
+    df['C std. dev.'] = c_std.ravel()
+    df['E'] = np.tile(e_mean, n_sets)
+    df['E std. dev.'] = np.tile(e_std, n_sets)
+    df['C/E'] = ce.ravel()
+    df['C/E std. dev.'] = ce_std.ravel()
+
+    return df
+
+
+def _ce(e_mean, e_std, c_mean, c_std) -> tuple:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ce = c_mean / e_mean
+        ce_std = np.abs(ce) * np.sqrt((c_std / c_mean)**2 + (e_std / e_mean)**2)
+    # points with no reference value carry no information
+    invalid = ~np.isfinite(ce)
+    ce[invalid] = np.nan
+    ce_std[invalid] = np.nan
+    return ce, ce_std
+
+
+def summarize_ce(reference: pd.DataFrame, computed: dict, xaxis=None) -> pd.DataFrame:
+    """Computes summary statistics of the agreement of many computed results
+    sets with the reference results, all sets at once.
+
+    Parameters
+    ----------
+    reference : pd.DataFrame
+        reference results (most likely experimental) with 'mean' and
+        'std. dev.' columns
+    computed : dict
+        computed results DataFrames with 'mean' and 'std. dev.' columns,
+        keyed by a label of the set
+    xaxis : str or Iterable, optional
+        name(s) of the column(s) used to align the results. If None, the
+        results are aligned by position, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        one row per computed set with the number of compared points, the
+        mean, min and max C/E, the root mean square of C/E - 1, the
+        fractions of points within 1 and 2 combined std. dev. of the
+        reference, the chi-square, the reduced chi-square and its p-value
+    """
+    _, e_mean, e_std, c_mean, c_std = align_results(reference, computed, xaxis)
+    ce, ce_std = _ce(e_mean, e_std, c_mean, c_std)
+
+    valid = np.isfinite(ce)
+    n = valid.sum(axis=1)
+    # deviations in units of the combined std. dev. of C and E
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(valid, (c_mean - e_mean) / np.sqrt(c_std**2 + e_std**2), np.nan)
+    z[valid & ~np.isfinite(z)] = np.nan
+    n_z = np.isfinite(z).sum(axis=1)
+    chi2 = np.nansum(z**2, axis=1)
+
+    # sets with no valid point give NaN statistics
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        summary = pd.DataFrame({
+            'set': list(computed),
+            'n points': n,
+            'mean C/E': np.nanmean(ce, axis=1),
+            'min C/E': np.nanmin(ce, axis=1),
+            'max C/E': np.nanmax(ce, axis=1),
+            'rms(C/E-1)': np.sqrt(np.nanmean((ce - 1)**2, axis=1)),
+            'within 1 sigma': np.sum(np.abs(z) <= 1, axis=1) / n_z,
+            'within 2 sigma': np.sum(np.abs(z) <= 2, axis=1) / n_z,
+            'chi2': chi2,
+            'reduced chi2': chi2 / n_z,
+            'p-value': stats.chi2.sf(chi2, n_z)})
+
+    return summary
+
+
+def summarize_database(database, xaxis_fallback: bool = True, **selection) -> pd.DataFrame:
+    """Compares every computed result of a ResultsDatabase with the
+    experimental results of the same benchmark and tally, see summarize_ce.
+
+    Parameters
+    ----------
+    database : ResultsDatabase
+        database of the results
+    xaxis_fallback : bool, optional
+        align the results by position when the x-axis of a tally is not
+        stored or is not a column of all the results, otherwise such
+        tallies are skipped, by default True
+    **selection
+        benchmark, tally, code, version and library criteria, see
+        ResultsDatabase.select
+
+    Returns
+    -------
+    pd.DataFrame
+        one row per benchmark, tally and computed results file with the
+        code, version and library and the summary statistics
+
+    Raises
+    ------
+    ValueError
+        if the selection has no experimental results
+    """
+    df = database.get_dataframe(**selection)
+    catalog = database.select(**selection)
+    if not (catalog['code'] == 'experiment').any():
+        raise ValueError('No experimental results in the selection, '
+                         'select code "experiment" to compare with')
+    summaries = []
+    for (benchmark, tally), entries in catalog.groupby(['benchmark', 'tally'], sort=False):
+        is_reference = entries['code'] == 'experiment'
+        if not is_reference.any() or is_reference.all():
+            continue
+        results = df[(df['benchmark'] == benchmark) & (df['tally'] == tally)]
+        keys = ['code', 'version', 'library']
+        # columns of the other tallies are empty after stacking
+        def clean(group):
+            return group.drop(columns=['benchmark', 'tally'] + keys).dropna(
+                axis=1, how='all').reset_index(drop=True)
+
+        # experimental files may also store a library or a version
+        is_experiment = results['code'] == 'experiment'
+        if not is_experiment.any():
+            raise ValueError(f'No experimental results found for {tally} of {benchmark}')
+        reference = clean(results[is_experiment])
+        groups = {key: clean(group)
+                  for key, group in results[~is_experiment].groupby(keys, sort=False)}
+
+        # the x-axis has to be a column of all the results to align them
+        xaxis = entries.loc[is_reference, 'x_axis'].iloc[0]
+        if not isinstance(xaxis, str) or \
+                any(xaxis not in g.columns for g in [reference, *groups.values()]):
+            if not xaxis_fallback:
+                continue
+            xaxis = None
+
+        summary = summarize_ce(reference, groups, xaxis)
+        summary[keys] = pd.DataFrame(summary.pop('set').tolist(), columns=keys)
+        summary.insert(0, 'benchmark', benchmark)
+        summary.insert(1, 'tally', tally)
+        summaries.append(summary)
+
+    columns = ['benchmark', 'tally', 'code', 'version', 'library']
+    if not summaries:
+        return pd.DataFrame(columns=columns)
+    summary = pd.concat(summaries, ignore_index=True)
+    return summary[columns + [c for c in summary.columns if c not in columns]]
@@ -0,0 +1,196 @@
+"""Query layer over the results_database folders of the benchmarks"""
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+
+from .read_results import ResultsFromDatabase, update_database_index, _info_attrs
+
+# columns identifying the origin of each result in the catalog
+_catalog_columns = ['benchmark', 'file', 'code', 'version', 'library', 'tally',
+                    'x_axis', 'n_rows']
+
+
+def _normalize_library(xs_library: str) -> str:
+    # same normalization as build_hdf_filename
+    return str(xs_library).strip().replace(' ', '').replace('.', '').replace('-', '').lower()
+
+
+def _parse_filename(filename: str) -> tuple:
+    # (code, version, library) from a build_hdf_filename name,
+    # e.g. openmc-0-14-0_fendl32b.h5, or (stem, 'n/a', 'n/a')
+    stem = Path(filename).stem
+    if '_' not in stem:
+        return stem, 'n/a', 'n/a'
+    code, library = stem.split('_', 1)
+    code, *version = code.split('-')
+    return code, '.'.join(version) if version else 'n/a', library
+
+
+def _as_list(selection) -> list:
+    if selection is None:
+        return None
+    if isinstance(selection, str):
+        return [selection]
+    return list(selection)
+
+
+class ResultsDatabase:
+    """Catalog of all the results stored in a results_database folder, i.e.
+    one hdf file per code, version and nuclear data library in one folder
+    per benchmark. The catalog is built once from the consolidated index of
+    each benchmark folder (see update_database_index) and kept in memory.
+    Results can be selected by benchmark, tally, code, version and library
+    and read in parallel into a single stacked DataFrame:
+
+    >>> db = ResultsDatabase('results_database')
+    >>> df = db.get_dataframe(benchmark='oktavian_*', tally='nspectrum',
+    ...                       code=['openmc', 'experiment'], library='fendl-3.2')
+    """
+
+    def __init__(self, root: str = 'results_database', max_workers: int = 8):
+        """ResultsDatabase class constructor
+
+        Parameters
+        ----------
+        root : str, optional
+            path to the results_database folder, by default 'results_database'
+        max_workers : int, optional
+            maximum number of files read in parallel, by default 8
+        """
+        self.root = Path(root)
+        self.max_workers = max_workers
+        self._catalog = None
+
+    @property
+    def catalog(self) -> pd.DataFrame:
+        """Catalog of the results, one row per tally of each hdf file, with
+        the benchmark, file, code, version, library, tally, x-axis and
+        number of rows, and the attributes of the file. Built on first
+        access, use rescan to update it.
+
+        Returns
+        -------
+        pd.DataFrame
+            catalog of the database
+        """
+        if self._catalog is None:
+            self.rescan()
+        return self._catalog
+
+    def rescan(self) -> pd.DataFrame:
+        """Updates the catalog. Only the hdf files that were added or
+        modified since the last scan are opened.
+
+        Returns
+        -------
+        pd.DataFrame
+            catalog of the database
+        """
+        rows = []
+        for folder in sorted(p for p in self.root.iterdir() if p.is_dir()):
+            for filename, entry in update_database_index(folder).items():
+                # the library key is the short name of the filename, the
+                # xs_library attribute can be a long descriptive name and is
+                # only kept as a column of its own
+                code, version, library = _parse_filename(filename)
+                for tally_name, tally in entry['tallies'].items():
+                    rows.append({'benchmark': folder.name, 'file': filename,
+                                 'code': code, 'version': version, 'library': library,
+                                 'tally': tally_name, 'x_axis': tally['x_axis'],
+                                 'n_rows': tally['n_rows'],
+                                 **{k: entry['attrs'].get(k, 'n/a') for k in _info_attrs}})
+
+        self._catalog = pd.DataFrame(rows, columns=_catalog_columns + _info_attrs)
+        return self._catalog
+
+    def select(self, benchmark=None, tally=None, code=None, version=None,
+               library=None) -> pd.DataFrame:
+        """Selects entries of the catalog. Each criterion can be a string or
+        a list of strings, and is ignored if None. Benchmark and tally names
+        accept shell-style wildcards, versions match by prefix (e.g. '0.14'
+        matches '0.14.0') and library names are compared once normalized
+        (e.g. 'FENDL-3.2b' matches 'fendl32b'), either to the library of
+        the filename or to the xs_library attribute. Results without version or
+        library, i.e. experimental results, are kept by these two criteria
+        so that they can be compared with the selected simulations.
+
+        Parameters
+        ----------
+        benchmark : str or Iterable, optional
+            benchmark folder names, by default None
+        tally : str or Iterable, optional
+            tally names, by default None
+        code : str or Iterable, optional
+            code names, e.g. 'openmc', 'mcnp' or 'experiment', by default None
+        version : str or Iterable, optional
+            code versions, by default None
+        library : str or Iterable, optional
+            nuclear data libraries, by default None
+
+        Returns
+        -------
+        pd.DataFrame
+            selected entries of the catalog
+        """
+        catalog = self.catalog
+        mask = pd.Series(True, index=catalog.index)
+
+        for column, patterns in (('benchmark', benchmark), ('tally', tally)):
+            patterns = _as_list(patterns)
+            if patterns is not None:
+                mask &= catalog[column].apply(
+                    lambda v: any(fnmatch.fnmatchcase(v, p) for p in patterns))
+
+        codes = _as_list(code)
+        if codes is not None:
+            mask &= catalog['code'].str.lower().isin([c.lower() for c in codes])
+
+        versions = _as_list(version)
+        if versions is not None:
+            mask &= catalog['version'].apply(lambda v: v == 'n/a' or any(
+                v == p or v.startswith(p + '.') for p in versions))
+
+        libraries = _as_list(library)
+        if libraries is not None:
+            libraries = [_normalize_library(l) for l in libraries]
+            mask &= catalog['library'].isin(libraries + ['n/a']) | \
+                catalog['xs_library'].apply(_normalize_library).isin(libraries)
+
+        return catalog[mask]
+
+    def get_dataframe(self, benchmark=None, tally=None, code=None, version=None,
+                      library=None) -> pd.DataFrame:
+        """Reads the selected results into a single stacked DataFrame, see
+        select for the selection criteria. Files are read in parallel and
+        each file is opened once.
+
+        Returns
+        -------
+        pd.DataFrame
+            results with the benchmark, code, version, library and tally
+            columns followed by the columns of the tallies
+        """
+        selection = self.select(benchmark, tally, code, version, library)
+        if selection.empty:
+            return pd.DataFrame(columns=['benchmark', 'code', 'version', 'library', 'tally'])
+
+        files = list(selection.groupby(['benchmark', 'file'], sort=False))
+
+        def read(item):
+            (benchmark, filename), entries = item
+            results = ResultsFromDatabase(str(self.root / benchmark / filename))
+            return entries, results.get_tally_dataframes(entries['tally'])
+
+        frames = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for entries, dfs in executor.map(read, files):
+                for _, entry in entries.iterrows():
+                    df = dfs[entry['tally']]
+                    for i, column in enumerate(['benchmark', 'code', 'version',
+                                                'library', 'tally']):
+                        df.insert(i, column, entry[column])
+                    frames.append(df)
+
+        return pd.concat(frames, ignore_index=True)
+
@@ -0,0 +1,261 @@
+"""Resumable, verified and concurrent file downloads"""
+import hashlib
+import os
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException
+from pathlib import Path
+from typing import Iterable
+
+
+def file_checksum(filepath: str) -> str:
+    """Computes the sha256 checksum of a file
+
+    Parameters
+    ----------
+    filepath : str
+        path to the file
+
+    Returns
+    -------
+    str
+        hexadecimal sha256 digest of the file content
+    """
+    sha = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class HTTPBackend:
+    """URL backend for plain HTTP(S) servers supporting range requests.
+    Subclasses can override resolve() to turn the URLs stored in the
+    package (e.g. sharing links) into direct download URLs.
+    """
+
+    timeout = 60
+
+    def resolve(self, url: str) -> str:
+        """Returns the direct download URL of url"""
+        return url
+
+    def open(self, url: str, start: int = 0):
+        """Opens a connection to url asking for the content from byte start.
+
+        Parameters
+        ----------
+        url : str
+            URL of the file
+        start : int, optional
+            first byte to download, by default 0
+
+        Returns
+        -------
+        http.client.HTTPResponse
+            response of the server, with status 206 if the range request
+            was honoured
+        """
+        request = urllib.request.Request(self.resolve(url))
+        if start > 0:
+            request.add_header("Range", f"bytes={start}-")
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    @staticmethod
+    def filename(response, url: str) -> str:
+        """Name of the downloaded file, from the Content-Disposition header
+        or from the URL path"""
+        disposition = response.headers.get("Content-Disposition", "")
+        match = re.search(r"filename\*=UTF-8''([^;]+)|filename=\"?([^\";]+)\"?",
+                          disposition)
+        if match:
+            return urllib.parse.unquote(match.group(1) or match.group(2))
+        return Path(urllib.parse.urlparse(url).path).name or "download"
+
+
+class GoogleDriveBackend(HTTPBackend):
+    """URL backend for Google Drive sharing links, like the ones stored in
+    lib/cad_geometries.json"""
+
+    def resolve(self, url: str) -> str:
+        if "/d/" in url:
+            file_id = url.split("/d/")[1].split("/")[0]
+        else:
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+            if "id" not in query:
+                return url
+            file_id = query["id"][0]
+        return ("https://drive.usercontent.google.com/download"
+                f"?id={file_id}&export=download&confirm=t")
+
+
+class DownloadManager:
+    """Downloads files through a URL backend. Downloads go to a .part file
+    that is resumed with HTTP range requests after a dropped connection,
+    optionally verified against a sha256 checksum, and atomically renamed
+    into place once complete. Several files can be downloaded concurrently
+    with a bounded number of workers.
+    """
+
+    chunk_size = 1 << 20
+
+    def __init__(self, backend: HTTPBackend = None, max_workers: int = 4,
+                 retries: int = 5, backoff: float = 1.):
+        """DownloadManager class constructor
+
+        Parameters
+        ----------
+        backend : HTTPBackend, optional
+            URL backend, by default GoogleDriveBackend
+        max_workers : int, optional
+            maximum number of concurrent downloads, by default 4
+        retries : int, optional
+            number of times a dropped download is resumed, by default 5
+        backoff : float, optional
+            initial wait in seconds before resuming a download, doubled at
+            every retry, by default 1.
+        """
+        self.backend = backend if backend is not None else GoogleDriveBackend()
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+
+    def fetch(self, url: str, folder: str, checksum: str = None, filename: str = None) -> Path:
+        """Downloads a file in folder, resuming a previous partial download
+        of the same URL if any.
+
+        Parameters
+        ----------
+        url : str
+            URL of the file
+        folder : str
+            destination folder
+        checksum : str, optional
+            expected sha256 checksum of the file, by default None
+        filename : str, optional
+            name of the downloaded file, by default the name reported by
+            the server
+
+        Returns
+        -------
+        Path
+            path to the downloaded file
+
+        Raises
+        ------
+        ValueError
+            if the checksum of the downloaded file does not match
+        """
+        folder = Path(folder)
+        part, reported = self._fetch_part(url, folder, checksum)
+        destination = folder / (filename or reported)
+        os.replace(part, destination)
+        return destination
+
+    def _fetch_part(self, url: str, folder: Path, checksum: str = None) -> tuple:
+        # downloads url to its .part file and returns the part file with the
+        # name reported by the server, without renaming it
+        folder.mkdir(parents=True, exist_ok=True)
+        part = folder / (hashlib.sha1(url.encode()).hexdigest() + ".part")
+
+        for attempt in range(self.retries + 1):
+            try:
+                filename = self._download(url, part)
+                break
+            except (urllib.error.URLError, HTTPException, OSError):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2**attempt)
+
+        if checksum and file_checksum(part) != checksum:
+            part.unlink()
+            raise ValueError(f"Checksum mismatch for {url}")
+
+        return part, filename
+
+    def _download(self, url: str, part: Path) -> str:
+        start = part.stat().st_size if part.exists() else 0
+        try:
+            response = self.backend.open(url, start)
+        except urllib.error.HTTPError as e:
+            # the partial file is stale, start over
+            if e.code != 416:
+                raise
+            part.unlink()
+            start = 0
+            response = self.backend.open(url, start)
+
+        with response:
+            # the server may ignore the range request
+            if response.status != 206:
+                start = 0
+            expected = response.headers.get("Content-Length")
+            received = 0
+            with open(part, "ab" if start else "wb") as f:
+                while True:
+                    chunk = response.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    received += len(chunk)
+
+            if expected is not None and received < int(expected):
+                raise ConnectionError(
+                    f"Connection dropped after {start + received} bytes")
+
+            return self.backend.filename(response, url)
+
+    def fetch_many(self, urls: Iterable, folder: str, checksums: Iterable = None,
+                   filenames: Iterable = None) -> list:
+        """Downloads several files concurrently in folder. The files are only
+        renamed into place once all of them are downloaded, and only if
+        their names are distinct, so that no download overwrites another.
+
+        Parameters
+        ----------
+        urls : Iterable
+            URLs of the files
+        folder : str
+            destination folder
+        checksums : Iterable, optional
+            expected sha256 checksums of the files, by default None
+        filenames : Iterable, optional
+            names of the downloaded files, by default the names reported by
+            the server
+
+        Returns
+        -------
+        list
+            paths to the downloaded files, in the same order as urls
+
+        Raises
+        ------
+        ValueError
+            if several URLs would be downloaded to the same file
+        """
+        folder = Path(folder)
+        urls = list(urls)
+        checksums = [None] * len(urls) if checksums is None else list(checksums)
+        filenames = [None] * len(urls) if filenames is None else list(filenames)
+        if len(set(urls)) != len(urls):
+            raise ValueError("Each URL can only be downloaded once")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            parts = list(executor.map(self._fetch_part, urls, [folder] * len(urls), checksums))
+
+        names = [given or reported for given, (_, reported) in zip(filenames, parts)]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            # the .part files are kept and can be renamed by a new call
+            raise ValueError(f"Several URLs are downloaded to {', '.join(duplicates)}, "
+                             "pass distinct filenames")
+
+        destinations = []
+        for (part, _), name in zip(parts, names):
+            os.replace(part, folder / name)
+            destinations.append(folder / name)
+        return destinations
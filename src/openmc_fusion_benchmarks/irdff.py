@@ -1,31 +1,28 @@
-""""This module contains functions to extract cross section data from IRDFF-II files"""
+"""This module contains functions to extract cross section data from IRDFF-II files"""
 
+import hashlib
+import os
+import threading
+import numpy as np
 import openmc.data
 import importlib.resources
+from pathlib import Path
+
+from .cache import get_cache_dir
 
 IRDFF_PATH = importlib.resources.files(
     "openmc_fusion_benchmarks.data.irdff2_xs")
 
+# parsed tables kept for the lifetime of the process, keyed by source file
+_tables = {}
+_tables_lock = threading.Lock()
 
-def get_cross_section(filename: str):
-    """Generates cross section data from IRDFF-II files
+
+def _parse_ace(filepath) -> dict:
+    """Parses the cross sections of an IRDFF-II ACE file into arrays
     from this discussion and related notebook:
     https://openmc.discourse.group/t/using-irdff-ii-cross-section-data-in-openmc/1950
-
-    Parameters
-    ----------
-    irdff_file_path : str
-        takes in a string with the path and the name of the .acef file
-        specific for the nuclide in IRDFF-II nuclear data library
-
-    Returns
-    -------
-    openmc.data.Tabulated1D
-        IRDFF-II tabulated cross section data for a given nuclide
-        and reaction
     """
-
-    filepath = IRDFF_PATH / filename
     ace_table = openmc.data.ace.get_table(filepath)
     nxs = ace_table.nxs
     jxs = ace_table.jxs
@@ -38,18 +35,14 @@ def get_cross_section(filename: str):
     mts = xss[lmt: lmt + nmt].astype(int)
     locators = xss[lxs: lxs + nmt].astype(int)
 
-    # Create dictionary mapping MT to Tabulated1D object
-    cross_sections = {}
+    # Create dictionary mapping MT to (energy, xs, breakpoints, interpolation)
+    tables = {}
     for mt, loca in zip(mts, locators):
         # Determine starting index on energy grid
         nr = int(xss[jxs[7] + loca - 1])
-        if nr == 0:
-            breakpoints = None
-            interpolation = None
-        else:
-            breakpoints = xss[jxs[7] + loca: jxs[7] + loca + nr].astype(int)
-            interpolation = xss[jxs[7] + loca +
-                                nr: jxs[7] + loca + 2 * nr].astype(int)
+        breakpoints = xss[jxs[7] + loca: jxs[7] + loca + nr].astype(int)
+        interpolation = xss[jxs[7] + loca +
+                            nr: jxs[7] + loca + 2 * nr].astype(int)
 
         # Determine number of energies in reaction
         ne = int(xss[jxs[7] + loca + 2 * nr])
@@ -59,8 +52,139 @@ def get_cross_section(filename: str):
         energy = xss[start: start + ne] * 1e6
         xs = xss[start + ne: start + 2 * ne]
 
+        tables[int(mt)] = (energy, xs, breakpoints, interpolation)
+
+    return tables
+
+
+def _file_hash(filepath: Path) -> str:
+    with open(filepath, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_compiled(compiled: Path, filepath: Path, stat: os.stat_result):
+    # returns None if the compiled file is missing or out of date
+    if not compiled.exists():
+        return None
+    with np.load(compiled) as data:
+        stamp = (int(data["mtime_ns"]), int(data["size"]))
+        if stamp != (stat.st_mtime_ns, stat.st_size) and \
+                str(data["sha256"]) != _file_hash(filepath):
+            return None
+        return {int(mt): tuple(data[f"{mt}_{k}"] for k in
+                               ("energy", "xs", "breakpoints", "interpolation"))
+                for mt in data["mts"]}
+
+
+def _write_compiled(compiled: Path, filepath: Path, stat: os.stat_result, tables: dict):
+    arrays = {f"{mt}_{k}": v for mt, table in tables.items() for k, v in
+              zip(("energy", "xs", "breakpoints", "interpolation"), table)}
+    # atomic replace so that concurrent runs never read a partial file
+    tmp = compiled.with_name(f"{compiled.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, mts=np.array(list(tables), dtype=int), mtime_ns=stat.st_mtime_ns,
+                 size=stat.st_size, sha256=_file_hash(filepath), **arrays)
+    os.replace(tmp, compiled)
+
+
+def _load_tables(filename: str) -> dict:
+    """Returns the cross section arrays of an IRDFF-II file. The ACE file is
+    parsed once and compiled to a .npz file in the irdff cache folder, which
+    is used instead of the ACE file as long as the source file is unchanged
+    (same mtime and size, or same sha256). Tables are also memoized for the
+    lifetime of the process.
+    """
+    filepath = Path(str(IRDFF_PATH / filename))
+    stat = filepath.stat()
+    key = (str(filepath), stat.st_mtime_ns, stat.st_size)
+
+    with _tables_lock:
+        if key in _tables:
+            return _tables[key]
+
+        compiled = get_cache_dir("irdff") / f"{filepath.name}.npz"
+        tables = _read_compiled(compiled, filepath, stat)
+        if tables is None:
+            tables = _parse_ace(filepath)
+            _write_compiled(compiled, filepath, stat, tables)
+
+        _tables[key] = tables
+        return tables
+
+
+def get_cross_section(filename: str):
+    """Generates cross section data from IRDFF-II files
+    from this discussion and related notebook:
+    https://openmc.discourse.group/t/using-irdff-ii-cross-section-data-in-openmc/1950
+    The ACE file is only parsed the first time, following calls use
+    memoized data or the compiled copy in the irdff cache folder.
+
+    Parameters
+    ----------
+    irdff_file_path : str
+        takes in a string with the path and the name of the .acef file
+        specific for the nuclide in IRDFF-II nuclear data library
+
+    Returns
+    -------
+    dict
+        IRDFF-II tabulated cross section data (openmc.data.Tabulated1D) for
+        a given nuclide, keyed by reaction MT. New objects are returned at
+        every call so they can be modified safely
+    """
+    cross_sections = {}
+    for mt, (energy, xs, breakpoints, interpolation) in _load_tables(filename).items():
+        if len(breakpoints) == 0:
+            breakpoints = None
+            interpolation = None
+        else:
+            breakpoints = breakpoints.copy()
+            interpolation = interpolation.copy()
         cross_sections[mt] = openmc.data.Tabulated1D(
-            energy, xs, breakpoints, interpolation
+            energy.copy(), xs.copy(), breakpoints, interpolation
         )
 
     return cross_sections
+
+
+# EnergyFunctionFilters shared by all the tallies of the process
+_filters = {}
+
+
+def get_energy_function_filter(filename: str, mt: int):
+    """Returns the openmc.EnergyFunctionFilter multiplying the flux by an
+    IRDFF-II cross section. Filters are built once per (filename, mt) pair
+    and the same object is returned at every following call, so that all
+    the tallies scoring the same reaction share one filter in the model
+    and in the exported tallies.xml.
+
+    Parameters
+    ----------
+    filename : str
+        name of the .acef file specific for the nuclide in IRDFF-II
+        nuclear data library
+    mt : int
+        MT number of the reaction
+
+    Returns
+    -------
+    openmc.EnergyFunctionFilter
+        filter with the tabulated cross section of the reaction
+    """
+    key = (filename, int(mt))
+    with _tables_lock:
+        if key in _filters:
+            return _filters[key]
+
+    energy_filter = openmc.EnergyFunctionFilter.from_tabulated1d(
+        get_cross_section(filename)[int(mt)])
+    with _tables_lock:
+        return _filters.setdefault(key, energy_filter)
+
+
+def clear_energy_function_filters():
+    """Empties the registry of get_energy_function_filter(), e.g. to build
+    a model with new filter ids
+    """
+    with _tables_lock:
+        _filters.clear()
@@ -1 +1,2 @@
-from .fng_source.fng_source import fng_source
+from .fng_source.fng_source import fng_source, fng_sources, \
+    sample_fng_source, load_characteristics, load_characteristics_many
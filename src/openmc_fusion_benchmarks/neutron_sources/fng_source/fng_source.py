@@ -2,10 +2,288 @@
 # building the FNG neutron source
 # angular and energy distribution
 
+import os
 import numpy as np
 import openmc
+from functools import lru_cache
 from pathlib import Path
 
+from openmc_fusion_benchmarks.cache import get_cache_dir
+
+
+# beam energies (keV) of the tabulated characteristics
+TABULATED_BEAM_ENERGIES = (230, 260, 350)
+
+# number of quantiles used to interpolate between tabulated energies
+_n_quantiles = 8001
+
+
+def _csv_path(beam_energy):
+    fname = 'fng_' + str(int(beam_energy)) + 'keV_characteristics.csv'
+    return str(Path(__file__).parent) / Path(fname)
+
+
+@lru_cache(maxsize=None)
+def _read_csv(beam_energy):
+    fng_source_fr = np.loadtxt(_csv_path(beam_energy), delimiter=",")
+
+    # energy and flux values from tables
+    evalues = (fng_source_fr[0] + fng_source_fr[0]) / 2
+    fvalues = fng_source_fr[2:]
+
+    return _read_only(evalues, fvalues)
+
+
+def _read_only(*arrays):
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+def _batched_interp(x, xp, fp):
+    # np.interp applied row by row to 2D arrays with monotonic xp rows,
+    # rows are shifted apart so that a single searchsorted covers them all
+    lo = min(x.min(), xp.min())
+    span = max(x.max(), xp.max()) - lo + 1
+    offset = np.arange(len(xp))[:, None] * 2 * span
+    flat_xp = (xp - lo + offset).ravel()
+    idx = np.searchsorted(flat_xp, (x - lo + offset).ravel(), side='right')
+    idx = idx.reshape(x.shape) - np.arange(len(xp))[:, None] * xp.shape[1]
+    idx = np.clip(idx, 1, xp.shape[1] - 1)
+    rows = np.arange(len(xp))[:, None]
+    x0, x1 = xp[rows, idx - 1], xp[rows, idx]
+    f0, f1 = fp[rows, idx - 1], fp[rows, idx]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.clip(np.where(x1 > x0, (x - x0) / (x1 - x0), 1), 0, 1)
+    return f0 + t * (f1 - f0)
+
+
+def _interpolate(evalues, f_low, f_high, weights):
+    # interpolates the spectra of each angular bin between two tabulated
+    # beam energies. The quantile functions are interpolated (displacement
+    # interpolation), so that the peaks move with the beam energy instead
+    # of being split in two, and the intensity of each bin is interpolated
+    # linearly
+    weights = np.asarray(weights, dtype=float)[:, None, None]
+    n_bins, n_e = f_low.shape
+    grid = np.tile(evalues, (n_bins, 1))
+    q = np.tile(np.linspace(0, 1, _n_quantiles), (n_bins, 1))
+
+    def quantiles(f):
+        # energies and normalized pdf at the quantiles q
+        c = np.concatenate([np.zeros((n_bins, 1)), np.cumsum(
+            np.diff(evalues) * (f[:, :-1] + f[:, 1:]) / 2, axis=-1)], axis=-1)
+        total = c[:, -1:]
+        c = c / total
+        # clip to the support, zero density tails are flat in the cdf
+        low = evalues[np.maximum((c == 0).sum(axis=-1) - 1, 0)]
+        high = evalues[np.argmax(c >= 1, axis=-1)]
+        energy = np.clip(_batched_interp(q, c, grid), low[:, None], high[:, None])
+        return energy, _batched_interp(energy, grid, f / total)
+
+    e_low, pdf_low = quantiles(f_low)
+    e_high, pdf_high = quantiles(f_high)
+
+    # along the transport map the inverse densities mix linearly
+    e_mix = (1 - weights) * e_low + weights * e_high
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inverse = np.where(weights < 1, (1 - weights) / pdf_low, 0) + \
+            np.where(weights > 0, weights / pdf_high, 0)
+        pdf_mix = 1 / inverse
+
+    f_mix = _batched_interp(np.tile(evalues, (len(weights) * n_bins, 1)),
+                            e_mix.reshape(-1, _n_quantiles),
+                            pdf_mix.reshape(-1, _n_quantiles))
+    # no density outside the support of the interpolated spectrum
+    outside = (evalues < e_mix.reshape(-1, _n_quantiles)[:, :1]) | \
+        (evalues > e_mix.reshape(-1, _n_quantiles)[:, -1:])
+    f_mix[outside] = 0
+    f_mix = f_mix.reshape(len(weights), n_bins, n_e)
+
+    total = (1 - weights[:, :, 0]) * f_low.sum(axis=-1) + \
+        weights[:, :, 0] * f_high.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.where(f_mix.sum(axis=-1) > 0, total / f_mix.sum(axis=-1), 0)
+    return f_mix * scale[:, :, None]
+
+
+def _stamp(low, high):
+    # changes whenever one of the tabulated csv files changes
+    stats = [os.stat(_csv_path(e)) for e in (low, high)]
+    return repr([(st.st_size, st.st_mtime_ns) for st in stats] + [_n_quantiles])
+
+
+def _bracket(beam_energy):
+    tabulated = TABULATED_BEAM_ENERGIES
+    if not tabulated[0] <= beam_energy <= tabulated[-1]:
+        raise ValueError(f'Beam energy {beam_energy} keV is outside the tabulated '
+                         f'range [{tabulated[0]}, {tabulated[-1]}] keV')
+    i = min(np.searchsorted(tabulated, beam_energy, side='right'), len(tabulated) - 1)
+    low, high = tabulated[i - 1], tabulated[i]
+    return low, high, (beam_energy - low) / (high - low)
+
+
+def load_characteristics_many(beam_energies, cache_dir=None):
+    '''returns the FNG source characteristics for many beam energies at
+    once. Energies between the tabulated ones are interpolated in a single
+    vectorized pass and memoized in the fng_source cache folder, so that
+    repeated sweeps read them back instead of recomputing them
+
+    Parameters
+    ----------
+    beam_energies : energies in (keV) of the accelerator D beam, between
+    230 and 350 keV
+
+    cache_dir : folder of the interpolated tables, by default the
+    fng_source subfolder of the package cache folder
+
+    Returns
+    -------
+    evalues : neutron energy grid (eV)
+    pbins : cosines of the edges of the 36 polar angle bins
+    fvalues : flux values, of shape (n beam energies, 36, n energies)
+    '''
+    cache_dir = Path(cache_dir) if cache_dir is not None \
+        else get_cache_dir('fng_source')
+    beam_energies = [float(e) for e in beam_energies]
+    evalues = _read_csv(TABULATED_BEAM_ENERGIES[0])[0]
+    fvalues = np.empty((len(beam_energies), 36, len(evalues)))
+
+    missing = {}
+    for n, beam_energy in enumerate(beam_energies):
+        low, high, weight = _bracket(beam_energy)
+        if beam_energy in TABULATED_BEAM_ENERGIES:
+            fvalues[n] = _read_csv(beam_energy)[1]
+            continue
+        path = cache_dir / f'fng_{beam_energy:.6g}keV_characteristics.npz'
+        if path.exists():
+            with np.load(path) as data:
+                if str(data['stamp']) == _stamp(low, high):
+                    fvalues[n] = data['fvalues']
+                    continue
+        missing.setdefault((low, high), []).append((n, weight, path))
+
+    # one vectorized interpolation per pair of tabulated energies
+    for (low, high), todo in missing.items():
+        rows, weights, paths = zip(*todo)
+        interpolated = _interpolate(evalues, _read_csv(low)[1], _read_csv(high)[1], weights)
+        for n, f, path in zip(rows, interpolated, paths):
+            fvalues[n] = f
+            # atomic replace so that concurrent sweeps never read a partial file
+            tmp = path.with_name(f'{path.stem}.{os.getpid()}.tmp')
+            with open(tmp, 'wb') as out:
+                np.savez(out, fvalues=f, stamp=_stamp(low, high))
+            os.replace(tmp, path)
+
+    # angular bins in [0, pi)
+    pbins = np.cos(np.linspace(0, np.pi, 37))
+
+    return evalues, pbins, fvalues
+
+
+@lru_cache(maxsize=None)
+def _load_characteristics(beam_energy):
+    evalues, pbins, fvalues = load_characteristics_many([beam_energy])
+    return _read_only(evalues, pbins, fvalues[0])
+
+
+def load_characteristics(beam_energy=260):
+    '''reads the FNG source characteristics for a given beam energy. The
+    csv files are read once per process. Energies between the tabulated
+    ones (230, 260 and 350 keV) are interpolated and cached on disk, see
+    load_characteristics_many(). The returned arrays are read-only and
+    shared by all the callers
+
+    Parameters
+    ----------
+    beam_energy : energy in (keV) of the accelerator D beam impinging on the
+    Ti-T target, between 230 and 350 keV
+
+    Returns
+    -------
+    evalues : neutron energy grid (eV)
+    pbins : cosines of the edges of the 36 polar angle bins
+    fvalues : flux values, one row per angular bin
+    '''
+    return _load_characteristics(float(beam_energy))
+
+
+def _yields(pbins, fvalues):
+    # yield values for strengths
+    yields = np.sum(fvalues, axis=-1) * np.diff(pbins)
+    return yields / np.sum(yields)
+
+
+def _sample_linear(x, p, xi):
+    # inverse cdf sampling of the linear-linear tabular pdf p(x)
+    cdf = np.concatenate([[0], np.cumsum(np.diff(x) * (p[:-1] + p[1:]) / 2)])
+    r = xi * cdf[-1]
+    k = np.clip(np.searchsorted(cdf, r, side='right') - 1, 0, len(x) - 2)
+    r -= cdf[k]
+    slope = (p[k + 1] - p[k]) / (x[k + 1] - x[k])
+    # stable root of p[k] * t + slope * t**2 / 2 = r
+    root = np.sqrt(np.maximum(p[k]**2 + 2 * slope * r, 0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(p[k] + root > 0, 2 * r / (p[k] + root), 0)
+    return x[k] + t
+
+
+def _rotate(mu, phi, reference_uvw):
+    # directions at polar cosine mu and azimuth phi around reference_uvw
+    w = np.asarray(reference_uvw, dtype=float)
+    w = w / np.linalg.norm(w)
+    a = np.array([1., 0, 0]) if abs(w[0]) < 0.9 else np.array([0, 1., 0])
+    v1 = np.cross(w, a)
+    v1 /= np.linalg.norm(v1)
+    v2 = np.cross(w, v1)
+    sin = np.sqrt(1 - mu**2)
+    return mu[:, None] * w + sin[:, None] * (np.cos(phi)[:, None] * v1 +
+                                             np.sin(phi)[:, None] * v2)
+
+
+def sample_fng_source(n_particles, center=(0, 0, 0), reference_uvw=(0, 0, 1),
+                      beam_energy=260, seed=None):
+    '''samples neutrons from the Frascati Neutron Generator source with
+    vectorized numpy operations. The samples follow the same distributions
+    as the sources returned by fng_source()
+
+    Parameters
+    ----------
+    n_particles : number of neutrons to sample
+
+    center : coordinate position of the source (it is a point source)
+
+    reference_uvw : direction for the polar angle (tuple or list of versors)
+
+    beam_energy : energy in (keV) of the accelerator D beam impinging on the
+    Ti-T target
+
+    seed : seed of the numpy random generator
+
+    Returns
+    -------
+    dict with 'r' (n, 3) positions, 'u' (n, 3) directions, 'E' (n,)
+    energies in eV and 'bin' (n,) indices of the polar angle bins
+    '''
+    rng = np.random.default_rng(seed)
+    evalues, pbins, fvalues = load_characteristics(beam_energy)
+
+    bins = rng.choice(len(fvalues), size=n_particles, p=_yields(pbins, fvalues))
+    mu = rng.uniform(pbins[bins + 1], pbins[bins])
+    phi = rng.uniform(0, 2 * np.pi, n_particles)
+
+    energy = np.empty(n_particles)
+    xi = rng.random(n_particles)
+    for i in np.unique(bins):
+        mask = bins == i
+        energy[mask] = _sample_linear(evalues, fvalues[i], xi[mask])
+
+    return {'r': np.tile(np.asarray(center, dtype=float), (n_particles, 1)),
+            'u': _rotate(mu, phi, reference_uvw),
+            'E': energy,
+            'bin': bins}
+
+
 def fng_source(center=(0, 0, 0), reference_uvw=(0, 0, 1), beam_energy=260):
     '''method for building the Frascati Neutron Generator source in OpenMC
     with data tabulated from the fortran->C++ routine
@@ -20,24 +298,39 @@ def fng_source(center=(0, 0, 0), reference_uvw=(0, 0, 1), beam_energy=260):
     towards the Ti-T target
 
     beam_energy : energy in (keV) of the accelerator D beam impinging on the 
-    Ti-T target
+    Ti-T target. Tabulated for 230, 260 and 350 keV and interpolated in
+    between
     '''
 
-    # read tabulated data
-    fname = 'fng_' + str(int(beam_energy)) + 'keV_characteristics.csv'
-    filename = str(Path(__file__).parent) / Path(fname)
-    fng_source_fr = np.loadtxt(filename, delimiter=",")
+    evalues, pbins, fvalues = load_characteristics(beam_energy)
+    return _sources(evalues, pbins, fvalues, center, reference_uvw)
 
-    # angular bins in [0, pi)
-    pbins = np.cos(np.linspace(0, np.pi, 37))
 
-    # energy and flux values from tables
-    evalues = (fng_source_fr[0] + fng_source_fr[0]) / 2
-    fvalues = fng_source_fr[2:]
+def fng_sources(beam_energies, center=(0, 0, 0), reference_uvw=(0, 0, 1)):
+    '''builds the Frascati Neutron Generator source for many beam energies,
+    e.g. for sensitivity studies, interpolating all the characteristics in
+    one vectorized call (see load_characteristics_many())
 
-    # yield values for strengths
-    yields = np.sum(fvalues, axis=-1) * np.diff(pbins)
-    yields /= np.sum(yields)
+    Parameters
+    ----------
+    beam_energies : energies in (keV) of the accelerator D beam, between
+    230 and 350 keV
+
+    center : coordinate position of the source (it is a point source)
+
+    reference_uvw : direction for the polar angle (tuple or list of versors)
+
+    Returns
+    -------
+    list with the list of sources of each beam energy, as returned by
+    fng_source()
+    '''
+    evalues, pbins, fvalues = load_characteristics_many(beam_energies)
+    return [_sources(evalues, pbins, f, center, reference_uvw) for f in fvalues]
+
+
+def _sources(evalues, pbins, fvalues, center, reference_uvw):
+    yields = _yields(pbins, fvalues)
 
     # azimuthal values
     phi = openmc.stats.Uniform(a=0, b=2*np.pi)
@@ -50,8 +343,9 @@ def fng_source(center=(0, 0, 0), reference_uvw=(0, 0, 1), beam_energy=260):
         space = openmc.stats.Point(center)
         angle = openmc.stats.PolarAzimuthal(
             mu=mu, phi=phi, reference_uvw=reference_uvw)
+        # copies, the cached tables are shared and read-only
         energy = openmc.stats.Tabular(
-            evalues, fvalues[i], interpolation='linear-linear')
+            evalues.copy(), fvalues[i].copy(), interpolation='linear-linear')
         strength = yields[i]
 
         my_source = openmc.IndependentSource(
@@ -0,0 +1,367 @@
+# %%
+# timing and validation of the FNG neutron source representations
+# against the tabulated characteristics
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+import h5py
+import numpy as np
+import openmc
+import pandas as pd
+from pathlib import Path
+from scipy import stats
+
+from openmc_fusion_benchmarks.cache import get_cache_dir
+from .fng_source import fng_source, load_characteristics, sample_fng_source, _yields
+
+
+def _reference_cosines(u, reference_uvw):
+    w = np.asarray(reference_uvw, dtype=float)
+    return np.asarray(u) @ (w / np.linalg.norm(w))
+
+
+def sample_sources(sources, n_particles, seed=None):
+    '''samples neutrons from the list of openmc.IndependentSource returned by
+    fng_source() through the python distribution objects of openmc.stats,
+    one vectorized call per source
+
+    Parameters
+    ----------
+    sources : list of openmc.IndependentSource with PolarAzimuthal angle
+
+    n_particles : number of neutrons to sample
+
+    seed : seed of the random generators
+
+    Returns
+    -------
+    dict with 'mu' (n,) polar cosines with respect to the reference
+    direction and 'E' (n,) energies in eV
+    '''
+    rng = np.random.default_rng(seed)
+    strengths = np.array([s.strength for s in sources])
+    counts = rng.multinomial(n_particles, strengths / strengths.sum())
+
+    mu, energy = [], []
+    for source, n in zip(sources, counts):
+        if n == 0:
+            continue
+        mu.append(source.angle.mu.sample(n, seed=int(rng.integers(2**31))))
+        energy.append(source.energy.sample(n, seed=int(rng.integers(2**31))))
+
+    return {'mu': np.concatenate(mu), 'E': np.concatenate(energy)}
+
+
+def _write_source_file(samples, path):
+    # same layout as openmc.write_source_file(), filled from the sampled
+    # arrays instead of one openmc.SourceParticle per neutron
+    position = np.dtype([('x', '<f8'), ('y', '<f8'), ('z', '<f8')])
+    dtype = np.dtype([('r', position), ('u', position), ('E', '<f8'),
+                      ('time', '<f8'), ('wgt', '<f8'), ('delayed_group', '<i4'),
+                      ('surf_id', '<i4'), ('particle', '<i4')])
+    bank = np.zeros(len(samples['E']), dtype=dtype)
+    for i, c in enumerate('xyz'):
+        bank['r'][c] = samples['r'][:, i]
+        bank['u'][c] = samples['u'][:, i]
+    bank['E'] = samples['E']
+    # time, weight, delayed group, surface and particle type of a neutron
+    defaults = openmc.SourceParticle().to_tuple()[3:]
+    for name, value in zip(dtype.names[3:], defaults):
+        bank[name] = value
+
+    with h5py.File(path, 'w') as f:
+        f.attrs['filetype'] = np.bytes_('source')
+        f.create_dataset('source_bank', data=bank, dtype=dtype)
+
+
+def fng_file_source(n_particles=int(1e6), center=(0, 0, 0), reference_uvw=(0, 0, 1),
+                    beam_energy=260, seed=1, cache_dir=None):
+    '''openmc.FileSource replaying a finite pool of neutrons pre-sampled
+    from the FNG characteristics, only meant for validating and timing the
+    source representations. It is not a replacement of fng_source(): openmc
+    replays the pool cyclically, so any run with more histories than
+    n_particles reuses the same source neutrons, correlating the histories
+    and underestimating the variance of the tallies. It does not make the
+    per-particle sampling of the simulations any cheaper either, the
+    benchmark models keep using fng_source(). The source file is written
+    once in the fng_source cache folder and reused for the same parameters
+
+    Parameters
+    ----------
+    n_particles : number of pre-sampled neutrons in the source file, it
+    should not be smaller than the number of simulated histories
+
+    center : coordinate position of the source (it is a point source)
+
+    reference_uvw : direction for the polar angle (tuple or list of versors)
+
+    beam_energy : energy in (keV) of the accelerator D beam impinging on the
+    Ti-T target
+
+    seed : seed of the numpy random generator
+
+    cache_dir : folder of the source files, by default the fng_source
+    subfolder of the package cache folder
+
+    Returns
+    -------
+    openmc.FileSource
+    '''
+    cache_dir = Path(cache_dir) if cache_dir is not None \
+        else get_cache_dir('fng_source')
+    key = repr((int(n_particles), tuple(map(float, center)),
+                tuple(map(float, reference_uvw)), float(beam_energy), seed))
+    path = cache_dir / \
+        f'fng_{hashlib.sha1(key.encode()).hexdigest()[:16]}.h5'
+
+    if not path.exists():
+        samples = sample_fng_source(n_particles, center, reference_uvw,
+                                    beam_energy, seed)
+        # atomic replace so that concurrent runs never read a partial file
+        tmp = path.with_name(f'{path.stem}.{os.getpid()}.h5')
+        _write_source_file(samples, tmp)
+        os.replace(tmp, path)
+
+    return openmc.FileSource(path=str(path))
+
+
+def read_file_source(path, reference_uvw=(0, 0, 1)):
+    '''reads the neutrons of an openmc source file, e.g. the one written by
+    fng_file_source()
+
+    Parameters
+    ----------
+    path : path to the source file
+
+    reference_uvw : direction for the polar angle (tuple or list of versors)
+
+    Returns
+    -------
+    dict with 'mu' (n,) polar cosines with respect to the reference
+    direction and 'E' (n,) energies in eV
+    '''
+    with h5py.File(path, 'r') as f:
+        bank = f['source_bank'][()]
+    u = np.stack([bank['u'][c] for c in ('x', 'y', 'z')], axis=-1)
+
+    return {'mu': _reference_cosines(u, reference_uvw), 'E': bank['E']}
+
+
+def draw_file_source(bank, n_particles, seed=None):
+    '''draws neutrons from the bank of a source file the way
+    openmc.FileSource does, i.e. picking a uniformly random source site for
+    each history, so that the pool is reused when n_particles is larger than
+    the bank
+
+    Parameters
+    ----------
+    bank : dict returned by read_file_source()
+
+    n_particles : number of neutrons to draw
+
+    seed : seed of the numpy random generator
+
+    Returns
+    -------
+    dict with 'mu' (n,) polar cosines, 'E' (n,) energies in eV and 'site'
+    (n,) indices of the drawn source sites
+    '''
+    rng = np.random.default_rng(seed)
+    site = rng.integers(len(bank['E']), size=n_particles)
+
+    return {'mu': bank['mu'][site], 'E': bank['E'][site], 'site': site}
+
+
+def _tabular_cdf(x, p, e):
+    # cdf of the linear-linear tabular pdf p(x) at the values e
+    cdf = np.concatenate([[0], np.cumsum(np.diff(x) * (p[:-1] + p[1:]) / 2)])
+    k = np.clip(np.searchsorted(x, e, side='right') - 1, 0, len(x) - 2)
+    t = np.clip(e, x[0], x[-1]) - x[k]
+    slope = (p[k + 1] - p[k]) / (x[k + 1] - x[k])
+    return (cdf[k] + p[k] * t + slope * t**2 / 2) / cdf[-1]
+
+
+def _chisquare(test, observed, expected, min_expected=5):
+    # bins with few expected counts are merged into one
+    expected = expected * observed.sum() / expected.sum()
+    small = expected < min_expected
+    if small.any():
+        observed = np.append(observed[~small], observed[small].sum())
+        expected = np.append(expected[~small], expected[small].sum())
+        # nothing expected nor observed outside the support
+        if expected[-1] == 0 and observed[-1] == 0:
+            observed, expected = observed[:-1], expected[:-1]
+    chi2, p_value = stats.chisquare(observed, expected)
+    return {'test': test, 'chi2': chi2, 'dof': len(observed) - 1,
+            'p-value': p_value}
+
+
+def compare_to_tables(samples, beam_energy=260, n_energy_groups=40):
+    '''compares sampled neutrons to the tabulated FNG characteristics with
+    chi-square goodness of fit tests on the polar angle histogram, on the
+    energy histogram and on the joint angle-energy histogram
+
+    Parameters
+    ----------
+    samples : dict with 'mu' polar cosines and 'E' energies (eV) of the
+    sampled neutrons, as returned by sample_sources() or read_file_source()
+
+    beam_energy : energy in (keV) of the accelerator D beam impinging on the
+    Ti-T target
+
+    n_energy_groups : number of energy groups of the histograms
+
+    Returns
+    -------
+    pandas.DataFrame with the chi-square statistic, the degrees of freedom
+    and the p-value of each test
+    '''
+    evalues, pbins, fvalues = load_characteristics(beam_energy)
+    mu_edges = pbins[::-1]
+    e_edges = np.linspace(evalues[0], evalues[-1], n_energy_groups + 1)
+
+    # expected probability of each (angular bin, energy group) cell
+    group_probs = np.diff([_tabular_cdf(evalues, f, e_edges) for f in fvalues], axis=-1)
+    expected = _yields(pbins, fvalues)[:, None] * group_probs
+
+    # angular bins are stored from mu = 1 down to mu = -1
+    observed, _, _ = np.histogram2d(samples['mu'], samples['E'],
+                                    bins=[mu_edges, e_edges])
+    observed = observed[::-1]
+
+    return pd.DataFrame([
+        _chisquare('angle', observed.sum(axis=1), expected.sum(axis=1)),
+        _chisquare('energy', observed.sum(axis=0), expected.sum(axis=0)),
+        _chisquare('angle-energy', observed.ravel(), expected.ravel())])
+
+
+def _timeit(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def time_sources(beam_energy=260, n_particles=int(1e5), repeat=3, pool_fraction=0.1):
+    '''times the construction, the settings.xml export and the sampling of
+    the FNG source representations. The file source is built with a pool of
+    pool_fraction * n_particles neutrons, its 'read [s]' column is the I/O
+    of the source file and its 'sample [s]' column the draw of n_particles
+    neutrons from the bank, see draw_file_source(). The 'distinct neutrons'
+    column counts the different source neutrons among the samples and shows
+    the reuse of the pool
+
+    Parameters
+    ----------
+    beam_energy : energy in (keV) of the accelerator D beam impinging on the
+    Ti-T target
+
+    n_particles : number of neutrons sampled
+
+    repeat : number of repetitions, the best time is reported
+
+    pool_fraction : size of the file source, relative to n_particles
+
+    Returns
+    -------
+    pandas.DataFrame with the best times in seconds
+    '''
+    pool_size = max(1, int(pool_fraction * n_particles))
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        def export(source):
+            openmc.Settings(source=source).export_to_xml(Path(tmp) / 'settings.xml')
+
+        sources = fng_source(beam_energy=beam_energy)
+        file_source = fng_file_source(pool_size, beam_energy=beam_energy,
+                                      cache_dir=tmp)
+        bank = read_file_source(file_source.path)
+        rows.append({
+            'representation': 'IndependentSource x36',
+            'build [s]': _timeit(lambda: fng_source(beam_energy=beam_energy), repeat),
+            'export [s]': _timeit(lambda: export(sources), repeat),
+            'read [s]': np.nan,
+            'sample [s]': _timeit(lambda: sample_sources(sources, n_particles), repeat),
+            'distinct neutrons': n_particles})
+        rows.append({
+            'representation': 'FileSource',
+            # the source file is cached after the first build
+            'build [s]': _timeit(lambda: fng_file_source(
+                pool_size, beam_energy=beam_energy, cache_dir=tmp), repeat),
+            'export [s]': _timeit(lambda: export(file_source), repeat),
+            'read [s]': _timeit(lambda: read_file_source(file_source.path), repeat),
+            'sample [s]': _timeit(lambda: draw_file_source(bank, n_particles), repeat),
+            'distinct neutrons': len(np.unique(draw_file_source(bank, n_particles)['site']))})
+        rows.append({
+            'representation': 'numpy sampler',
+            'build [s]': 0.,
+            'export [s]': np.nan,
+            'read [s]': np.nan,
+            'sample [s]': _timeit(lambda: sample_fng_source(
+                n_particles, beam_energy=beam_energy), repeat),
+            'distinct neutrons': n_particles})
+
+    return pd.DataFrame(rows)
+
+
+def validate_sources(beam_energy=260, n_particles=int(1e6), seed=1):
+    '''samples the FNG source representations and compares them to the
+    tabulated characteristics, see compare_to_tables()
+
+    Parameters
+    ----------
+    beam_energy : energy in (keV) of the accelerator D beam impinging on the
+    Ti-T target
+
+    n_particles : number of neutrons sampled from each representation
+
+    seed : seed of the random generators
+
+    Returns
+    -------
+    pandas.DataFrame with the chi-square tests of each representation
+    '''
+    # the file source is written by the numpy sampler, independent seeds
+    # keep its samples from duplicating the ones of the numpy sampler
+    file_seed, numpy_seed = np.random.SeedSequence(seed).generate_state(2)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        file_source = fng_file_source(n_particles, beam_energy=beam_energy,
+                                      seed=int(file_seed), cache_dir=tmp)
+        numpy_samples = sample_fng_source(n_particles, beam_energy=beam_energy,
+                                          seed=int(numpy_seed))
+        samples = {
+            'IndependentSource x36': sample_sources(
+                fng_source(beam_energy=beam_energy), n_particles, seed),
+            'FileSource': read_file_source(file_source.path),
+            'numpy sampler': {'mu': numpy_samples['u'][:, 2],
+                              'E': numpy_samples['E']}}
+
+        for name, sample in samples.items():
+            df = compare_to_tables(sample, beam_energy)
+            df.insert(0, 'representation', name)
+            results.append(df)
+
+    return pd.concat(results, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Times and validates the FNG source representations')
+    parser.add_argument('-e', '--beam_energy', type=float, default=260)
+    parser.add_argument('-n', '--particles', type=int, default=int(1e6))
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(time_sources(args.beam_energy, args.particles, args.repeat).to_string(index=False))
+    print()
+    print(validate_sources(args.beam_energy, args.particles).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
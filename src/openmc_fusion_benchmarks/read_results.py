@@ -1,16 +1,122 @@
 import h5py
-import openmc
+import json
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterable
+import numpy as np
 import pandas as pd
+from .statepoint import LazyStatePoint, _fom_summary_columns
 
 _del_columns = ['cell', 'particle', 'nuclide', 'score', 'energyfunction']
 
+# file attributes describing the results, stored in the database index
+_info_attrs = ['when', 'where', 'code_version', 'xs_library', 'batches',
+               'particles_per_batch', 'literature_info']
+
+# name of the consolidated index file of a results_database folder
+_index_name = 'index.json'
+
+# name of the figure of merit history file of a results_database folder
+_fom_history_name = 'fom_history.csv'
+_fom_columns = ['when', 'where', 'code_version', 'xs_library', 'batches',
+                'particles_per_batch', 'simulation_time', *_fom_summary_columns]
+
+
+class _FilePool:
+    """LRU pool of read-only h5py file handles shared by the
+    ResultsFromDatabase objects used in managed mode. Handles that are
+    not in use by any object stay open until they are evicted, so that
+    reopening the same file is free.
+
+    A handle is closed before its file is written. The objects still using
+    it keep their reference count and reopen the file through get on their
+    next read.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._handles = OrderedDict()
+        self._refcounts = {}
+
+    def acquire(self, filepath) -> h5py.File:
+        key = str(Path(filepath).resolve())
+        handle = self._open(key)
+        self._refcounts[key] = self._refcounts.get(key, 0) + 1
+        self._evict()
+        return handle
+
+    def get(self, filepath) -> h5py.File:
+        # handle of a file already acquired, reopened if it was discarded
+        key = str(Path(filepath).resolve())
+        handle = self._open(key)
+        self._evict()
+        return handle
+
+    def release(self, filepath):
+        key = str(Path(filepath).resolve())
+        if self._refcounts.get(key, 0) > 0:
+            self._refcounts[key] -= 1
+        self._evict()
+
+    def discard(self, filepath):
+        key = str(Path(filepath).resolve())
+        if key in self._handles:
+            self._handles.pop(key).close()
+        if self._refcounts.get(key, 0) == 0:
+            self._refcounts.pop(key, None)
+
+    def clear(self):
+        for key in list(self._handles):
+            self.discard(key)
+
+    def _open(self, key: str) -> h5py.File:
+        if key in self._handles:
+            self._handles.move_to_end(key)
+        else:
+            self._handles[key] = h5py.File(key, 'r')
+        return self._handles[key]
+
+    def _evict(self):
+        # close the least recently used handles that are not in use
+        for key in list(self._handles):
+            if len(self._handles) <= self.maxsize:
+                break
+            if self._refcounts.get(key, 0) == 0:
+                self._handles.pop(key).close()
+                self._refcounts.pop(key, None)
+
+
+_file_pool = _FilePool()
+
+
+def set_max_open_files(maxsize: int):
+    """Sets the maximum number of hdf5 files kept open by the
+    ResultsFromDatabase objects used in managed mode. Least recently used
+    files are closed first.
+
+    Parameters
+    ----------
+    maxsize : int
+        maximum number of open hdf5 files
+    """
+    _file_pool.maxsize = maxsize
+    _file_pool._evict()
+
+
+def close_database_files():
+    """Closes all the hdf5 files kept open by the ResultsFromDatabase
+    objects used in managed mode.
+    """
+    _file_pool.clear()
+
 
 def to_hdf(df: pd.DataFrame, file: str, tally_name: str, xs_library: str = None,
            xaxis_name: str = None,
            when: str = 'n/a', where: str = 'n/a', code_version: str = None,
-           batches: int = None, particles_per_batch: int = None, literature: int = 'n/a'):
+           batches: int = None, particles_per_batch: int = None, literature: int = 'n/a',
+           format: str = 'table'):
     """Stores a DataFrame to a given hdf5 file. Useful function to generate new 
     hdf5 files results.
 
@@ -45,16 +151,90 @@ def to_hdf(df: pd.DataFrame, file: str, tally_name: str, xs_library: str = None,
     literature : int, optional
         title/DOI/link if results associated to a publication,
         by default None
+    format : str, optional
+        storage format of the tally, see to_hdf_many, by default 'table'
     """
 
+    to_hdf_many({tally_name: df}, file, xs_library, xaxis_name, when, where,
+                code_version, batches, particles_per_batch, literature, format)
+
+
+def to_hdf_many(dfs: dict, file: str, xs_library: str = None, xaxis_name: str = None,
+                when: str = 'n/a', where: str = 'n/a', code_version: str = None,
+                batches: int = None, particles_per_batch: int = None, literature: int = 'n/a',
+                format: str = 'table'):
+    """Stores many DataFrames to a given hdf5 file in one go.
+
+    With the 'table' format the file is written in two separate sessions,
+    so it is opened and flushed twice regardless of the number of tallies:
+    all the tables are written in one pandas HDFStore session, then all the
+    attributes in one h5py session. The attributes are not written through
+    the HDFStore because PyTables would store the strings as bytes. The two
+    sessions are not a single transaction, if the second one fails the file
+    is left with the tables but without their attributes. With the
+    'columnar' format everything is written in a single h5py session.
+
+    Two storage formats are available. 'table' stores each tally as a
+    PyTables table. 'columnar' stores each column of each tally as a
+    chunked, compressed hdf5 dataset, which makes much smaller files for
+    small tallies and needs h5py only to be read. ResultsFromDatabase reads
+    both formats.
+
+    Parameters
+    ----------
+    dfs : dict
+        DataFrames of results to store in the hdf5 file, keyed by tally name
+    file : str
+        name of the hdf5 file of results. Can include the path to the file
+    xs_library : str, optional
+        name of the nuclear data library used in the simulation, 
+        by default None
+    xaxis_name : str, optional
+        name of the x_axis to store for all the tallies in order to be
+        retrieved with the ResultsFromDatabase.get_tally_xaxis method,
+        by default None
+    when : str, optional
+        Can be the year(s) (YYYY-YYYY) or the month and year (Month, YYYY)
+        of the model run, by default 'n/a'
+    where : str, optional
+        ame of the institution that run the simulation/experiment,
+        by default 'n/a'
+    code_version : str, optional
+        version of the code used (if simulation result), by default None
+    batches : int, optional
+        number of batches simulated (if simulation result, 
+        assuming openmc particles/batches structure), by default None
+    particles_per_batch : int, optional
+        number of particles per batch simulated (if simulation result, 
+        assuming openmc particles/batches structure), by default None
+    literature : int, optional
+        title/DOI/link if results associated to a publication,
+        by default None
+    format : str, optional
+        'table' or 'columnar', by default 'table'
+    """
+
+    if format not in ('table', 'columnar'):
+        raise ValueError(f'Invalid format "{format}", can be "table" or "columnar"')
+
     filepath = Path(file)
-    # write the tally in the hdf file
-    df.to_hdf(filepath, tally_name, mode='a',
-              format='table', data_columns=True, index=False)
+    # a read handle kept open in the pool would block writing
+    _file_pool.discard(filepath)
+
+    # write the tallies in the hdf file
+    if format == 'table':
+        with pd.HDFStore(filepath, mode='a') as store:
+            for tally_name, df in dfs.items():
+                store.put(tally_name, df, format='table',
+                          data_columns=True, index=False)
 
     # write attributes to the hdf file
     with h5py.File(filepath, 'a') as f:
-        f[tally_name + '/table'].attrs['x_axis'] = xaxis_name
+        for tally_name, df in dfs.items():
+            if format == 'columnar':
+                _write_columnar(f, tally_name, df, xaxis_name)
+            else:
+                f[tally_name + '/table'].attrs['x_axis'] = xaxis_name
         f.attrs['when'] = str(when)
         f.attrs['where'] = where
         if code_version is not None:
@@ -69,6 +249,196 @@ def to_hdf(df: pd.DataFrame, file: str, tally_name: str, xs_library: str = None,
             f.attrs['literature_info'] = literature
 
 
+def _write_columnar(f: h5py.File, tally_name: str, df: pd.DataFrame, xaxis_name: str = None):
+    # one compressed dataset per column, column names are kept in an
+    # attribute since they may not be valid hdf5 names
+    if tally_name in f:
+        del f[tally_name]
+    group = f.create_group(tally_name)
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            data, dtype = values.to_numpy(), None
+        else:
+            # hdf5 strings read from 'table' files come as bytes
+            data = values.map(lambda v: v.decode() if isinstance(v, bytes) else str(v))
+            data, dtype = data.to_numpy(dtype=object), h5py.string_dtype()
+        group.create_dataset(f'c{i}', data=data, dtype=dtype, chunks=True,
+                             compression='gzip', shuffle=dtype is None)
+    group.attrs['columns'] = [str(c) for c in df.columns]
+    group.attrs['format'] = 'columnar'
+    if xaxis_name is not None:
+        group.attrs['x_axis'] = xaxis_name
+
+
+def _read_columnar(group: h5py.Group) -> pd.DataFrame:
+    columns = {}
+    for i, column in enumerate(group.attrs['columns']):
+        dataset = group[f'c{i}']
+        columns[column] = dataset.asstr()[()] \
+            if h5py.check_string_dtype(dataset.dtype) else dataset[()]
+    return pd.DataFrame(columns)
+
+
+def convert_to_columnar(file: str, output: str = None):
+    """Converts a results_database hdf file written in the 'table' format
+    to the compressed 'columnar' format, keeping all the attributes.
+
+    Parameters
+    ----------
+    file : str
+        name of the hdf file to convert. Can include the path to the file
+    output : str, optional
+        name of the converted file, by default the file is converted in place
+    """
+    tallies = {}
+    with ResultsFromDatabase(file) as results:
+        with results._file() as f:
+            attrs = {k: v for k, v in f.attrs.items() if k in _info_attrs}
+            names = list(f.keys())
+        for name in names:
+            try:
+                xaxis_name = results.get_tally_xaxis(name)
+            except KeyError:
+                xaxis_name = None
+            tallies[name] = (results.get_tally_dataframe(name), xaxis_name)
+    _file_pool.discard(file)
+
+    output = Path(output if output is not None else file)
+    tmp = output.with_name(output.name + '.tmp')
+    with h5py.File(tmp, 'w') as f:
+        for name, (df, xaxis_name) in tallies.items():
+            _write_columnar(f, name, df, xaxis_name)
+        f.attrs.update(attrs)
+    os.replace(tmp, output)
+
+
+def _plain(value):
+    # hdf5 attribute value as a json serializable python object
+    if hasattr(value, 'item'):
+        value = value.item()
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _scan_file(filepath: Path) -> dict:
+    # summary of a results hdf file for the database index
+    entry = {'attrs': {}, 'tallies': {}}
+    with h5py.File(filepath, 'r') as f:
+        for name in _info_attrs:
+            if name in f.attrs:
+                entry['attrs'][name] = _plain(f.attrs[name])
+        for name, group in f.items():
+            if 'table' in group:
+                table = group['table']
+                xaxis = table.attrs.get('x_axis')
+                columns = [c for c in table.dtype.names if c != 'index']
+                n_rows, fmt = table.shape[0], 'table'
+            else:
+                xaxis = group.attrs.get('x_axis')
+                columns = list(group.attrs['columns'])
+                n_rows = group['c0'].shape[0] if columns else 0
+                fmt = 'columnar'
+            entry['tallies'][name] = {'x_axis': _plain(xaxis), 'columns': columns,
+                                      'n_rows': int(n_rows), 'format': fmt}
+    return entry
+
+
+def update_database_index(folder: str) -> dict:
+    """Updates the consolidated index of a results_database benchmark
+    folder, stored in its index.json file. Only the hdf files that were
+    added or modified since the last update are opened.
+
+    Parameters
+    ----------
+    folder : str
+        path to the benchmark folder in the results_database
+
+    Returns
+    -------
+    dict
+        index, keyed by hdf file name, with the size, modification time,
+        attributes and tallies (x-axis, columns, number of rows and
+        format) of each file
+    """
+    folder = Path(folder)
+    index_path = folder / _index_name
+    index = {}
+    if index_path.exists():
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+        except ValueError:
+            index = {}
+
+    updated = {}
+    for filepath in sorted(folder.glob('*.h5')):
+        stat = filepath.stat()
+        entry = index.get(filepath.name)
+        if entry is None or entry['size'] != stat.st_size or \
+                entry['mtime_ns'] != stat.st_mtime_ns:
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                     **_scan_file(filepath)}
+        updated[filepath.name] = entry
+
+    if updated != index:
+        # atomic replace so that a crash never leaves a broken index,
+        # read-only databases are indexed in memory only
+        try:
+            tmp = index_path.with_name(f'{_index_name}.{os.getpid()}.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(updated, f, indent=1)
+            os.replace(tmp, index_path)
+        except OSError:
+            pass
+
+    return updated
+
+
+def read_database_index(folder: str) -> pd.DataFrame:
+    """Lists the tallies available in a results_database benchmark folder
+    from its consolidated index, see update_database_index.
+
+    Parameters
+    ----------
+    folder : str
+        path to the benchmark folder in the results_database
+
+    Returns
+    -------
+    pd.DataFrame
+        one row per tally with the file name, the tally name, the x-axis
+        name, the number of rows and the file attributes
+    """
+    rows = []
+    for filename, entry in update_database_index(folder).items():
+        for tally_name, tally in entry['tallies'].items():
+            rows.append({'file': filename, 'tally': tally_name,
+                         'x_axis': tally['x_axis'], 'n_rows': tally['n_rows'],
+                         **{k: entry['attrs'].get(k, 'n/a') for k in _info_attrs}})
+    return pd.DataFrame(rows, columns=['file', 'tally', 'x_axis', 'n_rows'] + _info_attrs)
+
+
+def read_fom_history(folder: str) -> pd.DataFrame:
+    """Reads the figure of merit history of a results_database benchmark
+    folder, see ResultsFromOpenmc.fom_to_history.
+
+    Parameters
+    ----------
+    folder : str
+        path to the benchmark folder in the results_database
+
+    Returns
+    -------
+    pd.DataFrame
+        one row per recorded tally and run, in recording order. Empty if no
+        history was recorded
+    """
+    path = Path(folder) / _fom_history_name
+    if not path.exists():
+        return pd.DataFrame(columns=_fom_columns)
+    return pd.read_csv(path, dtype={'when': str, 'where': str})
+
+
 def build_hdf_filename(code_name: str, code_version: Iterable, xs_library: str) -> str:
     """Builds the name for the hdf file to be stored in a results_database folder.
 
@@ -103,6 +473,14 @@ class ResultsFromDatabase:
     in the "results_database" folders of the benchmark models in order to be
     able to read, postprocess and plot the results from previous simulations
     that have been stored there.
+
+    The object can be used in managed mode as a context manager (or with the
+    open and close methods). In managed mode the hdf file is opened once,
+    its attributes are read once and cached, and all the tally reads are
+    served from the same file handle:
+
+    >>> with ResultsFromDatabase('experiment.h5') as results:
+    ...     df = results.get_tally_dataframe('nspectrum')
     """
 
     def __init__(self, file: str):
@@ -115,13 +493,75 @@ class ResultsFromDatabase:
             Can include the path to the file
         """
 
-        self.filename = file.strip().split('/')
+        self.filename = str(file).strip().split('/')
         self.filepath = Path(file)
 
+        self._handle = None
+        self._attrs = None
+        self._xaxis = {}
+
+    def open(self):
+        """Opens the hdf file in managed mode. The file handle is taken from
+        a pool of open files shared by all the ResultsFromDatabase objects.
+
+        Returns
+        -------
+        ResultsFromDatabase
+            the object itself
+        """
+        if self._handle is None:
+            self._handle = _file_pool.acquire(self.filepath)
+            self._attrs = dict(self._handle.attrs)
+            self._xaxis = {}
+        return self
+
+    def close(self):
+        """Leaves managed mode and releases the file handle to the pool.
+        """
+        if self._handle is not None:
+            _file_pool.release(self.filepath)
+            self._handle = None
+            self._attrs = None
+            self._xaxis = {}
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _refresh(self):
+        # the pooled handle is closed when the file is written, reopen it
+        # and drop the cached attributes that may have changed
+        if self._handle is not None and not self._handle:
+            self._handle = _file_pool.get(self.filepath)
+            self._attrs = dict(self._handle.attrs)
+            self._xaxis = {}
+
+    @contextmanager
+    def _file(self):
+        # serve reads from the pooled handle in managed mode
+        self._refresh()
+        if self._handle is not None:
+            yield self._handle
+        else:
+            with h5py.File(self.filepath) as f:
+                yield f
+
+    def _get_attribute(self, name: str) -> str:
+        self._refresh()
+        if self._attrs is not None:
+            return self._attrs.get(name, 'n/a')
+        with h5py.File(self.filepath) as f:
+            try:
+                return f.attrs[name]
+            except KeyError:
+                return 'n/a'
+
     def list_tallies(self):
         """Prints the names of all the tallies available in the hdf file
         """
-        with h5py.File(self.filepath) as f:
+        with self._file() as f:
             print(f.keys())
 
     def get_tally_dataframe(self, tally_name: str) -> pd.DataFrame:
@@ -139,16 +579,42 @@ class ResultsFromDatabase:
         pd.DataFrame
             DataFrame with tally results
         """
-        with h5py.File(self.filepath) as f:
-            df = pd.DataFrame(f[tally_name+'/table'][()]).drop(columns='index')
-            # decode hdf5 strings to strings if necessary
-            try:
-                df[self.get_tally_xaxis(tally_name)] = [el.decode()
-                                                        for el in df[self.get_tally_xaxis(tally_name)]]
-            except:
-                pass
+        with self._file() as f:
+            return self._read_dataframe(f, tally_name)
+
+    def get_tally_dataframes(self, tally_names: Iterable = None) -> dict:
+        """Retrieves the results of many tallies in Pandas DataFrame format,
+        opening the hdf file once.
+
+        Parameters
+        ----------
+        tally_names : Iterable, optional
+            Exact names of the tallies in the hdf file, by default all the
+            tallies in the file
+
+        Returns
+        -------
+        dict
+            DataFrames with tally results, keyed by tally name
+        """
+        with self._file() as f:
+            if tally_names is None:
+                tally_names = list(f.keys())
+            return {name: self._read_dataframe(f, name) for name in tally_names}
 
-            return df
+    def _read_dataframe(self, f: h5py.File, tally_name: str) -> pd.DataFrame:
+        if 'table' not in f[tally_name]:
+            return _read_columnar(f[tally_name])
+
+        df = pd.DataFrame(f[tally_name+'/table'][()]).drop(columns='index')
+        # decode hdf5 strings to strings if necessary
+        try:
+            xaxis = self._read_xaxis(f, tally_name)
+            df[xaxis] = [el.decode() for el in df[xaxis]]
+        except (KeyError, AttributeError):
+            pass
+
+        return df
 
     def get_tally_xaxis(self, tally_name: str) -> str:
         """Retrieves the string with the exact name associated to the tally
@@ -168,8 +634,20 @@ class ResultsFromDatabase:
         str
             Name used for the dataframe column with the x-axis info
         """
-        with h5py.File(self.filepath) as f:
-            return f[tally_name+'/table'].attrs['x_axis']
+        with self._file() as f:
+            return self._read_xaxis(f, tally_name)
+
+    def _read_xaxis(self, f: h5py.File, tally_name: str) -> str:
+        if tally_name in self._xaxis:
+            return self._xaxis[tally_name]
+
+        group = f[tally_name]
+        xaxis = group['table'].attrs['x_axis'] if 'table' in group \
+            else group.attrs['x_axis']
+        # cache the x-axis name in managed mode
+        if self._handle is not None:
+            self._xaxis[tally_name] = xaxis
+        return xaxis
 
     @property
     def literature_info(self) -> str:
@@ -181,11 +659,7 @@ class ResultsFromDatabase:
         str
             DOI or link to the publication
         """
-        with h5py.File(self.filepath) as f:
-            try:
-                return f.attrs['literature']
-            except KeyError:
-                return 'n/a'
+        return self._get_attribute('literature')
 
     @property
     def when(self) -> str:
@@ -196,11 +670,7 @@ class ResultsFromDatabase:
         str
             Experiment or simulation execution year
         """
-        with h5py.File(self.filepath) as f:
-            try:
-                return f.attrs['when']
-            except KeyError:
-                return 'n/a'
+        return self._get_attribute('when')
 
     @property
     def where(self) -> str:
@@ -211,11 +681,7 @@ class ResultsFromDatabase:
         str
             Experiment or simulation execution place
         """
-        with h5py.File(self.filepath) as f:
-            try:
-                return f.attrs['where']
-            except KeyError:
-                return 'n/a'
+        return self._get_attribute('where')
 
     @property
     def code_version(self) -> str:
@@ -227,11 +693,7 @@ class ResultsFromDatabase:
         str
             Code version
         """
-        with h5py.File(self.filepath) as f:
-            try:
-                return f.attrs['code_version']
-            except KeyError:
-                return 'n/a'
+        return self._get_attribute('code_version')
 
     @property
     def xs_library(self) -> str:
@@ -243,11 +705,7 @@ class ResultsFromDatabase:
         str
             Nuclear data library name
         """
-        with h5py.File(self.filepath) as f:
-            try:
-                return f.attrs['xs_library']
-            except KeyError:
-                return 'n/a'
+        return self._get_attribute('xs_library')
 
     def print_code_info(self):
         """Prints all the code info available
@@ -266,12 +724,25 @@ class ResultsFromDatabase:
               f'Literature: {self.literature_info}\n')
 
 
+def _normalize(tally_dataframe: pd.DataFrame, normalize_over: Iterable = None) -> pd.DataFrame:
+    # normalize tally over tally filter dimension (e.g. cell volume, surface area etc.)
+    if normalize_over is not None:
+        tally_dataframe['mean'] = tally_dataframe['mean'] / normalize_over
+        tally_dataframe['std. dev.'] = tally_dataframe['std. dev.'] / \
+            normalize_over
+
+    return tally_dataframe
+
+
 class ResultsFromOpenmc:
     """Similarly to ResultsFromDatabase, this class creates an object
     containing the results of a fresh new openmc simulation. It extracts
     from an openmc statepoint.h5 file.
     If openmc results have already been stored in an hdf file in the
     results_database folder it is necessary to use ResultsFromDatabase class.
+    The statepoint file is read lazily: only the tallies that are requested
+    are loaded, and the full openmc.StatePoint object is only built if the
+    statepoint attribute is accessed.
     """
 
     def __init__(self, file: str = 'statepoint.100.h5'):
@@ -283,21 +754,56 @@ class ResultsFromOpenmc:
             name of the statepoint.h5 file. Can include the path to the file,
             by default 'statepoint.100.h5'
         """
-        self.filename = file.strip().split('/')
+        self.filename = str(file).strip().split('/')
         self.filepath = Path(file)
-        # open statepoint file with openmc
-        self.statepoint = openmc.StatePoint(self.filepath)
+        # index the tallies in the statepoint file without loading them
+        self.lazy_statepoint = LazyStatePoint(self.filepath)
+        self._statepoint = None
+
+    @property
+    def statepoint(self) -> 'openmc.StatePoint':
+        """openmc.StatePoint object of the statepoint file, opened on first
+        access.
+
+        Returns
+        -------
+        openmc.StatePoint
+            openmc statepoint object
+        """
+        if self._statepoint is None:
+            import openmc
+            self._statepoint = openmc.StatePoint(self.filepath)
+        return self._statepoint
 
     def list_tallies(self):
         """Prints the names of all the tallies available in the statepoint.h5
         """
-        for k in self.statepoint.tallies.keys():
-            print(self.statepoint.tallies[k].name)
+        for name in self.lazy_statepoint.tally_names:
+            print(name)
+
+    def get_tally_results(self, tally_name: str) -> tuple:
+        """Retrieves the mean and std. dev. of a given tally as numpy arrays,
+        reading only that tally from the statepoint file.
+
+        Parameters
+        ----------
+        tally_name : str
+            Exact name of the tally as defined in the openmc model
+
+        Returns
+        -------
+        tuple
+            mean and std. dev. arrays of shape
+            (n filter bins, n nuclides * n scores)
+        """
+        return self.lazy_statepoint.get_tally_results(tally_name)
 
-    def get_tally_dataframe(self, tally_name: str, normalize_over: Iterable = None) -> pd.DataFrame:
+    def get_tally_dataframe(self, tally_name: str, normalize_over: Iterable = None,
+                            filter_columns: bool = True) -> pd.DataFrame:
         """Retrieves the results of a given tally in a Pandas DataFrame format.
-        It relies on the openmc.Statepoint().get_tally().get_pandas_dataframe()
-        method
+        The DataFrame has the same columns as the one returned by the
+        openmc.Statepoint().get_tally().get_pandas_dataframe() method, which
+        is used as a fallback for filters not supported by the lazy reader
 
         Parameters
         ----------
@@ -306,6 +812,9 @@ class ResultsFromOpenmc:
         normalize_over : Iterable, optional
             Some openmc tallies (e.g. cell tally, surface tally) need to be normalized 
             by their filter dimension (e.g cell volume, surface area), by default None
+        filter_columns : bool, optional
+            whether to build the columns describing the filter bins,
+            by default True
 
         Returns
         -------
@@ -313,16 +822,53 @@ class ResultsFromOpenmc:
             DataFrame with tally results
         """
         # extract tally in dataframe format from statepoint file
-        tally_dataframe = self.statepoint.get_tally(
-            name=tally_name).get_pandas_dataframe()
+        try:
+            tally_dataframe = self.lazy_statepoint.get_tally_dataframe(
+                tally_name, filter_columns=filter_columns)
+        except NotImplementedError:
+            tally_dataframe = self._get_openmc_tally(
+                tally_name).get_pandas_dataframe()
+
+        return _normalize(tally_dataframe, normalize_over)
+
+    def get_tally_dataframes(self, tally_names: Iterable, normalize_over: dict = None,
+                             filter_columns: bool = True) -> dict:
+        """Retrieves the results of many tallies in Pandas DataFrame format,
+        reading all of them in a single pass over the statepoint file.
+
+        Parameters
+        ----------
+        tally_names : Iterable
+            Exact names of the tallies as defined in the openmc model
+        normalize_over : dict, optional
+            Normalization of each tally over its filter dimension
+            (e.g cell volume, surface area), keyed by tally name. Tallies
+            not in the dict are not normalized, by default None
+        filter_columns : bool, optional
+            whether to build the columns describing the filter bins,
+            by default True
+
+        Returns
+        -------
+        dict
+            DataFrames with tally results, keyed by tally name
+        """
+        tally_names = list(tally_names)
+        normalize_over = {} if normalize_over is None else normalize_over
 
-        # normalize tally over tally filter dimension (e.g. cell volume, surface area etc.)
-        if normalize_over is not None:
-            tally_dataframe['mean'] = tally_dataframe['mean'] / normalize_over
-            tally_dataframe['std. dev.'] = tally_dataframe['std. dev.'] / \
-                normalize_over
+        try:
+            dataframes = self.lazy_statepoint.get_tally_dataframes(
+                tally_names, filter_columns=filter_columns)
+        except NotImplementedError:
+            dataframes = {name: self.get_tally_dataframe(name, filter_columns=filter_columns)
+                          for name in tally_names}
 
-        return tally_dataframe
+        return {name: _normalize(df, normalize_over.get(name))
+                for name, df in dataframes.items()}
+
+    def _get_openmc_tally(self, tally_name: str) -> 'openmc.Tally':
+        # look the tally up by id instead of scanning all the tallies
+        return self.statepoint.tallies[self.lazy_statepoint.tally_id(tally_name)]
 
     @property
     def get_openmc_version(self) -> tuple:
@@ -333,7 +879,7 @@ class ResultsFromOpenmc:
         tuple
             openmc version
         """
-        return self.statepoint.version
+        return self.lazy_statepoint.version
 
     @property
     def get_particles_per_batch(self) -> float:
@@ -344,7 +890,7 @@ class ResultsFromOpenmc:
         float
             Number of particle per batch
         """
-        return format(self.statepoint.n_particles, '.2e')
+        return format(self.lazy_statepoint.n_particles, '.2e')
 
     @property
     def get_batches(self) -> int:
@@ -355,7 +901,104 @@ class ResultsFromOpenmc:
         int
             Number of batches
         """
-        return self.statepoint.n_batches
+        return self.lazy_statepoint.n_batches
+
+    @property
+    def get_simulation_time(self) -> float:
+        """Retrieves the wall time in seconds spent in the simulation,
+        initialization excluded.
+
+        Returns
+        -------
+        float
+            simulation time in seconds, NaN if not stored in the statepoint
+        """
+        return self.lazy_statepoint.simulation_time
+
+    def get_tally_fom(self, tally_name: str) -> pd.DataFrame:
+        """Retrieves the relative error R and the figure of merit
+        FOM = 1 / (R^2 T) of each bin of a given tally, T being the
+        simulation time. Bins with no score have NaN R and FOM.
+
+        Parameters
+        ----------
+        tally_name : str
+            Exact name of the tally as defined in the openmc model
+
+        Returns
+        -------
+        pd.DataFrame
+            tally DataFrame, see get_tally_dataframe, with the additional
+            'rel. err.' and 'FOM' columns
+        """
+        df = self.get_tally_dataframe(tally_name)
+        rel_err, fom = self.lazy_statepoint.get_tally_fom(tally_name)
+        df['rel. err.'] = rel_err.ravel()
+        df['FOM'] = fom.ravel()
+        return df
+
+    def summarize_fom(self, tally_names: Iterable = None) -> pd.DataFrame:
+        """Summarizes the figures of merit of many tallies by their worst
+        bin, see LazyStatePoint.summarize_fom.
+
+        Parameters
+        ----------
+        tally_names : Iterable, optional
+            Exact names of the tallies as defined in the openmc model, by
+            default all the tallies of the statepoint
+
+        Returns
+        -------
+        pd.DataFrame
+            one row per tally with the number of bins, the number of bins
+            with no score, the index of the worst bin, the max and median
+            relative errors and the FOM of the worst bin and median FOM
+        """
+        return self.lazy_statepoint.summarize_fom(tally_names)
+
+    def fom_to_history(self, xs_library: str, tally_names: Iterable = None,
+                       path_to_database: str = '../results_database', when: str = 'n/a',
+                       where: str = 'n/a') -> pd.DataFrame:
+        """Appends the figures of merit of the tallies, see summarize_fom,
+        to the fom_history.csv file of a results_database folder, so that
+        the effect of batches, particles, variance reduction or code changes
+        can be followed across runs. The history is read back with
+        read_fom_history.
+
+        Parameters
+        ----------
+        xs_library : str
+            Name of the nuclear data library used for the simulation
+        tally_names : Iterable, optional
+            Exact names of the tallies as defined in the openmc model, by
+            default all the tallies of the statepoint
+        path_to_database : str, optional
+            path to the results_database folder of the benchmark, created
+            if missing, by default '../results_database'
+        when : str, optional
+            Can be the year(s) (YYYY-YYYY) or the month and year (Month, YYYY) of the model run
+        where : str, optional
+            Name of the institution that run the simulation
+
+        Returns
+        -------
+        pd.DataFrame
+            the appended rows
+        """
+        summary = self.summarize_fom(tally_names)
+        info = {'when': when, 'where': where,
+                'code_version': 'openmc-' + '.'.join(map(str, self.get_openmc_version)),
+                'xs_library': xs_library, 'batches': self.get_batches,
+                'particles_per_batch': self.get_particles_per_batch,
+                'simulation_time': self.get_simulation_time}
+        for i, (name, value) in enumerate(info.items()):
+            summary.insert(loc=i, column=name, value=value)
+
+        path = Path(path_to_database) / _fom_history_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        summary.to_csv(path, mode='a', header=not path.exists(), index=False)
+
+        return summary
 
     def tally_to_hdf(self, tally_name: str, normalize_over: Iterable, xs_library: str, xaxis_name: str,
                      xaxis_list: Iterable = None, path_to_database: str = '../results_database', when: str = 'n/a',
@@ -386,24 +1029,61 @@ class ResultsFromOpenmc:
             Name of the institution that run the simulation
         """
 
+        self.tallies_to_hdf({tally_name: (normalize_over, xaxis_list)},
+                            xs_library, xaxis_name, path_to_database, when,
+                            where, literature)
+
+    def tallies_to_hdf(self, tallies: dict, xs_library: str, xaxis_name: str,
+                       path_to_database: str = '../results_database', when: str = 'n/a',
+                       where: str = 'n/a', literature: int = None, format: str = 'table'):
+        """Stores many openmc tallies in a hdf file for the results_database
+        folder. The tallies are read from the statepoint file in a single pass
+        and written to the hdf file in a single transaction.
+
+        Parameters
+        ----------
+        tallies : dict
+            Tallies to store, keyed by the exact tally name. Each value is a
+            (normalize_over, xaxis_list) tuple, see the tally_to_hdf method
+        xs_library : str
+            Name of the nuclear data library used for the simulation
+        xaxis_name : str, optional
+            name of the x_axis to store in order to be retrieved with the
+            ResultsFromDatabase.get_tally_xaxis method, by default None
+        path_to_database : str, optional
+            path to the results_database folder for storing the new hdf file,
+            by default '../results_database'
+        when : str, optional
+            Can be the year(s) (YYYY-YYYY) or the month and year (Month, YYYY) of the model run
+        where : str, optional
+            Name of the institution that run the simulation
+        format : str, optional
+            storage format of the tallies, 'table' or 'columnar' (see
+            to_hdf_many), by default 'table'
+        """
+
         filename = build_hdf_filename(
             'openmc', self.get_openmc_version, xs_library)
         file = path_to_database + '/' + filename
 
-        # extract tally in dataframe format from statepoint file
-        tally_df = self.get_tally_dataframe(
-            tally_name, normalize_over=normalize_over)
+        # extract tallies in dataframe format from statepoint file
+        dfs = self.get_tally_dataframes(
+            tallies, normalize_over={k: v[0] for k, v in tallies.items()})
 
-        # rework the dataframe dropping useless columns
-        for c in _del_columns:
-            if c in tally_df.columns:
-                tally_df = tally_df.drop(columns=c)
+        for tally_name, (_, xaxis_list) in tallies.items():
+            tally_df = dfs[tally_name]
+            # rework the dataframe dropping useless columns
+            for c in _del_columns:
+                if c in tally_df.columns:
+                    tally_df = tally_df.drop(columns=c)
 
-        # add xaxis columns if required
-        if xaxis_list is not None:
-            tally_df.insert(loc=0, column=xaxis_name, value=xaxis_list)
+            # add xaxis columns if required
+            if xaxis_list is not None:
+                tally_df.insert(loc=0, column=xaxis_name, value=xaxis_list)
+            dfs[tally_name] = tally_df
 
         code_version = 'openmc-' + '.'.join(map(str, self.get_openmc_version))
 
-        to_hdf(tally_df, file, tally_name, xs_library, xaxis_name, when, where,
-               code_version, self.get_batches, self.get_particles_per_batch, literature)
+        to_hdf_many(dfs, file, xs_library, xaxis_name, when, where,
+                    code_version, self.get_batches, self.get_particles_per_batch, literature,
+                    format)
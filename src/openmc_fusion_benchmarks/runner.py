@@ -0,0 +1,76 @@
+"""Functions for running benchmark simulations concurrently"""
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Iterable
+
+
+def split_threads(cores: int, n_jobs: int) -> list:
+    """Splits a budget of cores among a number of jobs. If there are more
+    jobs than cores each job gets one thread and they queue.
+
+    Parameters
+    ----------
+    cores : int
+        total number of cores available
+    n_jobs : int
+        number of jobs to run
+
+    Returns
+    -------
+    list
+        number of threads for each job
+    """
+    if n_jobs >= cores:
+        return [1] * n_jobs
+    threads, extra = divmod(cores, n_jobs)
+    return [threads + 1 if i < extra else threads for i in range(n_jobs)]
+
+
+def run_benchmarks(jobs: Iterable, cores: int = None, callback: Callable = None,
+                   geometry_type: str = 'csg') -> list:
+    """Runs a list of benchmark simulations concurrently within a budget of
+    cores. The cores are split among the jobs as OpenMP threads, and the
+    jobs run in parallel as long as there are cores left. Each simulation
+    runs in its own openmc subprocess.
+
+    Parameters
+    ----------
+    jobs : Iterable
+        (benchmark, run_option) tuples, where benchmark is a Benchmark
+        object (or ScriptBenchmark for the scripts in models/) and
+        run_option can be None
+    cores : int, optional
+        total number of cores to use, by default all the cores of the
+        machine
+    callback : Callable, optional
+        function called as callback(benchmark, run_option, statepoint) as
+        soon as each job finishes, by default None
+    geometry_type : str, optional
+        either "csg" or "cad", by default 'csg'
+
+    Returns
+    -------
+    list
+        paths to the statepoint files, in the same order as the jobs
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    cores = os.cpu_count() if cores is None else cores
+    threads = split_threads(cores, len(jobs))
+
+    statepoints = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=min(len(jobs), cores)) as executor:
+        futures = {executor.submit(benchmark.run, run_option, n,
+                                   geometry_type=geometry_type): i
+                   for i, ((benchmark, run_option), n) in enumerate(zip(jobs, threads))}
+
+        # collect statepoints as the jobs finish
+        for future in as_completed(futures):
+            i = futures[future]
+            statepoints[i] = Path(future.result())
+            if callback is not None:
+                callback(*jobs[i], statepoints[i])
+
+    return statepoints
@@ -0,0 +1,376 @@
+"""Lazy reader for openmc statepoint files"""
+import h5py
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable
+
+# filters whose bins map to a single dataframe column named after the filter
+_int_filters = ['cell', 'surface', 'material', 'universe', 'cellborn',
+                'cellfrom', 'collision']
+# filters whose bins are energy intervals
+_energy_filters = ['energy', 'energyout']
+# columns of the figure of merit summary of the tallies, see summarize_fom
+_fom_summary_columns = ['tally', 'n bins', 'unscored bins', 'worst bin', 'max R',
+                        'median R', 'FOM', 'median FOM']
+
+
+class LazyStatePoint:
+    """Lightweight reader of openmc statepoint.h5 files. At open time it only
+    indexes the tally names to the position of their results dataset in the
+    hdf5 file. The results of a tally are read (memory-mapped whenever the
+    dataset is stored contiguously) only when that tally is requested, and
+    the columns describing the tally filters are built only when asked.
+    Tallies with filters that are not supported by the lazy reader raise a
+    NotImplementedError when their dataframe is requested, in that case
+    the openmc.StatePoint class should be used instead.
+    """
+
+    def __init__(self, file: str = 'statepoint.100.h5'):
+        """LazyStatePoint class constructor.
+
+        Parameters
+        ----------
+        file : str, optional
+            name of the statepoint.h5 file. Can include the path to the file,
+            by default 'statepoint.100.h5'
+        """
+        self.filepath = Path(file)
+
+        with h5py.File(self.filepath, 'r') as f:
+            self.version = tuple(f.attrs['openmc_version'])
+            self.n_batches = f['n_batches'][()]
+            self.n_particles = f['n_particles'][()]
+            self.runtime = {k: v[()] for k, v in f['runtime'].items()} \
+                if 'runtime' in f else {}
+
+            # index tally names to their results dataset
+            self._index = {}
+            if 'tallies' in f and f['tallies'].attrs['n_tallies'] > 0:
+                for tally_id in f['tallies'].attrs['ids']:
+                    group = f[f'tallies/tally {tally_id}']
+                    if group.attrs.get('internal'):
+                        continue
+                    name = group['name'][()].decode() if 'name' in group else ''
+                    if name in self._index:
+                        continue
+                    results = group['results']
+                    self._index[name] = {'id': int(tally_id),
+                                         'offset': results.id.get_offset(),
+                                         'shape': results.shape,
+                                         'dtype': results.dtype}
+
+    @property
+    def tally_names(self) -> list:
+        """Names of the tallies available in the statepoint file
+
+        Returns
+        -------
+        list
+            tally names
+        """
+        return list(self._index)
+
+    def tally_id(self, tally_name: str) -> int:
+        """Retrieves the id of a tally from its name without scanning the
+        tallies in the statepoint file.
+
+        Parameters
+        ----------
+        tally_name : str
+            Exact name of the tally as defined in the openmc model
+
+        Returns
+        -------
+        int
+            tally id
+        """
+        return self._entry(tally_name)['id']
+
+    def _entry(self, tally_name: str) -> dict:
+        try:
+            return self._index[tally_name]
+        except KeyError:
+            raise LookupError(
+                f'Unable to find tally "{tally_name}" in {self.filepath}')
+
+    @contextmanager
+    def _open(self):
+        # one hdf5 handle and one memory map of the whole file per read pass
+        with h5py.File(self.filepath, 'r') as f:
+            yield f, np.memmap(self.filepath, dtype=np.uint8, mode='r')
+
+    def _read_results(self, f: h5py.File, buffer: np.memmap, tally_name: str) -> tuple:
+        entry = self._entry(tally_name)
+        group = f[f"tallies/tally {entry['id']}"]
+        n = group['n_realizations'][()]
+
+        # map the contiguous results dataset straight from the file
+        if entry['offset'] is not None:
+            nbytes = int(np.prod(entry['shape'])) * entry['dtype'].itemsize
+            data = buffer[entry['offset']:entry['offset'] + nbytes].view(
+                entry['dtype']).reshape(entry['shape'])
+        else:
+            data = group['results']
+        sums = np.array(data[:, :, 0])
+        sums_sq = np.array(data[:, :, 1])
+
+        mean = sums / n
+        std_dev = np.zeros_like(mean)
+        nonzero = np.abs(mean) > 0
+        std_dev[nonzero] = np.sqrt(
+            (sums_sq[nonzero] / n - mean[nonzero]**2) / (n - 1))
+
+        return mean, std_dev
+
+    def get_tally_results(self, tally_name: str) -> tuple:
+        """Reads the results of a single tally and computes mean and std. dev.
+        the same way openmc does.
+
+        Parameters
+        ----------
+        tally_name : str
+            Exact name of the tally as defined in the openmc model
+
+        Returns
+        -------
+        tuple
+            mean and std. dev. arrays of shape
+            (n filter bins, n nuclides * n scores)
+        """
+        with self._open() as (f, buffer):
+            return self._read_results(f, buffer, tally_name)
+
+    @property
+    def simulation_time(self) -> float:
+        """Wall time in seconds spent in the simulation, i.e. transporting
+        particles and accumulating tallies, initialization excluded.
+
+        Returns
+        -------
+        float
+            simulation time in seconds, NaN if not stored in the file
+        """
+        return float(self.runtime.get('simulation', self.runtime.get('total', np.nan)))
+
+    def get_tally_fom(self, tally_name: str) -> tuple:
+        """Computes the relative error R and the figure of merit
+        FOM = 1 / (R^2 T) of each bin of a tally, T being the simulation
+        time. Bins with no score, or with a null std. dev., have NaN R and
+        FOM.
+
+        Parameters
+        ----------
+        tally_name : str
+            Exact name of the tally as defined in the openmc model
+
+        Returns
+        -------
+        tuple
+            relative error and FOM arrays of shape
+            (n filter bins, n nuclides * n scores)
+        """
+        mean, std_dev = self.get_tally_results(tally_name)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rel_err = np.where((mean != 0) & (std_dev > 0), std_dev / np.abs(mean), np.nan)
+        return rel_err, 1 / (rel_err**2 * self.simulation_time)
+
+    def summarize_fom(self, tally_names: Iterable = None) -> pd.DataFrame:
+        """Summarizes the figures of merit of many tallies by their worst
+        bin, i.e. the scored bin with the largest relative error, which is
+        the bin that drives the number of particles to simulate.
+
+        Parameters
+        ----------
+        tally_names : Iterable, optional
+            Exact names of the tallies as defined in the openmc model, by
+            default all the tallies of the statepoint
+
+        Returns
+        -------
+        pd.DataFrame
+            one row per tally with the number of bins, the number of bins
+            with no score, the index of the worst bin, the max and median
+            relative errors R and the FOM of the worst bin and median FOM.
+            The statistics are NaN, and the worst bin -1, for tallies with
+            no scored bin
+        """
+        if tally_names is None:
+            tally_names = self.tally_names
+
+        rows = []
+        for name in tally_names:
+            rel_err, fom = (a.ravel() for a in self.get_tally_fom(name))
+            scored = np.isfinite(rel_err)
+            row = {'tally': name, 'n bins': rel_err.size,
+                   'unscored bins': int((~scored).sum()), 'worst bin': -1}
+            if scored.any():
+                row['worst bin'] = int(np.nanargmax(rel_err))
+                row.update({'max R': rel_err[row['worst bin']],
+                            'median R': np.median(rel_err[scored]),
+                            'FOM': fom[row['worst bin']],
+                            'median FOM': np.median(fom[scored])})
+            rows.append(row)
+
+        return pd.DataFrame(rows, columns=_fom_summary_columns)
+
+    def get_tally_dataframe(self, tally_name: str, filter_columns: bool = True) -> pd.DataFrame:
+        """Retrieves the results of a given tally in a Pandas DataFrame format
+        with the same columns as openmc.Tally.get_pandas_dataframe().
+
+        Parameters
+        ----------
+        tally_name : str
+            Exact name of the tally as defined in the openmc model
+        filter_columns : bool, optional
+            whether to build the columns describing the filter bins,
+            by default True
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with tally results
+
+        Raises
+        ------
+        NotImplementedError
+            if filter_columns is True and the tally has a filter or a
+            derivative that the lazy reader does not support
+        """
+        with self._open() as (f, buffer):
+            return self._read_dataframe(f, buffer, tally_name, filter_columns)
+
+    def get_tally_dataframes(self, tally_names: Iterable, filter_columns: bool = True) -> dict:
+        """Retrieves the results of many tallies in Pandas DataFrame format,
+        reading all of them in a single pass over the statepoint file.
+
+        Parameters
+        ----------
+        tally_names : Iterable
+            Exact names of the tallies as defined in the openmc model
+        filter_columns : bool, optional
+            whether to build the columns describing the filter bins,
+            by default True
+
+        Returns
+        -------
+        dict
+            DataFrames with tally results, keyed by tally name
+
+        Raises
+        ------
+        NotImplementedError
+            if filter_columns is True and a tally has a filter or a
+            derivative that the lazy reader does not support
+        """
+        with self._open() as (f, buffer):
+            return {name: self._read_dataframe(f, buffer, name, filter_columns)
+                    for name in tally_names}
+
+    def _read_dataframe(self, f: h5py.File, buffer: np.memmap, tally_name: str,
+                        filter_columns: bool) -> pd.DataFrame:
+        group = f[f"tallies/tally {self.tally_id(tally_name)}"]
+        nuclides = [n.decode().strip() for n in group['nuclides'][()]]
+        scores = [s.decode() for s in group['score_bins'][()]]
+        if filter_columns:
+            if 'derivative' in group:
+                raise NotImplementedError(
+                    'Tally derivatives are not supported')
+            filter_ids = group['filters'][()] \
+                if group['n_filters'][()] > 0 else []
+            filters = [f[f'tallies/filters/filter {i}'] for i in filter_ids]
+            columns = self._filter_columns(filters, len(nuclides) * len(scores))
+        else:
+            columns = {}
+
+        mean, std_dev = self._read_results(f, buffer, tally_name)
+        data_size = mean.size
+
+        df = pd.DataFrame(columns)
+        df['nuclide'] = np.tile(np.repeat(nuclides, len(scores)),
+                                data_size // (len(nuclides) * len(scores)))
+        df['score'] = np.tile(scores, data_size // len(scores))
+        df['mean'] = mean.ravel()
+        df['std. dev.'] = std_dev.ravel()
+
+        return df
+
+    def _filter_columns(self, filters: list, stride: int) -> dict:
+        # the last filter varies fastest, as in openmc.Tally.filter_strides
+        strides = []
+        for group in reversed(filters):
+            strides.append(stride)
+            stride *= group['n_bins'][()]
+        data_size = stride
+
+        columns = {}
+        for group, stride in zip(filters, reversed(strides)):
+            filter_type = group['type'][()].decode()
+            if filter_type in _int_filters:
+                bins = {filter_type: group['bins'][()]}
+            elif filter_type == 'particle':
+                bins = {filter_type: [b.decode() for b in group['bins'][()]]}
+            elif filter_type in _energy_filters:
+                edges = group['bins'][()]
+                bins = {f'{filter_type} low [eV]': edges[:-1],
+                        f'{filter_type} high [eV]': edges[1:]}
+            elif filter_type == 'energyfunction':
+                bins = {filter_type: [int(group.name.split()[-1])]}
+            else:
+                raise NotImplementedError(
+                    f'Filter type "{filter_type}" is not supported')
+
+            for column, values in bins.items():
+                values = np.repeat(values, stride)
+                columns[column] = np.tile(values, data_size // len(values))
+
+        return columns
+
+
+def compare_figures_of_merit(reference: str, statepoint: str, tally_names: Iterable = None) -> pd.DataFrame:
+    """Compares the figures of merit of the tallies of two simulations of the
+    same model, e.g. an analog run and a run with variance reduction. The
+    FOM of a tally is the one of its worst bin, see
+    LazyStatePoint.summarize_fom.
+
+    Parameters
+    ----------
+    reference : str
+        path to the statepoint file of the reference simulation
+    statepoint : str
+        path to the statepoint file of the compared simulation
+    tally_names : Iterable, optional
+        names of the tallies to compare, by default all the tallies found in
+        both files
+
+    Returns
+    -------
+    pd.DataFrame
+        one row per tally with the number of bins, the number of bins with
+        no score, the max relative error and the FOM of each simulation, the
+        FOM gain of the tally and the median of the FOM gains of the bins
+        scored in both simulations
+    """
+    reference, statepoint = LazyStatePoint(reference), LazyStatePoint(statepoint)
+    if tally_names is None:
+        tally_names = [n for n in reference.tally_names if n in statepoint.tally_names]
+    tally_names = list(tally_names)
+
+    summary_ref = reference.summarize_fom(tally_names)
+    summary = statepoint.summarize_fom(tally_names)
+    report = summary[['tally', 'n bins']].copy()
+    for column in ['unscored bins', 'max R', 'FOM']:
+        report[f'{column} (reference)'] = summary_ref[column]
+        report[column] = summary[column]
+    report['FOM gain'] = summary['FOM'] / summary_ref['FOM']
+
+    median_gains = []
+    for name in tally_names:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gains = statepoint.get_tally_fom(name)[1] / reference.get_tally_fom(name)[1]
+        both = np.isfinite(gains)
+        median_gains.append(np.median(gains[both]) if both.any() else np.nan)
+    report['median bin gain'] = median_gains
+
+    return report
@@ -1,5 +1,8 @@
+import hashlib
 import numpy as np
 import pandas as pd
+from collections import OrderedDict
+from scipy import sparse
 from typing import Iterable
 
 
@@ -33,6 +36,237 @@ def rescale_to_lethargy(df: pd.DataFrame) -> pd.DataFrame:
     return df_lethargy
 
 
+def _overlap_entries(energy_low: np.ndarray, energy_high: np.ndarray,
+                     new_energy_low: np.ndarray, new_energy_high: np.ndarray) -> tuple:
+    # first and last+1 source bins overlapping each target bin
+    start = np.searchsorted(energy_high, new_energy_low, side='right')
+    stop = np.searchsorted(energy_low, new_energy_high, side='left')
+    counts = np.maximum(stop - start, 0)
+
+    # indices of all the (target, source) overlapping pairs
+    rows = np.repeat(np.arange(len(new_energy_low)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts,
+                                                  counts)
+    cols = start[rows] + offsets
+
+    widths = np.minimum(energy_high[cols], new_energy_high[rows]) - \
+        np.maximum(energy_low[cols], new_energy_low[rows])
+
+    return rows, cols, widths
+
+
+def overlap_matrix(energy_low: Iterable, energy_high: Iterable,
+                   new_energy_low: Iterable, new_energy_high: Iterable) -> np.ndarray:
+    """Computes the width of the overlap between each bin of a source energy
+    grid and each bin of a target energy grid. The overlapping bins are found
+    with np.searchsorted on the sorted source bin edges, so only the nonzero
+    entries of the matrix are ever computed.
+
+    Parameters
+    ----------
+    energy_low : Iterable
+        lower bounds of the source energy bins, sorted in ascending order
+    energy_high : Iterable
+        upper bounds of the source energy bins, sorted in ascending order
+    new_energy_low : Iterable
+        lower bounds of the target energy bins
+    new_energy_high : Iterable
+        upper bounds of the target energy bins
+
+    Returns
+    -------
+    np.ndarray
+        matrix of shape (n target bins, n source bins) with the width of the
+        overlap between each target bin and each source bin
+    """
+    energy_low = np.asarray(energy_low, dtype=float)
+    energy_high = np.asarray(energy_high, dtype=float)
+    new_energy_low = np.asarray(new_energy_low, dtype=float)
+    new_energy_high = np.asarray(new_energy_high, dtype=float)
+
+    rows, cols, widths = _overlap_entries(energy_low, energy_high,
+                                          new_energy_low, new_energy_high)
+
+    overlaps = np.zeros((len(new_energy_low), len(energy_low)))
+    overlaps[rows, cols] = widths
+
+    return overlaps
+
+
+class RebinOperator:
+    """Linear operator that rebins energy spectra from a source energy grid
+    to a target energy grid. The overlap weights between the two grids are
+    computed once and stored as sparse matrices, so that any number of
+    spectra sharing the same grids can be rebinned with a single sparse
+    matrix product. Operators built with the from_edges method are memoized
+    by a hash of the energy edges.
+    """
+
+    maxsize = 128
+    _cache = OrderedDict()
+
+    def __init__(self, energy_low: Iterable, energy_high: Iterable,
+                 new_energy_low: Iterable, new_energy_high: Iterable):
+        """RebinOperator class constructor
+
+        Parameters
+        ----------
+        energy_low : Iterable
+            lower bounds of the source energy bins, sorted in ascending order
+        energy_high : Iterable
+            upper bounds of the source energy bins, sorted in ascending order
+        new_energy_low : Iterable
+            lower bounds of the target energy bins
+        new_energy_high : Iterable
+            upper bounds of the target energy bins
+        """
+        self.energy_low = np.asarray(energy_low, dtype=float)
+        self.energy_high = np.asarray(energy_high, dtype=float)
+        self.new_energy_low = np.asarray(new_energy_low, dtype=float)
+        self.new_energy_high = np.asarray(new_energy_high, dtype=float)
+
+        rows, cols, widths = _overlap_entries(self.energy_low, self.energy_high,
+                                              self.new_energy_low, self.new_energy_high)
+        weights = widths / (self.new_energy_high - self.new_energy_low)[rows]
+        shape = (len(self.new_energy_low), len(self.energy_low))
+
+        self._mean_matrix = sparse.csr_matrix((weights, (rows, cols)),
+                                              shape=shape)
+        self._var_matrix = sparse.csr_matrix((weights**2, (rows, cols)),
+                                             shape=shape)
+
+    @classmethod
+    def from_edges(cls, energy_low: Iterable, energy_high: Iterable,
+                   new_energy_low: Iterable, new_energy_high: Iterable):
+        """Returns the rebin operator for the given source and target
+        energy bins, building it only if the same edges have not been
+        seen before.
+
+        Parameters
+        ----------
+        energy_low : Iterable
+            lower bounds of the source energy bins, sorted in ascending order
+        energy_high : Iterable
+            upper bounds of the source energy bins, sorted in ascending order
+        new_energy_low : Iterable
+            lower bounds of the target energy bins
+        new_energy_high : Iterable
+            upper bounds of the target energy bins
+
+        Returns
+        -------
+        RebinOperator
+            rebin operator from the source to the target energy bins
+        """
+        edges = [np.ascontiguousarray(e, dtype=float) for e in
+                 (energy_low, energy_high, new_energy_low, new_energy_high)]
+        key = hashlib.sha1()
+        for e in edges:
+            key.update(len(e).to_bytes(8, 'little'))
+            key.update(e.tobytes())
+        key = key.hexdigest()
+
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+        else:
+            cls._cache[key] = cls(*edges)
+            if len(cls._cache) > cls.maxsize:
+                cls._cache.popitem(last=False)
+
+        return cls._cache[key]
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the operator (n target bins, n source bins)"""
+        return self._mean_matrix.shape
+
+    def apply(self, mean: Iterable, std_dev: Iterable) -> tuple:
+        """Rebins one or more spectra. The mean in each new bin is the
+        overlap-width weighted average of the source bins, and the std. dev.
+        is propagated assuming uncorrelated source bins.
+
+        Parameters
+        ----------
+        mean : Iterable
+            mean values of the spectrum, either of shape (n source bins,) or
+            (n spectra, n source bins)
+        std_dev : Iterable
+            std. dev. values of the spectrum, with the same shape as mean
+
+        Returns
+        -------
+        tuple
+            rebinned mean and std. dev. arrays, of shape (n new bins,) or
+            (n spectra, n new bins)
+        """
+        mean = np.asarray(mean, dtype=float)
+        std_dev = np.asarray(std_dev, dtype=float)
+
+        rebinned_mean = (self._mean_matrix @ mean.T).T
+        rebinned_std_dev = np.sqrt(self._var_matrix @ (std_dev**2).T).T
+
+        return rebinned_mean, rebinned_std_dev
+
+    def apply_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rebins an energy spectrum tally in DataFrame format. The source
+        bins of the DataFrame must match the source bins of the operator.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame containing an energy spectrum tally. It needs to contain
+            'mean' and 'std. dev.' columns sorted by ascending energy.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with 'energy low [eV]', 'energy high [eV]', 'mean' and
+            'std. dev.' columns in the new energy bins.
+        """
+        mean, std_dev = self.apply(df['mean'], df['std. dev.'])
+
+        return pd.DataFrame({'energy low [eV]': self.new_energy_low,
+                             'energy high [eV]': self.new_energy_high,
+                             'mean': mean, 'std. dev.': std_dev})
+
+
+def rebin_arrays(energy_low: Iterable, energy_high: Iterable, mean: Iterable,
+                 std_dev: Iterable, new_energy_low: Iterable,
+                 new_energy_high: Iterable) -> tuple:
+    """Rebin one or more energy spectra, given as arrays, to new energy bins.
+    The mean in each new bin is the overlap-width weighted average of the
+    source bins, and the std. dev. is propagated assuming uncorrelated source
+    bins. Stacks of spectra on the same energy grid are rebinned in a single
+    matrix product.
+
+    Parameters
+    ----------
+    energy_low : Iterable
+        lower bounds of the source energy bins, sorted in ascending order
+    energy_high : Iterable
+        upper bounds of the source energy bins, sorted in ascending order
+    mean : Iterable
+        mean values of the spectrum, either of shape (n source bins,) or
+        (n spectra, n source bins)
+    std_dev : Iterable
+        std. dev. values of the spectrum, with the same shape as mean
+    new_energy_low : Iterable
+        lower bounds of the new energy bins
+    new_energy_high : Iterable
+        upper bounds of the new energy bins
+
+    Returns
+    -------
+    tuple
+        rebinned mean and std. dev. arrays, of shape (n new bins,) or
+        (n spectra, n new bins)
+    """
+    operator = RebinOperator.from_edges(energy_low, energy_high,
+                                        new_energy_low, new_energy_high)
+
+    return operator.apply(mean, std_dev)
+
+
 def rebin_spectrum(df: pd.DataFrame, energy_low: Iterable, energy_high: Iterable) -> pd.DataFrame:
     """Rebin an energy spectrum tally to new energy bins. The new energy bins
     are defined by the energy_low and energy_high arrays. The function
@@ -65,37 +299,12 @@ def rebin_spectrum(df: pd.DataFrame, energy_low: Iterable, energy_high: Iterable
     df_to = pd.DataFrame(
         {'energy low [eV]': energy_low, 'energy high [eV]': energy_high})
 
-    # Prepare arrays to store the rebinned mean and std. dev.
-    rebinned_probs = np.zeros(len(df_to))
-    rebinned_std_devs = np.zeros(len(df_to))
-
-    for i in range(len(df_to)):
-        bin_low = df_to['energy low [eV]'].iloc[i]
-        bin_high = df_to['energy high [eV]'].iloc[i]
-
-        # Find overlapping bins
-        mask = (df['energy high [eV]'] > bin_low) & (
-            df['energy low [eV]'] < bin_high)
-
-        if mask.any():
-            # Calculate overlapping range for each bin
-            overlaps = df[mask].copy()
-            overlaps['overlap_low'] = np.maximum(
-                overlaps['energy low [eV]'], bin_low)
-            overlaps['overlap_high'] = np.minimum(
-                overlaps['energy high [eV]'], bin_high)
-            overlaps['overlap_width'] = overlaps['overlap_high'] - \
-                overlaps['overlap_low']
-
-            # Calculate the weighted mean and std. dev. for the new bin
-            weighted_probs = overlaps['mean'] * overlaps['overlap_width']
-            rebinned_probs[i] = weighted_probs.sum() / (bin_high - bin_low)
-
-            # Calculate the weighted std. dev. for the new bin
-            weighted_vars = (overlaps['std. dev.']**2) * \
-                (overlaps['overlap_width']**2)
-            rebinned_std_devs[i] = np.sqrt(
-                weighted_vars.sum()) / (bin_high - bin_low)
+    # Sort the source bins, the overlap search relies on sorted edges
+    df = df.sort_values('energy low [eV]')
+
+    rebinned_probs, rebinned_std_devs = rebin_arrays(
+        df['energy low [eV]'], df['energy high [eV]'], df['mean'],
+        df['std. dev.'], energy_low, energy_high)
 
     # Create a new DataFrame with the rebinned mean and std. dev.
     df_rebinned = df_to.copy()
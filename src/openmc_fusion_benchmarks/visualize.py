@@ -4,6 +4,9 @@ import numpy as np
 import pandas as pd
 from typing import Iterable
 import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import matplotlib
 import matplotlib.axes
 import matplotlib.pyplot as plt
 from abc import ABC
@@ -72,7 +75,8 @@ def add_floor_ceiling(ax: matplotlib.axes, values: Iterable, scale: str = 'lin',
 
 
 def plot_stddev_area(ax: matplotlib.axes, ticks: Iterable, mean: Iterable, std_dev: Iterable,
-                     color: str = 'k', alpha: float = .1, uncertainty_deg: int = 3):
+                     color: str = 'k', alpha: float = .1, uncertainty_deg: int = 3,
+                     rasterized: bool = False):
     """This function the standard deviations of a set of data as shaded areas to a plot that has to
     already exist. it is possible to chose whether to plot 1, 2 or 3 times the standard deviations.
     It is based on the matplitlib.axes.fill_between() function.
@@ -93,6 +97,8 @@ def plot_stddev_area(ax: matplotlib.axes, ticks: Iterable, mean: Iterable, std_d
         std dev. areas' transparency degree according to matplotlib, by default .1
     uncertainty_deg : int, optional
         Integer that can be 1, 2 or 3. Describes how many std. dev. to plot, by default 3
+    rasterized : bool, optional
+        draws the areas as bitmaps in vector outputs, by default False
 
     Raises
     ------
@@ -106,13 +112,56 @@ def plot_stddev_area(ax: matplotlib.axes, ticks: Iterable, mean: Iterable, std_d
 
     # fill between for generating the shaded areas
     ax.fill_between(ticks, mean - std_dev, mean +
-                    std_dev, color=color, alpha=alpha)
+                    std_dev, color=color, alpha=alpha, rasterized=rasterized)
     if uncertainty_deg > 1:
         ax.fill_between(ticks, mean - 2*std_dev, mean + 2 *
-                        std_dev, color=color, alpha=alpha)
+                        std_dev, color=color, alpha=alpha, rasterized=rasterized)
     if uncertainty_deg == 3:
         ax.fill_between(ticks, mean + 3*std_dev, mean - 3 *
-                        std_dev, color=color, alpha=alpha)
+                        std_dev, color=color, alpha=alpha, rasterized=rasterized)
+
+
+def downsample_indices(x: Iterable, values: Iterable, n_columns: int, scale: str = 'lin'):
+    """This function selects the points of one or more curves sharing the same
+    sorted x values to keep when drawing them on n_columns pixel columns. In
+    each column it keeps the first and last points and the points with the
+    min and max of each curve, so that the downsampled curves cover the same
+    pixels as the original ones, peaks included.
+
+    Parameters
+    ----------
+    x : Iterable
+        x values of the curves, sorted in increasing order
+    values : Iterable
+        iterable of arrays of the y values of the curves
+    n_columns : int
+        number of pixel columns spanned by the x values
+    scale : str, optional
+        can be "lin" or "log", scale of the x-axis, by default 'lin'
+
+    Returns
+    -------
+    np.ndarray
+        sorted indices of the points to keep
+    """
+    x = np.asarray(x, dtype=float)
+    if scale == 'log' and np.any(x > 0):
+        x = np.log10(np.clip(x, x[x > 0].min(), None))
+    span = x[-1] - x[0] if len(x) else 0.
+    if len(x) <= 4 * n_columns or not span > 0 or np.any(np.diff(x) < 0):
+        return np.arange(len(x))
+
+    column = np.minimum(((x - x[0]) / span * n_columns).astype(int), n_columns - 1)
+    first = np.flatnonzero(np.diff(column, prepend=-1))
+    keep = [first, np.append(first[1:] - 1, len(x) - 1)]
+    for y in values:
+        y = np.asarray(y, dtype=float)
+        for key in (y, -y):
+            # sorted by column the points of each column start at first
+            key = np.where(np.isnan(key), np.inf, key)
+            keep.append(np.lexsort((key, column))[first])
+
+    return np.unique(np.concatenate(keep))
 
 
 class PlotResults(ABC):
@@ -151,6 +200,60 @@ class PlotResults(ABC):
         self._ylabel = ylabel
         self._dtype_label = dtype_label
 
+    def _set_labels(self):
+        """Sets the texts of the axes labels and annotations that depend on
+        the xaxis, ylabel and dtype_label arguments."""
+        pass
+
+    def _save_template(self):
+        # state of the styled axes before any result is added, see reset()
+        self._template = []
+        for ax in self.fig.axes:
+            self._template.append((ax, set(ax.get_children()), ax.get_position(original=True),
+                                   ax.get_xlim(), ax.get_ylim(),
+                                   ax.get_autoscalex_on(), ax.get_autoscaley_on(),
+                                   ax.xaxis.get_major_locator(), ax.xaxis.get_major_formatter()))
+
+    def reset(self, xaxis: str = None, ylabel: str = None, dtype_label: str = None):
+        """Removes all the results from the plot and restores the axes as
+        they were styled by the constructor, so that the same figure can be
+        reused for another plot without creating and styling a new one.
+
+        Parameters
+        ----------
+        xaxis : str, optional
+            New name of the x-axis column, by default None (unchanged)
+        ylabel : str, optional
+            New name for the plot y-label, by default None (unchanged)
+        dtype_label : str, optional
+            New overall name to identify the plot, by default None (unchanged)
+        """
+        for ax, artists, position, xlim, ylim, autoscalex, autoscaley, locator, formatter \
+                in self._template:
+            for container in list(ax.containers):
+                container.remove()
+            for artist in ax.get_children():
+                if artist not in artists:
+                    artist.remove()
+            ax.xaxis.set_major_locator(locator)
+            ax.xaxis.set_major_formatter(formatter)
+            ax.set_xlim(xlim)
+            ax.set_ylim(ylim)
+            ax.set_autoscalex_on(autoscalex)
+            ax.set_autoscaley_on(autoscaley)
+            ax.relim()
+            # constrained layout starts from the current positions
+            ax.set_position(position)
+            ax.set_in_layout(True)
+
+        for name in ['reference_data', 'computed_data']:
+            self.__dict__.pop(name, None)
+
+        self._xaxis = self._xaxis if xaxis is None else xaxis
+        self._ylabel = self._ylabel if ylabel is None else ylabel
+        self._dtype_label = self._dtype_label if dtype_label is None else dtype_label
+        self._set_labels()
+
     def add_reference_results(self, reference_data: pd.DataFrame):
         """Method to add the reference results to the plot. Most likely the
         experimental results. It also sets the reference tickers for the plot
@@ -212,17 +315,23 @@ class PlotReactionRates(PlotResults):
         self.fig, self.ax = plt.subplots(nrows=2, ncols=1, figsize=figsize,
                                          gridspec_kw={'height_ratios': height_ratios}, constrained_layout=True)
         self.ax[0].set_yscale('log')
-        self.ax[0].set_ylabel(self._ylabel, fontsize=12)
         self.ax[0].tick_params(axis='x', labelbottom=False)
         self.ax[0].tick_params(axis='both', which='both', direction='in')
 
-        self.ax[1].annotate(self._dtype_label, [0.02, 0.07], xycoords='axes fraction',
-                            horizontalalignment='left', verticalalignment='bottom', fontsize=12)
-        self.ax[1].set_xlabel(self._xaxis, fontsize=12)
+        self._annotation = self.ax[1].annotate('', [0.02, 0.07], xycoords='axes fraction',
+                                               horizontalalignment='left', verticalalignment='bottom', fontsize=12)
         self.ax[1].set_ylabel('C/E', fontsize=12)
         self.ax[1].tick_params(axis='x', labelrotation=45)
         self.ax[1].tick_params(axis='both', which='both', direction='in')
 
+        self._set_labels()
+        self._save_template()
+
+    def _set_labels(self):
+        self.ax[0].set_ylabel(self._ylabel, fontsize=12)
+        self.ax[1].set_xlabel(self._xaxis, fontsize=12)
+        self._annotation.set_text(self._dtype_label)
+
     def add_reference_results(self, reference_data, marker: str = 's', color: str = 'k', alpha: float = 1., label=''):
         """Method to add the reference results to a reaction rate plot.
         Alongside the reference_data argument, inherited by the PlotResults
@@ -290,8 +399,25 @@ class PlotEnergySpectra(PlotResults):
     PlotResults.
     """
 
-    def __init__(self, xaxis: str, figsize=(12, 6), height_ratios=[2, 1.25], ylabel: str = '', dtype_label: str = ''):
+    def __init__(self, xaxis: str, figsize=(12, 6), height_ratios=[2, 1.25], ylabel: str = '', dtype_label: str = '',
+                 compact: bool = False, dpi: int = 300):
+        """Constructor of the PlotEnergySpectra class, see PlotResults for
+        the other arguments.
+
+        Parameters
+        ----------
+        compact : bool, optional
+            If True, the std. dev. areas are rasterized and the steps are
+            downsampled to the pixel columns of the axes at the given dpi,
+            keeping the min and max of each column. Large spectra are then
+            saved in small vector files that render fast, by default False
+        dpi : int, optional
+            Resolution at which the steps are downsampled in compact mode,
+            should match the dpi of savefig, by default 300
+        """
         super().__init__(xaxis, figsize, height_ratios, ylabel, dtype_label)
+        self._compact = compact
+        self._dpi = dpi
 
         self.fig, self.ax = plt.subplots(nrows=2, ncols=2, figsize=figsize,
                                          gridspec_kw={'height_ratios': height_ratios}, constrained_layout=True)
@@ -308,7 +434,6 @@ class PlotEnergySpectra(PlotResults):
                 self.ax[i, j].tick_params(
                     axis='both', which='both', direction='in', labelsize=12)
 
-        self.ax[0, 0].set_ylabel(self._ylabel, fontsize=12)
         self.ax[1, 0].set_ylabel('C/E', fontsize=12)
 
         self.ax[1, 0].annotate("Log scale on x", [0.02, 0.07], xycoords='axes fraction',
@@ -316,6 +441,22 @@ class PlotEnergySpectra(PlotResults):
         self.ax[1, 1].annotate("Lin scale on x", [0.02, 0.07], xycoords='axes fraction',
                                horizontalalignment='left', verticalalignment='bottom', fontsize=12)
 
+        self._set_labels()
+        self._save_template()
+
+    def _set_labels(self):
+        self.ax[0, 0].set_ylabel(self._ylabel, fontsize=12)
+
+    def _downsample(self, column: int, x: Iterable, *values: Iterable) -> list:
+        # x and values to draw on the left (log) or right (lin) axes
+        arrays = [np.asarray(a) for a in (x, *values)]
+        if not self._compact:
+            return arrays
+        ax = self.ax[0, column]
+        n_columns = math.ceil(ax.get_position().width * self.fig.get_figwidth() * self._dpi)
+        keep = downsample_indices(arrays[0], arrays[1:], n_columns, ax.get_xscale()[:3])
+        return [a[keep] for a in arrays]
+
     def add_reference_results(self, reference_data, ls: str = '-', color: str = 'k', alpha: float = 1., label=''):
         """Method to add the reference results to an energy spectra plot.
         Alongside the reference_data argument, inherited by the PlotResults
@@ -340,13 +481,18 @@ class PlotEnergySpectra(PlotResults):
         max_oom = math.floor(math.log(max_ebound, 10))
 
         for i in range(2):
-            self.ax[0, i].step(reference_data['energy low [eV]'],
-                               reference_data['mean'], ls=ls, lw=1.5, c=color, alpha=alpha, label=label)
-            self.ax[0, i].fill_between(reference_data['energy low [eV]'], reference_data['mean'] - reference_data['std. dev.'], reference_data['mean'] +
-                                       reference_data['std. dev.'], step='pre', color='k', alpha=.2*alpha)
-
-            plot_stddev_area(ax=self.ax[1, i], ticks=reference_data['energy high [eV]'], mean=np.ones(len(
-                reference_data['mean'])), std_dev=reference_data['std. dev.']/reference_data['mean'])
+            energy, mean, lower, upper = self._downsample(
+                i, reference_data['energy low [eV]'], reference_data['mean'],
+                reference_data['mean'] - reference_data['std. dev.'],
+                reference_data['mean'] + reference_data['std. dev.'])
+            self.ax[0, i].step(energy, mean, ls=ls, lw=1.5, c=color, alpha=alpha, label=label)
+            self.ax[0, i].fill_between(energy, lower, upper, step='pre', color='k', alpha=.2*alpha,
+                                       rasterized=self._compact)
+
+            energy, rstd = self._downsample(i, reference_data['energy high [eV]'],
+                                            reference_data['std. dev.']/reference_data['mean'])
+            plot_stddev_area(ax=self.ax[1, i], ticks=energy, mean=np.ones(len(energy)), std_dev=rstd,
+                             rasterized=self._compact)
 
             self.ax[1, i].hlines(1.0, 0, np.array(reference_data['energy high [eV]'])[
                                  -1] + 5e6, colors='k', linestyles='-', linewidth=1, label='_')
@@ -366,12 +512,154 @@ class PlotEnergySpectra(PlotResults):
         super().add_computed_results(computed_data)
 
         for i in range(2):
-            self.ax[0, i].step(computed_data['energy low [eV]'],
-                               computed_data['mean'], ls=ls, lw=1.5, c=color, alpha=alpha, label=label)
-            self.ax[0, i].fill_between(computed_data['energy low [eV]'], computed_data['mean'] - computed_data['std. dev.'], computed_data['mean'] +
-                                       computed_data['std. dev.'], step='pre', color=color, alpha=.2*alpha)
+            energy, mean, lower, upper, ce = self._downsample(
+                i, computed_data['energy low [eV]'], computed_data['mean'],
+                computed_data['mean'] - computed_data['std. dev.'],
+                computed_data['mean'] + computed_data['std. dev.'], self.ce)
+            self.ax[0, i].step(energy, mean, ls=ls, lw=1.5, c=color, alpha=alpha, label=label)
+            self.ax[0, i].fill_between(energy, lower, upper, step='pre', color=color, alpha=.2*alpha,
+                                       rasterized=self._compact)
 
-            self.ax[1, i].step(computed_data['energy low [eV]'],
-                               self.ce, lw=1.5, c=color, alpha=alpha, label='_')
+            self.ax[1, i].step(energy, ce, lw=1.5, c=color, alpha=alpha, label='_')
 
         self.ax[0, 0].legend(frameon=True, fontsize=12)
+
+
+class PlotJob:
+    """Description of a plot to be rendered in batch by render_plots. It
+    collects the same arguments as the plotting classes, without creating
+    any figure:
+
+    >>> job = PlotJob(PlotEnergySpectra, 'spectrum.png', xaxis=xaxis, ylabel=ylabel)
+    >>> job.add_reference_results(reference_data=measured, label='Experiment')
+    >>> job.add_computed_results(computed_data=computed, color='tab:red', label='openmc')
+    """
+
+    def __init__(self, plot_class: type, path: str, xaxis: str, ylabel: str = '',
+                 dtype_label: str = '', figsize: Iterable = None,
+                 height_ratios: Iterable = None, dpi: int = 300, **kwargs):
+        """PlotJob class constructor
+
+        Parameters
+        ----------
+        plot_class : type
+            PlotResults subclass, e.g. PlotReactionRates or PlotEnergySpectra
+        path : str
+            Path to save the plot, including the filename and extension
+        xaxis : str
+            Name of the result dataframe column meant to be the values of the
+            x-axis of the plot
+        ylabel : str, optional
+            Name for the plot y-label, by default ''
+        dtype_label : str, optional
+            Overall name to identify the plot, by default ''
+        figsize : Iterable[float, float], optional
+            Size of the figure, by default None (default of plot_class)
+        height_ratios : Iterable[float, float], optional
+            Ratios of the heights of the subfigures, by default None (default
+            of plot_class)
+        dpi : int, optional
+            Quality of the image to save, by default 300
+        **kwargs
+            other arguments of plot_class, e.g. compact for PlotEnergySpectra
+        """
+        self.plot_class = plot_class
+        self.path = path
+        self.xaxis = xaxis
+        self.ylabel = ylabel
+        self.dtype_label = dtype_label
+        self.figsize = figsize
+        self.height_ratios = height_ratios
+        self.dpi = dpi
+        self.kwargs = kwargs
+        self.reference = None
+        self.computed = []
+
+    def add_reference_results(self, reference_data: pd.DataFrame, **kwargs):
+        """Sets the reference results of the plot, see the
+        add_reference_results method of plot_class for the keyword arguments
+        """
+        self.reference = (reference_data, kwargs)
+
+    def add_computed_results(self, computed_data: pd.DataFrame, **kwargs):
+        """Adds computed results to the plot, see the add_computed_results
+        method of plot_class for the keyword arguments
+        """
+        self.computed.append((computed_data, kwargs))
+
+    def render(self, templates: dict = None) -> str:
+        """Draws the plot and saves it to path. If a dict of templates is
+        given, the figure of a previous plot with the same class and layout
+        is reset and reused instead of creating and styling a new one.
+
+        Parameters
+        ----------
+        templates : dict, optional
+            Figures available for reuse, updated with the figure of this plot,
+            by default None
+
+        Returns
+        -------
+        str
+            path of the saved plot
+        """
+        layout = {k: v for k, v in [('figsize', self.figsize),
+                                    ('height_ratios', self.height_ratios)] if v is not None}
+        layout.update(self.kwargs)
+        key = (self.plot_class, repr(sorted(layout.items())))
+
+        if templates is not None and key in templates:
+            plot = templates[key]
+            plot.reset(self.xaxis, self.ylabel, self.dtype_label)
+        else:
+            plot = self.plot_class(self.xaxis, ylabel=self.ylabel,
+                                   dtype_label=self.dtype_label, **layout)
+            if templates is not None:
+                templates[key] = plot
+
+        if self.reference is not None:
+            plot.add_reference_results(self.reference[0], **self.reference[1])
+        for computed_data, kwargs in self.computed:
+            plot.add_computed_results(computed_data, **kwargs)
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        plot.savefig(self.path, dpi=self.dpi)
+        if templates is None:
+            plt.close(plot.fig)
+        return str(self.path)
+
+
+# figures of the worker process, reused by the following jobs
+_templates = {}
+
+
+def _init_worker():
+    matplotlib.use('Agg', force=True)
+    _templates.clear()
+
+
+def _render(job: PlotJob) -> str:
+    return job.render(_templates)
+
+
+def render_plots(jobs: Iterable, max_workers: int = None) -> list:
+    """Renders many plots with a pool of processes using the non-interactive
+    Agg backend. Each process keeps one styled figure per plot class and
+    layout and reuses it for all its plots, and saves each plot as soon as
+    it is drawn.
+
+    Parameters
+    ----------
+    jobs : Iterable[PlotJob]
+        plots to render
+    max_workers : int, optional
+        number of processes, by default None (number of processors)
+
+    Returns
+    -------
+    list
+        paths of the saved plots, in order of completion
+    """
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(_render, job) for job in jobs]
+        return [future.result() for future in as_completed(futures)]
@@ -0,0 +1,167 @@
+"""Cache of the weight windows of the benchmarks in binary HDF5 files"""
+import importlib.resources
+import os
+import threading
+import h5py
+import numpy as np
+import openmc
+from pathlib import Path
+
+from .cache import get_cache_dir
+from .download import file_checksum
+
+# wwinp files shipped with the package, in a folder per benchmark
+WEIGHT_WINDOWS_PATH = importlib.resources.files(
+    "openmc_fusion_benchmarks.data.weight_windows")
+
+# array attributes defining each type of mesh found in weight windows
+_mesh_attributes = {
+    'RegularMesh': ('lower_left', 'upper_right', 'dimension'),
+    'RectilinearMesh': ('x_grid', 'y_grid', 'z_grid'),
+    'CylindricalMesh': ('r_grid', 'phi_grid', 'z_grid', 'origin'),
+    'SphericalMesh': ('r_grid', 'theta_grid', 'phi_grid', 'origin'),
+}
+_ww_arrays = ('lower_ww_bounds', 'upper_ww_bounds', 'energy_bounds')
+_ww_attributes = ('particle_type', 'survival_ratio', 'max_lower_bound_ratio', 'max_split',
+                  'weight_cutoff')
+_format_version = 1
+
+# weight windows read from the cache, keyed by checksum of the wwinp file,
+# and checksums of the wwinp files keyed by (path, mtime, size)
+_data = {}
+_checksums = {}
+_lock = threading.Lock()
+
+
+def write_weight_windows(weight_windows: list, path: str):
+    """Writes weight windows to a compressed HDF5 file
+
+    Parameters
+    ----------
+    weight_windows : list
+        openmc.WeightWindows objects
+    path : str
+        path to the HDF5 file
+    """
+    with h5py.File(path, 'w') as f:
+        f.attrs['format_version'] = _format_version
+        for i, ww in enumerate(weight_windows):
+            group = f.create_group(f'weight_windows/{i}')
+            for name in _ww_arrays:
+                value = getattr(ww, name)
+                if value is not None:
+                    group.create_dataset(name, data=np.asarray(value, dtype=float),
+                                         compression='gzip', shuffle=True)
+            for name in _ww_attributes:
+                value = getattr(ww, name)
+                if value is not None:
+                    group.attrs[name] = value
+
+            mesh_type = type(ww.mesh).__name__
+            if mesh_type not in _mesh_attributes:
+                raise ValueError(f'Weight windows on a {mesh_type} are not supported')
+            mesh = group.create_group('mesh')
+            mesh.attrs['type'] = mesh_type
+            for name in _mesh_attributes[mesh_type]:
+                mesh.create_dataset(name, data=np.asarray(getattr(ww.mesh, name)))
+
+
+def _read(path: Path) -> list:
+    # plain arrays and attributes of each weight windows
+    specs = []
+    with h5py.File(path, 'r') as f:
+        for i in range(len(f['weight_windows'])):
+            group = f[f'weight_windows/{i}']
+            spec = {name: group[name][()] for name in _ww_arrays if name in group}
+            spec.update({name: group.attrs[name] for name in _ww_attributes
+                         if name in group.attrs})
+            spec['particle_type'] = str(spec['particle_type'])
+            spec['mesh'] = (str(group['mesh'].attrs['type']),
+                            {name: group[f'mesh/{name}'][()]
+                             for name in _mesh_attributes[group['mesh'].attrs['type']]})
+            for value in spec.values():
+                if isinstance(value, np.ndarray):
+                    value.flags.writeable = False
+            specs.append(spec)
+    return specs
+
+
+def _build(specs: list) -> list:
+    weight_windows = []
+    for spec in specs:
+        mesh_type, arrays = spec['mesh']
+        arrays = {name: value.copy() for name, value in arrays.items()}
+        try:
+            mesh = getattr(openmc, mesh_type)(**arrays)
+        except TypeError:
+            # meshes whose constructor does not take the grids
+            mesh = getattr(openmc, mesh_type)()
+            for name, value in arrays.items():
+                setattr(mesh, name, value)
+
+        kwargs = {name: value.copy() if isinstance(value, np.ndarray) else value
+                  for name, value in spec.items() if name != 'mesh'}
+        weight_windows.append(openmc.WeightWindows(mesh, **kwargs))
+    return weight_windows
+
+
+def read_weight_windows(path: str) -> list:
+    """Reads weight windows written by write_weight_windows
+
+    Parameters
+    ----------
+    path : str
+        path to the HDF5 file
+
+    Returns
+    -------
+    list
+        openmc.WeightWindows objects
+    """
+    return _build(_read(Path(path)))
+
+
+def _checksum(path: Path) -> str:
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if key not in _checksums:
+        _checksums[key] = file_checksum(path)
+    return _checksums[key]
+
+
+def load_weight_windows(wwinp: str, cache_dir: str = None) -> list:
+    """Returns the weight windows of a wwinp file. The text file is only
+    parsed the first time, with openmc.wwinp_to_wws, and stored as a binary
+    HDF5 file named after the sha256 of the wwinp file in the weight_windows
+    cache folder. Later calls read the HDF5 file, once per process.
+
+    Parameters
+    ----------
+    wwinp : str
+        path to the wwinp file
+    cache_dir : str, optional
+        folder of the HDF5 files, by default the weight_windows subfolder
+        of the package cache folder (see get_cache_dir)
+
+    Returns
+    -------
+    list
+        openmc.WeightWindows objects. New objects are returned at every call
+        so they can be modified safely
+    """
+    wwinp = Path(wwinp)
+    with _lock:
+        checksum = _checksum(wwinp)
+        if checksum not in _data:
+            folder = Path(cache_dir) if cache_dir is not None else get_cache_dir('weight_windows')
+            compiled = folder / f'{checksum}.h5'
+            if not compiled.exists():
+                folder.mkdir(parents=True, exist_ok=True)
+                # atomic replace so that concurrent runs never read a partial file
+                tmp = compiled.with_name(f'{compiled.name}.{os.getpid()}.tmp')
+                write_weight_windows(openmc.wwinp_to_wws(str(wwinp)), tmp)
+                os.replace(tmp, compiled)
+            _data[checksum] = _read(compiled)
+        specs = _data[checksum]
+
+    return _build(specs)
@@ -1,3 +1,7 @@
+import sys
+import types
+from pathlib import Path
+import numpy as np
 import pytest
 import openmc
 import openmc_fusion_benchmarks as ofb
@@ -18,3 +22,141 @@ def test_benchmark_init():
 #     assert hasattr(model, 'tallies')
 #     assert hasattr(model, 'run')
 #     assert callable(model.run)
+
+
+def test_registered_benchmark_model(monkeypatch):
+    module = types.ModuleType('dummy_benchmark_module')
+    calls = []
+
+    def model(geometry_type, run_option, batches=10, particles=100):
+        calls.append((geometry_type, run_option, batches, particles))
+        return {'cells': [[run_option, batches, particles]]}
+
+    module.model = model
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.setattr(ofb.benchmark, '_registry', {})
+    monkeypatch.setattr(ofb.benchmark, '_models', {})
+
+    @ofb.register_benchmark('dummy')
+    class Dummy(ofb.Benchmark):
+        module = 'dummy_benchmark_module'
+
+        def __init__(self, run_option='a'):
+            super().__init__('dummy')
+            self.run_option = run_option
+
+    benchmark = ofb.BenchmarkDatabase.get_benchmark('dummy', run_option='b')
+    assert isinstance(benchmark, Dummy)
+    assert 'dummy' in ofb.BenchmarkDatabase.list_benchmarks()
+
+    first = benchmark.get_model('csg', batches=5)
+    first['cells'][0][0] = 'modified'
+    second = benchmark.get_model('csg', batches=5)
+    assert second == {'cells': [['b', 5, 100]]}
+    assert len(calls) == 1
+
+    benchmark.get_model('csg', batches=6)
+    assert len(calls) == 2
+
+
+def test_model_xml_cache(tmp_path, monkeypatch):
+    source = tmp_path / 'xml_benchmark_module.py'
+    source.write_text(
+        "exports = []\n\n\n"
+        "class Model:\n"
+        "    def __init__(self, batches):\n"
+        "        self.batches = batches\n\n"
+        "    def export_to_model_xml(self, path):\n"
+        "        exports.append(path)\n"
+        "        open(path, 'w').write(f'<model batches=\"{self.batches}\"/>')\n\n\n"
+        "def model(geometry_type, batches=10):\n"
+        "    return Model(batches)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(openmc, '__version__', '0.14.0', raising=False)
+    monkeypatch.setattr(ofb.benchmark, '_models', {})
+    import xml_benchmark_module
+
+    benchmark = ofb.Benchmark('xml')
+    benchmark.module = 'xml_benchmark_module'
+    cache = tmp_path / 'models'
+
+    path = benchmark.get_model_xml('csg', batches=5, cache_dir=cache)
+    assert path.read_text() == '<model batches="5"/>'
+    assert benchmark.get_model_xml('csg', batches=5, cache_dir=cache) == path
+    assert len(xml_benchmark_module.exports) == 1
+
+    assert benchmark.get_model_xml('csg', batches=6, cache_dir=cache) != path
+    # editing the benchmark module invalidates the cached files
+    source.write_text(source.read_text() + '\n')
+    assert benchmark.get_model_xml('csg', batches=5, cache_dir=cache) != path
+    path = benchmark.get_model_xml('csg', batches=5, cache_dir=cache)
+    # so does editing the modules of the package it calls
+    monkeypatch.setattr(ofb.benchmark, '_package_checksum', lambda: 'edited')
+    assert benchmark.get_model_xml('csg', batches=5, cache_dir=cache) != path
+
+
+class _GenerationModel:
+    """Stand-in for an openmc model recording the settings of each run"""
+
+    def __init__(self, runs):
+        self.settings = openmc.Settings()
+        self.runs = runs
+
+    def run(self, cwd, threads=None):
+        settings = self.settings
+        self.runs.append({'folder': Path(cwd).name,
+                          'generators': list(settings.weight_window_generators),
+                          'weight_windows': list(settings.weight_windows),
+                          'weight_windows_on': settings.weight_windows_on})
+        Path(cwd).mkdir(parents=True, exist_ok=True)
+        statepoint = Path(cwd) / 'statepoint.10.h5'
+        statepoint.write_text(Path(cwd).name)
+        return statepoint
+
+
+def test_generate_weight_windows(tmp_path, monkeypatch):
+    runs = []
+    mesh = openmc.RegularMesh()
+    mesh.lower_left, mesh.upper_right, mesh.dimension = (-1, -1, -1), (1, 1, 1), (2, 2, 2)
+
+    def hdf5_to_wws(path):
+        # weight windows written by the generator, on a new mesh with the same id
+        loaded = openmc.RegularMesh(mesh_id=mesh.id)
+        loaded.lower_left, loaded.upper_right, loaded.dimension = \
+            mesh.lower_left, mesh.upper_right, mesh.dimension
+        return [openmc.WeightWindows(loaded, np.full((2, 2, 2, 1), .5), upper_bound_ratio=5.,
+                                     energy_bounds=(0., 20e6))]
+
+    monkeypatch.setattr(openmc, 'hdf5_to_wws', hdf5_to_wws)
+    monkeypatch.setattr(ofb.benchmark, 'compare_figures_of_merit',
+                        lambda reference, statepoint: (reference, statepoint))
+    (tmp_path / 'generation_benchmark_module.py').write_text('')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    benchmark = ofb.Benchmark('generation')
+    benchmark.module = 'generation_benchmark_module'
+    monkeypatch.setattr(benchmark, 'get_model', lambda *args: _GenerationModel(runs))
+
+    statepoint, (reference, final) = benchmark.run_with_weight_windows(
+        cwd=tmp_path / 'run', mesh=mesh, iterations=2, cache_dir=tmp_path / 'cache')
+
+    assert [run['folder'] for run in runs] == ['analog', 'iteration_0', 'iteration_1', 'run']
+    # the reference run is analog
+    analog = runs[0]
+    assert not analog['generators'] and not analog['weight_windows']
+    assert not analog['weight_windows_on']
+    assert reference.read_text() == 'analog'
+    # the first iteration generates the weight windows on the fly
+    assert runs[1]['generators'][0].on_the_fly and not runs[1]['weight_windows']
+    # the next one applies them and generates new ones on the same mesh
+    generator, = runs[2]['generators']
+    weight_windows, = runs[2]['weight_windows']
+    assert not generator.on_the_fly and runs[2]['weight_windows_on']
+    assert generator.mesh is weight_windows.mesh
+    # the benchmark runs with the final weight windows
+    assert not runs[3]['generators'] and len(runs[3]['weight_windows']) == 1
+    assert final == statepoint == tmp_path / 'run' / 'statepoint.10.h5'
+
+    # the generated weight windows are cached
+    benchmark.generate_weight_windows(mesh=mesh, iterations=2, cache_dir=tmp_path / 'cache',
+                                      cwd=tmp_path / 'run' / 'weight_windows_generation')
+    assert len(runs) == 4
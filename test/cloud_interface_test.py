@@ -0,0 +1,135 @@
+import hashlib
+import http.server
+import threading
+import pytest
+from pathlib import Path
+import openmc_fusion_benchmarks as ofb
+
+
+@pytest.fixture
+def file_server(tmp_path):
+    """Local stand-in for the remote storage, it counts the downloads"""
+    downloads = []
+
+    def fetch(url, folder):
+        downloads.append(url)
+        file = Path(folder) / 'fng_str.h5m'
+        file.write_bytes(url[-40:].encode())
+        return file
+
+    return fetch, downloads
+
+
+def test_geometry_cache(tmp_path, file_server):
+    fetch, downloads = file_server
+    cache = ofb.GeometryCache(tmp_path / 'cache', fetch=fetch)
+
+    first = cache.materialize('fng_str', 'h5m', 'onaxis', cwd=tmp_path / 'run1')
+    second = cache.materialize('fng_str', 'h5m', 'onaxis', cwd=tmp_path / 'run2')
+
+    assert first.name == second.name == 'fng_str.h5m'
+    assert second.read_bytes() == first.read_bytes()
+    assert len(downloads) == 1
+
+    # corrupted files are fetched again
+    content = first.read_bytes()
+    cache.get('fng_str', 'h5m', 'onaxis').write_bytes(b'corrupted')
+    assert cache.get('fng_str', 'h5m', 'onaxis').read_bytes() == content
+    assert len(downloads) == 2
+
+
+def test_geometry_cache_eviction(tmp_path, file_server):
+    fetch, downloads = file_server
+    cache = ofb.GeometryCache(tmp_path / 'cache', max_size=100, fetch=fetch)
+
+    onaxis = cache.get('fng_str', 'h5m', 'onaxis')
+    cache.get('fng_str', 'h5m', 'offaxis')
+    assert onaxis.exists()
+    # the least recently used file is evicted to make room
+    cache.get('fng_str', 'h5m', 'heating')
+    assert not onaxis.exists()
+    assert len(downloads) == 3
+
+
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serves a file with range requests, dropping the first connections"""
+
+    content = bytes(range(256)) * 400
+
+    @classmethod
+    def body_of(cls, path):
+        # every URL serves a different file, all with the same name
+        return path.encode() + cls.content
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get('Range'))
+        content = self.body_of(self.path)
+        start = 0
+        if self.headers.get('Range'):
+            start = int(self.headers['Range'].split('=')[1].split('-')[0])
+            self.send_response(206)
+            self.send_header('Content-Range',
+                             f'bytes {start}-{len(content) - 1}/{len(content)}')
+        else:
+            self.send_response(200)
+        body = content[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Content-Disposition', 'attachment; filename="fng_str.h5m"')
+        self.end_headers()
+        if self.server.drops > 0:
+            self.server.drops -= 1
+            body = body[:len(body) // 2]
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _RangeHandler)
+    server.requests, server.drops = [], 2
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_manager_resume(tmp_path, http_server):
+    url = f'http://127.0.0.1:{http_server.server_port}/file'
+    content = _RangeHandler.body_of('/file')
+    manager = ofb.DownloadManager(ofb.HTTPBackend(), backoff=0)
+
+    file = manager.fetch(url, tmp_path, checksum=hashlib.sha256(content).hexdigest())
+
+    assert file == tmp_path / 'fng_str.h5m'
+    assert file.read_bytes() == content
+    assert not list(tmp_path.glob('*.part'))
+    # the dropped downloads were resumed instead of restarted
+    assert http_server.requests[0] is None
+    assert all(r is not None for r in http_server.requests[1:])
+    assert len(http_server.requests) == 3
+
+    with pytest.raises(ValueError):
+        manager.fetch(url, tmp_path / 'bad', checksum='0' * 64)
+    assert not list((tmp_path / 'bad').glob('*'))
+
+
+def test_download_manager_concurrent(tmp_path, http_server):
+    http_server.drops = 0
+    urls = [f'http://127.0.0.1:{http_server.server_port}/{i}' for i in range(4)]
+    manager = ofb.DownloadManager(ofb.HTTPBackend(), max_workers=2)
+
+    # all the URLs report the same file name
+    with pytest.raises(ValueError):
+        manager.fetch_many(urls, tmp_path)
+    assert not (tmp_path / 'fng_str.h5m').exists()
+
+    filenames = [f'fng_str_{i}.h5m' for i in range(4)]
+    files = manager.fetch_many(urls, tmp_path, filenames=filenames)
+
+    assert len(set(files)) == len(urls)
+    assert [f.name for f in files] == filenames
+    assert all(f.read_bytes() == _RangeHandler.body_of(f'/{i}') for i, f in enumerate(files))
+    assert not list(tmp_path.glob('*.part'))
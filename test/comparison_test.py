@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+import pandas as pd
+from openmc_fusion_benchmarks import ResultsDatabase, compute_ce, summarize_ce, \
+    summarize_database, to_hdf
+
+
+def test_compute_ce():
+    reference = pd.DataFrame({'x': [1, 2, 2, 3], 'mean': [1., 2., 4., 0.],
+                              'std. dev.': [.1, .2, .4, .1]})
+    computed = {'a': pd.DataFrame({'x': [2, 2, 1], 'mean': [4., 8., 1.],
+                                   'std. dev.': [0., 0., .1]}),
+                'b': reference.copy()}
+
+    df = compute_ce(reference, computed, xaxis='x')
+    a = df[df['set'] == 'a']
+    # repeated x values are matched in order, missing and null references give NaN
+    np.testing.assert_allclose(a['C/E'], [1., 2., 2., np.nan])
+    np.testing.assert_allclose(a['C/E std. dev.'].iloc[0], np.sqrt(2) * .1)
+
+    summary = summarize_ce(reference, computed, xaxis='x')
+    assert list(summary['n points']) == [3, 3]
+    np.testing.assert_allclose(summary['mean C/E'], [5 / 3, 1.])
+    assert summary['chi2'].iloc[1] == 0.
+
+
+def test_summarize_database(tmp_path):
+    folder = tmp_path / 'fns_duct'
+    folder.mkdir()
+    for filename, value in [('experiment.h5', 1.), ('openmc-0-14-0_fendl32b.h5', 1.1),
+                            ('mcnp-6-2_fendl32b.h5', .9)]:
+        df = pd.DataFrame({'Detector No.': ['1', '2'], 'mean': [value, value],
+                           'std. dev.': [.1, .1]})
+        to_hdf(df, folder / filename, 'rr_nb93', xaxis_name='Detector No.')
+
+    summary = summarize_database(ResultsDatabase(tmp_path)).sort_values('code')
+    assert list(summary['code']) == ['mcnp', 'openmc']
+    np.testing.assert_allclose(summary['mean C/E'], [.9, 1.1])
+
+    # experimental files storing a library are still used as reference
+    to_hdf(pd.DataFrame({'Detector No.': ['1', '2'], 'mean': [1., 1.], 'std. dev.': [.1, .1]}),
+           folder / 'experiment.h5', 'rr_nb93', 'fendl-3.2b', 'Detector No.')
+    summary = summarize_database(ResultsDatabase(tmp_path)).sort_values('code')
+    np.testing.assert_allclose(summary['mean C/E'], [.9, 1.1])
+
+    with pytest.raises(ValueError):
+        summarize_database(ResultsDatabase(tmp_path), code='openmc')
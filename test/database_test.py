@@ -0,0 +1,53 @@
+import shutil
+import pandas as pd
+from pathlib import Path
+from openmc_fusion_benchmarks import ResultsDatabase, to_hdf
+
+RESULTS_DATABASE = Path(__file__).parents[1] / 'results_database'
+
+
+def _write(folder, filename, tally_name, value, **kwargs):
+    df = pd.DataFrame({'Detector No.': ['1', '2'], 'mean': [value, value],
+                       'std. dev.': [.1, .1]})
+    folder.mkdir(exist_ok=True)
+    to_hdf(df, folder / filename, tally_name, xaxis_name='Detector No.', **kwargs)
+
+
+def test_results_database(tmp_path):
+    _write(tmp_path / 'fns_duct', 'experiment.h5', 'rr_nb93', 1.)
+    _write(tmp_path / 'fns_duct', 'openmc-0-14-0_fendl32b.h5', 'rr_nb93', 2.,
+           xs_library='FENDL-3.2b', format='columnar')
+    _write(tmp_path / 'fns_duct', 'openmc-0-15-0_endfb80.h5', 'rr_nb93', 3.,
+           xs_library='ENDF/B-8.0')
+    _write(tmp_path / 'fng_w', 'openmc-0-14-0_fendl32b.h5', 'rr_au197', 4.,
+           xs_library='FENDL-3.2b')
+
+    db = ResultsDatabase(tmp_path)
+    assert len(db.catalog) == 4
+
+    selection = db.select(benchmark='fns_*', version='0.14', library='fendl-3.2b')
+    assert list(selection['code']) == ['experiment', 'openmc']
+
+    df = db.get_dataframe(tally='rr_*', code='openmc', library='fendl-3.2b')
+    assert list(df.columns[:5]) == ['benchmark', 'code', 'version', 'library', 'tally']
+    assert sorted(df['mean'].unique()) == [2., 4.]
+
+    # only the new file is scanned
+    _write(tmp_path / 'fng_w', 'experiment.h5', 'rr_au197', 5.)
+    index = (tmp_path / 'fns_duct' / 'index.json').stat().st_mtime_ns
+    assert len(db.rescan()) == 5
+    assert (tmp_path / 'fns_duct' / 'index.json').stat().st_mtime_ns == index
+
+
+def test_results_database_library_from_filename(tmp_path):
+    # mcnp files carry long descriptive xs_library attributes, the library
+    # key comes from their filename
+    shutil.copytree(RESULTS_DATABASE / 'oktavian_al', tmp_path / 'oktavian_al')
+
+    db = ResultsDatabase(tmp_path)
+    selection = db.select(benchmark='oktavian_*', code='mcnp', library='jendl-4.0')
+    assert list(selection['file'].unique()) == ['mcnp-6-2-17_jendl40.h5']
+    assert selection['xs_library'].iloc[0].startswith('JENDL-4.0')
+
+    selection = db.select(code='openmc', library='FENDL-3.2')
+    assert list(selection['file'].unique()) == ['openmc-0-14-0_fendl32.h5']
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from openmc_fusion_benchmarks.neutron_sources import load_characteristics, \
+    load_characteristics_many, sample_fng_source
+from openmc_fusion_benchmarks.neutron_sources.fng_source.fng_source import _yields, _interpolate
+from openmc_fusion_benchmarks.neutron_sources.fng_source.validation import compare_to_tables, \
+    time_sources, validate_sources
+
+
+def _trapezoid(y, x):
+    # np.trapezoid is not available before numpy 2.0
+    return np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2)
+
+
+def test_load_characteristics():
+    evalues, pbins, fvalues = load_characteristics(260)
+    assert load_characteristics(260)[0] is evalues
+    assert fvalues.shape == (36, len(evalues))
+    assert not fvalues.flags.writeable
+
+
+def test_sample_fng_source():
+    samples = sample_fng_source(200000, center=(1, 2, 3), reference_uvw=(1, 0, 0), seed=1)
+    evalues, pbins, fvalues = load_characteristics(260)
+
+    assert np.allclose(samples['r'], (1, 2, 3))
+    assert np.allclose(np.linalg.norm(samples['u'], axis=1), 1)
+    assert np.all((samples['E'] >= evalues[0]) & (samples['E'] <= evalues[-1]))
+
+    # the polar cosine around reference_uvw falls in the sampled bin
+    mu = samples['u'][:, 0]
+    assert np.all(mu <= pbins[samples['bin']] + 1e-12)
+    assert np.all(mu >= pbins[samples['bin'] + 1] - 1e-12)
+
+    # bin frequencies and mean energy of the largest bin follow the tables
+    counts = np.bincount(samples['bin'], minlength=36) / 200000
+    assert np.allclose(counts, _yields(pbins, fvalues), atol=5e-3)
+    i = np.argmax(counts)
+    energy = samples['E'][samples['bin'] == i]
+    pdf_mean = _trapezoid(evalues * fvalues[i], evalues) / _trapezoid(fvalues[i], evalues)
+    assert abs(energy.mean() - pdf_mean) < 4 * energy.std() / np.sqrt(len(energy))
+
+
+def test_beam_energy_interpolation(tmp_path):
+    evalues, pbins, f230 = load_characteristics(230)
+    f260 = load_characteristics(260)[2]
+    f350 = load_characteristics(350)[2]
+
+    # the tabulated spectra are recovered at the ends of the interval
+    ends = _interpolate(evalues, f230, f350, [0., 1.])
+    assert np.allclose(ends[0], f230, atol=1e-2 * f230.max())
+    assert np.allclose(ends[1], f350, atol=1e-2 * f350.max())
+    # 260 keV is close to its interpolation between 230 and 350 keV
+    assert np.allclose(_interpolate(evalues, f230, f350, [0.25])[0], f260,
+                       atol=5e-2 * f260.max())
+
+    energies = [240, 245.5, 260, 300]
+    fvalues = load_characteristics_many(energies, cache_dir=tmp_path)[2]
+    assert fvalues.shape == (4, 36, len(evalues))
+    assert np.array_equal(fvalues[2], f260)
+    assert len(list(tmp_path.glob('*.npz'))) == 3
+    # the second sweep reads the interpolated tables back
+    assert np.array_equal(load_characteristics_many(energies, cache_dir=tmp_path)[2], fvalues)
+
+    with pytest.raises(ValueError):
+        load_characteristics(400)
+
+
+def test_compare_to_tables():
+    samples = sample_fng_source(200000, seed=2)
+    samples = {'mu': samples['u'][:, 2], 'E': samples['E']}
+
+    df = compare_to_tables(samples)
+    assert list(df['test']) == ['angle', 'energy', 'angle-energy']
+    assert (df['p-value'] > 1e-4).all()
+
+    # a shifted spectrum is rejected
+    samples['E'] = samples['E'] * 1.002
+    assert (compare_to_tables(samples)['p-value'][1:] < 1e-4).all()
+
+
+def test_validate_sources():
+    df = validate_sources(n_particles=20000, seed=3)
+
+    # the openmc representations are checked along with the numpy sampler
+    assert list(df['representation'].unique()) == \
+        ['IndependentSource x36', 'FileSource', 'numpy sampler']
+    assert len(df) == 9
+    assert (df['p-value'] > 1e-4).all()
+
+
+def test_time_sources():
+    df = time_sources(n_particles=2000, repeat=1, pool_fraction=0.1)
+
+    assert list(df['representation']) == \
+        ['IndependentSource x36', 'FileSource', 'numpy sampler']
+    # the draws from the file source reuse its pool of 200 neutrons
+    assert df['distinct neutrons'][1] <= 200 < df['distinct neutrons'][0]
+    assert df['read [s]'].notna().sum() == 1
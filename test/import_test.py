@@ -0,0 +1,36 @@
+import importlib
+import subprocess
+import sys
+import openmc_fusion_benchmarks
+
+
+def _cold_import(statement):
+    # import time in seconds and modules imported by a fresh interpreter
+    code = ('import sys, time; start = time.perf_counter(); '
+            f'{statement}; print(time.perf_counter() - start); print(*sys.modules)')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True)
+    seconds, modules = result.stdout.splitlines()
+    return float(seconds), set(modules.split())
+
+
+def test_import_time():
+    seconds, modules = _cold_import('import openmc_fusion_benchmarks')
+    assert not {'openmc', 'matplotlib', 'scipy', 'pandas', 'h5py'} & modules
+    print(f'import openmc_fusion_benchmarks: {seconds:.3f} s')
+
+    seconds, modules = _cold_import('from openmc_fusion_benchmarks import ResultsFromDatabase')
+    assert not {'openmc', 'matplotlib', 'scipy'} & modules
+    print(f'import ResultsFromDatabase: {seconds:.3f} s')
+
+
+def test_lazy_names():
+    # the lazy names match the public names defined in each submodule
+    for module, names in openmc_fusion_benchmarks._submodule_names.items():
+        module = importlib.import_module(f'openmc_fusion_benchmarks.{module}')
+        defined = {name for name, value in vars(module).items() if not name.startswith('_')
+                   and not isinstance(value, type(module))
+                   and (not callable(value) or value.__module__ == module.__name__)}
+        assert defined == set(names)
+        assert all(getattr(openmc_fusion_benchmarks, name) is getattr(module, name)
+                   for name in names)
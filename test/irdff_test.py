@@ -0,0 +1,42 @@
+import os
+import numpy as np
+from openmc_fusion_benchmarks import irdff
+
+
+def test_compiled_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('OFB_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(irdff, '_tables', {})
+    parsed = []
+
+    def parse_ace(filepath):
+        parsed.append(filepath)
+        return {102: (np.array([1., 2.]), np.array([3., 4.]),
+                      np.array([], dtype=int), np.array([], dtype=int))}
+
+    monkeypatch.setattr(irdff, '_parse_ace', parse_ace)
+
+    tables = irdff._load_tables('dos-irdff2-1325.acef')
+    # memoized in the process
+    assert irdff._load_tables('dos-irdff2-1325.acef') is tables
+    # compiled on disk for the next processes
+    monkeypatch.setattr(irdff, '_tables', {})
+    compiled = irdff._load_tables('dos-irdff2-1325.acef')
+    assert len(parsed) == 1
+    np.testing.assert_array_equal(compiled[102][1], [3., 4.])
+    assert (tmp_path / 'irdff' / 'dos-irdff2-1325.acef.npz').exists()
+
+
+def test_energy_function_filter_registry(monkeypatch):
+    class Filter:
+        @classmethod
+        def from_tabulated1d(cls, tab):
+            return cls()
+
+    monkeypatch.setattr(irdff.openmc, 'EnergyFunctionFilter', Filter, raising=False)
+    monkeypatch.setattr(irdff, 'get_cross_section', lambda f: {102: None, 16: None})
+    irdff.clear_energy_function_filters()
+
+    au197 = irdff.get_energy_function_filter('dos-irdff2-7925_modified.acef', 102)
+    assert irdff.get_energy_function_filter('dos-irdff2-7925_modified.acef', 102) is au197
+    assert irdff.get_energy_function_filter('dos-irdff2-7925_modified.acef', 16) is not au197
+    irdff.clear_energy_function_filters()
@@ -1,5 +1,13 @@
 import pytest
-from openmc_fusion_benchmarks import build_hdf_filename
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from openmc_fusion_benchmarks import build_hdf_filename, to_hdf, to_hdf_many, ResultsFromDatabase, \
+    close_database_files, convert_to_columnar, read_database_index, ResultsFromOpenmc, \
+    read_fom_history
+
+STATEPOINT = Path(__file__).parents[1] / 'notebooks' / \
+    'example_results' / 'example_statepoint.100.h5'
 
 
 def test_build_hdf_filename():
@@ -11,4 +19,101 @@ def test_build_hdf_filename():
 
     assert sample1 == 'test-0-0-0_test.h5'
     assert sample2 == 'openmc-0-15-0_fendl32b.h5'
-    assert sample3 == 'mcnp-4-6-0_endfb81.h5'
\ No newline at end of file
+    assert sample3 == 'mcnp-4-6-0_endfb81.h5'
+
+
+def test_results_from_database_managed_mode(tmp_path):
+
+    df = pd.DataFrame({'Shield depth (cm)': ['0.25', '12.95'],
+                       'mean': [1., 2.], 'std. dev.': [.1, .2]})
+    file = tmp_path / 'test.h5'
+    to_hdf(df, file, 'rr_test', 'fendl-3.2b', 'Shield depth (cm)',
+           when='2024', where='MIT-PSFC', code_version='openmc-0.15.0')
+
+    unmanaged = ResultsFromDatabase(str(file))
+    with ResultsFromDatabase(str(file)) as managed:
+        assert managed.when == unmanaged.when == '2024'
+        assert managed.where == 'MIT-PSFC'
+        assert managed.xs_library == 'fendl-3.2b'
+        assert managed.get_tally_xaxis('rr_test') == 'Shield depth (cm)'
+        pd.testing.assert_frame_equal(managed.get_tally_dataframe('rr_test'),
+                                      unmanaged.get_tally_dataframe('rr_test'))
+    assert managed._handle is None
+    close_database_files()
+
+
+def test_results_from_database_reopens_after_write(tmp_path):
+
+    df = pd.DataFrame({'Detector No.': ['1', '2'], 'mean': [1., 2.], 'std. dev.': [.1, .2]})
+    file = tmp_path / 'test.h5'
+    to_hdf(df, file, 'rr_1', 'fendl-3.2b', 'Detector No.', when='2024')
+
+    with ResultsFromDatabase(str(file)) as managed:
+        assert managed.when == '2024'
+        # writing closes the pooled handle held by the managed object
+        to_hdf(2 * df, file, 'rr_2', 'fendl-3.2b', 'Detector No.', when='2025')
+        assert managed.when == '2025'
+        pd.testing.assert_frame_equal(managed.get_tally_dataframe('rr_1'), df)
+        pd.testing.assert_frame_equal(managed.get_tally_dataframe('rr_2'), 2 * df)
+    close_database_files()
+
+
+def test_to_hdf_many(tmp_path):
+
+    dfs = {f'rr_{i}': pd.DataFrame({'Detector No.': ['1', '2'],
+                                    'mean': [1. * i, 2. * i], 'std. dev.': [.1, .2]})
+           for i in range(3)}
+    file = tmp_path / 'test.h5'
+    to_hdf_many(dfs, file, 'fendl-3.2b', 'Detector No.', when='2024')
+
+    results = ResultsFromDatabase(str(file))
+    assert results.when == '2024'
+    for name, df in dfs.items():
+        assert results.get_tally_xaxis(name) == 'Detector No.'
+        pd.testing.assert_frame_equal(results.get_tally_dataframe(name), df)
+
+
+def test_columnar_format(tmp_path):
+
+    df = pd.DataFrame({'Detector No.': ['1', '2'], 'mean': [1., 2.], 'std. dev.': [.1, .2]})
+    to_hdf(df, tmp_path / 'openmc-0-15-0_fendl32b.h5', 'rr_test', 'fendl-3.2b',
+           'Detector No.', code_version='openmc-0.15.0', format='columnar')
+    to_hdf(df, tmp_path / 'experiment.h5', 'rr_test', xaxis_name='Detector No.')
+
+    results = ResultsFromDatabase(str(tmp_path / 'openmc-0-15-0_fendl32b.h5'))
+    assert results.get_tally_xaxis('rr_test') == 'Detector No.'
+    assert results.xs_library == 'fendl-3.2b'
+    pd.testing.assert_frame_equal(results.get_tally_dataframe('rr_test'), df)
+
+    convert_to_columnar(tmp_path / 'experiment.h5')
+    pd.testing.assert_frame_equal(
+        ResultsFromDatabase(str(tmp_path / 'experiment.h5')).get_tally_dataframe('rr_test'), df)
+
+    index = read_database_index(tmp_path)
+    assert list(index['file']) == ['experiment.h5', 'openmc-0-15-0_fendl32b.h5']
+    assert list(index['x_axis']) == ['Detector No.'] * 2
+    assert index['code_version'].iloc[1] == 'openmc-0.15.0'
+    assert (tmp_path / 'index.json').exists()
+
+
+def test_fom_history(tmp_path):
+
+    results = ResultsFromOpenmc(STATEPOINT)
+    df = results.get_tally_fom('rr_onaxis1_nb93')
+    rel_err = df['std. dev.'] / df['mean']
+    assert np.allclose(df['rel. err.'], rel_err)
+    assert np.allclose(df['FOM'], 1 / (rel_err**2 * results.get_simulation_time))
+
+    summary = results.summarize_fom(['rr_onaxis1_nb93'])
+    assert summary['worst bin'][0] == np.argmax(rel_err)
+    assert summary['FOM'][0] == df['FOM'].min()
+
+    # the folder of the history is created on first use
+    folder = tmp_path / 'fng_str'
+    assert read_fom_history(folder).empty
+    results.fom_to_history('fendl-3.2b', ['rr_onaxis1_nb93'], folder, when='2024')
+    results.fom_to_history('fendl-3.2b', ['rr_onaxis1_nb93'], folder, when='2025')
+    history = read_fom_history(folder)
+    assert list(history['when']) == ['2024', '2025']
+    assert history['batches'][0] == 100
+    assert np.allclose(history['FOM'], summary['FOM'][0])
@@ -0,0 +1,26 @@
+import pytest
+import openmc_fusion_benchmarks as ofb
+
+
+def test_split_threads():
+    assert ofb.split_threads(128, 3) == [43, 43, 42]
+    assert ofb.split_threads(2, 3) == [1, 1, 1]
+
+
+def test_run_benchmarks_script(tmp_path):
+    # stand-in for a models/*/openmc_model.py script
+    script = tmp_path / 'openmc_model.py'
+    script.write_text(
+        "import sys, pathlib\n"
+        "folder = pathlib.Path(sys.argv[1][2:])\n"
+        "folder.mkdir()\n"
+        "(folder / f'statepoint.{sys.argv[3]}.h5').touch()\n")
+
+    benchmark = ofb.ScriptBenchmark(script)
+    finished = []
+    statepoints = ofb.run_benchmarks([(benchmark, 'onaxis'), (benchmark, 'offaxis')],
+                                     cores=4, callback=lambda *job: finished.append(job))
+
+    assert statepoints == [tmp_path / 'onaxis' / 'statepoint.2.h5',
+                           tmp_path / 'offaxis' / 'statepoint.2.h5']
+    assert len(finished) == 2
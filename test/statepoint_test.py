@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+from pathlib import Path
+from openmc_fusion_benchmarks import LazyStatePoint, compare_figures_of_merit
+
+STATEPOINT = Path(__file__).parents[1] / 'notebooks' / \
+    'example_results' / 'example_statepoint.100.h5'
+
+
+def test_lazy_statepoint_index():
+    statepoint = LazyStatePoint(STATEPOINT)
+
+    assert statepoint.version == (0, 13, 3)
+    assert statepoint.n_batches == 100
+    assert 'rr_onaxis1_nb93' in statepoint.tally_names
+    with pytest.raises(LookupError):
+        statepoint.get_tally_results('not_a_tally')
+
+
+def test_lazy_statepoint_dataframe():
+    statepoint = LazyStatePoint(STATEPOINT)
+    df = statepoint.get_tally_dataframe('rr_onaxis1_nb93')
+
+    assert list(df.columns) == ['cell', 'particle', 'energyfunction',
+                                'nuclide', 'score', 'mean', 'std. dev.']
+    assert len(df) == 13
+    assert df['cell'][0] == 135
+    assert np.isclose(df['mean'][0], 3.11e-04, rtol=1e-2)
+    assert np.isclose(df['std. dev.'][0], 4.16e-08, rtol=1e-2)
+
+    df = statepoint.get_tally_dataframe('rr_onaxis1_nb93', filter_columns=False)
+    assert list(df.columns) == ['nuclide', 'score', 'mean', 'std. dev.']
+
+
+def test_lazy_statepoint_bulk_read():
+    statepoint = LazyStatePoint(STATEPOINT)
+    names = ['rr_onaxis1_nb93', 'rr_onaxis2_nb93']
+    dfs = statepoint.get_tally_dataframes(names)
+
+    assert list(dfs) == names
+    for name in names:
+        assert dfs[name].equals(statepoint.get_tally_dataframe(name))
+    assert statepoint.tally_id('rr_onaxis2_nb93') == 2
+
+
+def test_figures_of_merit():
+    statepoint = LazyStatePoint(STATEPOINT)
+    rel_err, fom = statepoint.get_tally_fom('rr_onaxis1_nb93')
+    mean, std_dev = statepoint.get_tally_results('rr_onaxis1_nb93')
+
+    assert statepoint.simulation_time > 0
+    assert np.allclose(rel_err, std_dev / mean)
+    assert np.allclose(fom, 1 / (rel_err**2 * statepoint.simulation_time))
+
+    report = compare_figures_of_merit(STATEPOINT, STATEPOINT, ['rr_onaxis1_nb93'])
+    assert report['n bins'][0] == 13
+    assert report['max R'][0] == np.max(rel_err)
+    assert np.isclose(report['FOM gain'][0], 1)
+    assert np.isclose(report['median bin gain'][0], 1)
+
+    summary = statepoint.summarize_fom(['rr_onaxis1_nb93'])
+    assert summary['worst bin'][0] == np.argmax(rel_err)
+    assert summary['max R'][0] == report['max R'][0]
+    assert summary['FOM'][0] == report['FOM'][0] == np.nanmin(fom)
@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+import pandas as pd
+from openmc_fusion_benchmarks import rebin_spectrum, rebin_arrays, RebinOperator
+
+
+def test_rebin_spectrum():
+
+    df = pd.DataFrame({'energy low [eV]': [0., 1., 2., 3.],
+                       'energy high [eV]': [1., 2., 3., 4.],
+                       'mean': [1., 2., 3., 4.],
+                       'std. dev.': [.1, .2, .3, .4]})
+    rebinned = rebin_spectrum(df, [0., 1.5], [1.5, 4.])
+
+    assert np.allclose(rebinned['mean'], [4/3, 3.2])
+    assert np.allclose(rebinned['std. dev.'],
+                       [np.sqrt(.1**2 + .2**2 * .5**2) / 1.5,
+                        np.sqrt(.2**2 * .5**2 + .3**2 + .4**2) / 2.5])
+
+
+def test_rebin_arrays_stack():
+
+    edges = np.linspace(0., 10., 11)
+    mean = np.arange(20.).reshape(2, 10)
+    std_dev = .1 * mean
+    new_edges = np.array([0., 2.5, 7., 10.])
+
+    mean_stack, std_dev_stack = rebin_arrays(edges[:-1], edges[1:], mean, std_dev,
+                                             new_edges[:-1], new_edges[1:])
+    mean_single, std_dev_single = rebin_arrays(edges[:-1], edges[1:], mean[1], std_dev[1],
+                                               new_edges[:-1], new_edges[1:])
+
+    assert mean_stack.shape == (2, 3)
+    assert np.allclose(mean_stack[1], mean_single)
+    assert np.allclose(std_dev_stack[1], std_dev_single)
+
+
+def test_rebin_operator_cache():
+
+    edges = np.linspace(0., 10., 11)
+    new_edges = np.array([0., 2.5, 7., 10.])
+
+    operator = RebinOperator.from_edges(edges[:-1], edges[1:],
+                                        new_edges[:-1], new_edges[1:])
+
+    assert operator.shape == (3, 10)
+    assert RebinOperator.from_edges(edges[:-1].copy(), edges[1:],
+                                    new_edges[:-1], new_edges[1:]) is operator
+
+    mean, std_dev = operator.apply(np.ones(10), np.zeros(10))
+    assert np.allclose(mean, 1.)
+    assert np.allclose(std_dev, 0.)
@@ -0,0 +1,52 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.image
+import numpy as np
+import pandas as pd
+from openmc_fusion_benchmarks import PlotEnergySpectra, PlotJob, downsample_indices, \
+    render_plots
+
+
+def _spectrum(value):
+    energy = np.logspace(-2, 7, 51)
+    return pd.DataFrame({'energy low [eV]': energy[:-1], 'energy high [eV]': energy[1:],
+                         'mean': value / energy[1:]**.2, 'std. dev.': .01 / energy[1:]**.2})
+
+
+def _job(path, value):
+    job = PlotJob(PlotEnergySpectra, path, 'energy low [eV]', ylabel=f'flux {value}', dpi=40)
+    job.add_reference_results(_spectrum(1.), label='Experiment')
+    job.add_computed_results(_spectrum(value), color='tab:blue', label='computed')
+    return job
+
+
+def test_reused_figure(tmp_path):
+    templates = {}
+    _job(tmp_path / 'first.png', 3.).render(templates)
+    _job(tmp_path / 'reused.png', 2.).render(templates)
+    _job(tmp_path / 'fresh.png', 2.).render()
+
+    assert len(templates) == 1
+    np.testing.assert_array_equal(matplotlib.image.imread(tmp_path / 'reused.png'),
+                                  matplotlib.image.imread(tmp_path / 'fresh.png'))
+
+
+def test_render_plots(tmp_path):
+    jobs = [_job(tmp_path / 'plots' / f'{i}.png', 1. + i) for i in range(3)]
+    paths = render_plots(jobs, max_workers=2)
+    assert sorted(paths) == sorted(str(job.path) for job in jobs)
+    assert all((tmp_path / 'plots' / f'{i}.png').exists() for i in range(3))
+
+
+def test_downsample_indices():
+    x = np.logspace(-5, 7, 10001)
+    y = np.random.default_rng(1).random(len(x))
+    y[4321] = 100.
+
+    keep = downsample_indices(x, [y], 200, scale='log')
+    assert len(keep) <= 4 * 200
+    assert 4321 in keep and np.argmin(y) in keep
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+
+    # nothing to gain on short curves
+    assert len(downsample_indices(x[:100], [y[:100]], 200)) == 100
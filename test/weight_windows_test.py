@@ -0,0 +1,48 @@
+from pathlib import Path
+import numpy as np
+import openmc
+import pytest
+import openmc_fusion_benchmarks as ofb
+from openmc_fusion_benchmarks import load_weight_windows, WEIGHT_WINDOWS_PATH
+
+WWINP = Path(WEIGHT_WINDOWS_PATH / 'fns_clean_w' / 'weight_windows.wwinp')
+
+
+@pytest.mark.skipif(not hasattr(openmc, 'wwinp_to_wws'), reason='requires openmc')
+def test_load_weight_windows(tmp_path, monkeypatch):
+    parse = openmc.wwinp_to_wws
+    calls = []
+    monkeypatch.setattr(openmc, 'wwinp_to_wws', lambda path: calls.append(path) or parse(path))
+
+    reference = parse(str(WWINP))
+    for _ in range(2):
+        weight_windows = load_weight_windows(WWINP, cache_dir=tmp_path)
+    assert len(calls) == 1
+    assert len(list(tmp_path.glob('*.h5'))) == 1
+
+    for ww, expected in zip(weight_windows, reference):
+        assert type(ww.mesh) is type(expected.mesh)
+        np.testing.assert_array_equal(ww.lower_ww_bounds, expected.lower_ww_bounds)
+        np.testing.assert_array_equal(ww.upper_ww_bounds, expected.upper_ww_bounds)
+        assert ww.particle_type == expected.particle_type
+
+
+@pytest.mark.skipif(not hasattr(openmc, 'wwinp_to_wws'), reason='requires openmc')
+def test_get_weight_windows(tmp_path, monkeypatch):
+    monkeypatch.setenv('OFB_CACHE_DIR', str(tmp_path / 'cache'))
+    benchmark = ofb.BenchmarkDatabase.get_benchmark('fns_clean_w')
+
+    # no wwinp file is listed for download, the one of the package is used
+    weight_windows = benchmark.get_weight_windows()
+    reference = openmc.wwinp_to_wws(str(WWINP))
+    assert len(weight_windows) == len(reference)
+    np.testing.assert_array_equal(weight_windows[0].lower_ww_bounds,
+                                  reference[0].lower_ww_bounds)
+
+    path = benchmark.download_weight_windows(tmp_path / 'run')
+    assert path == tmp_path / 'run' / 'weight_windows.wwinp'
+    assert path.read_bytes() == WWINP.read_bytes()
+
+    # benchmarks without any weight windows raise a clear error
+    with pytest.raises(ValueError):
+        ofb.BenchmarkDatabase.get_benchmark('fng_str').get_weight_windows()